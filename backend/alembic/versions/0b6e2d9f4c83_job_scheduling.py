@@ -0,0 +1,38 @@
+"""job scheduling
+
+Revision ID: 0b6e2d9f4c83
+Revises: f3c8a1d5b027
+Create Date: 2026-10-18 19:47:55.602113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e2d9f4c83'
+down_revision: Union[str, None] = 'f3c8a1d5b027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('priority', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('job', sa.Column('deadline', sa.DateTime(), nullable=True))
+    op.add_column('job', sa.Column('virtual_time', sa.Float(), server_default='0', nullable=False))
+    op.create_index(
+        'ix_job_dispatch',
+        'job',
+        ['source_language_id', 'target_language_id', 'is_assessment'],
+        unique=False,
+        postgresql_where=sa.text("job_status = 'IN_PROGRESS'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_dispatch', table_name='job')
+    op.drop_column('job', 'virtual_time')
+    op.drop_column('job', 'deadline')
+    op.drop_column('job', 'priority')
@@ -0,0 +1,57 @@
+"""task source hash dedup
+
+Revision ID: 40a2b87fa9db
+Revises: b09cbf074676
+Create Date: 2026-10-18 11:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.importers import normalize_source_text, source_text_hash
+
+
+# revision identifiers, used by Alembic.
+revision: str = '40a2b87fa9db'
+down_revision: Union[str, None] = 'b09cbf074676'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('source_hash', sa.String(length=64), nullable=True))
+    op.add_column('task', sa.Column('occurrences', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('task', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('task_duplicate_of_id_fkey', 'task', 'task', ['duplicate_of_id'], ['task_id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_task_duplicate_of_id'), 'task', ['duplicate_of_id'], unique=False)
+
+    # Hash existing tasks in Python so they use exactly the same normalisation as ingestion.
+    conn = op.get_bind()
+    last_task_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT task_id, source_text FROM task WHERE task_id > :last ORDER BY task_id LIMIT :limit"),
+            {"last": last_task_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE task SET source_hash = :source_hash WHERE task_id = :task_id"),
+            [{"task_id": task_id, "source_hash": source_text_hash(normalize_source_text(source_text))} for task_id, source_text in rows],
+        )
+        last_task_id = rows[-1][0]
+
+    op.create_index('ix_task_pair_source_hash', 'task', ['source_language_id', 'target_language_id', 'source_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_pair_source_hash', table_name='task')
+    op.drop_index(op.f('ix_task_duplicate_of_id'), table_name='task')
+    op.drop_constraint('task_duplicate_of_id_fkey', 'task', type_='foreignkey')
+    op.drop_column('task', 'duplicate_of_id')
+    op.drop_column('task', 'occurrences')
+    op.drop_column('task', 'source_hash')
@@ -0,0 +1,26 @@
+"""job max active assignments
+
+Revision ID: 5d1f8b3e6a90
+Revises: 0b6e2d9f4c83
+Create Date: 2026-10-18 20:26:41.087319
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f8b3e6a90'
+down_revision: Union[str, None] = '0b6e2d9f4c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('max_active_assignments', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('job', 'max_active_assignments')
@@ -0,0 +1,35 @@
+"""job duplicate tasks
+
+Revision ID: 6b8e1f4a2c93
+Revises: 9a4e7c2b1f36
+Create Date: 2026-10-18 23:41:27.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b8e1f4a2c93'
+down_revision: Union[str, None] = '9a4e7c2b1f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('duplicate_tasks', sa.Integer(), nullable=False, server_default='0'))
+
+    # Linked duplicates were counted as open until now.
+    op.execute(
+        "UPDATE job SET duplicate_tasks = counts.duplicate_tasks, open_tasks = job.open_tasks - counts.duplicate_tasks"
+        " FROM (SELECT job_id, count(*) AS duplicate_tasks FROM task"
+        " WHERE task_status = 'OPEN' AND duplicate_of_id IS NOT NULL GROUP BY job_id) AS counts"
+        " WHERE counts.job_id = job.job_id"
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE job SET open_tasks = open_tasks + duplicate_tasks")
+    op.drop_column('job', 'duplicate_tasks')
@@ -0,0 +1,32 @@
+"""task completed reviewed_at index
+
+Revision ID: 7c1d3e5f9a20
+Revises: 40a2b87fa9db
+Create Date: 2026-10-18 14:26:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d3e5f9a20'
+down_revision: Union[str, None] = '40a2b87fa9db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_task_pair_completed_reviewed_at',
+        'task',
+        ['source_language_id', 'target_language_id', 'qa_reviewed_at'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'COMPLETE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_pair_completed_reviewed_at', table_name='task')
@@ -0,0 +1,31 @@
+"""task lease timestamptz
+
+Revision ID: 8f3a6d2e7b14
+Revises: 6b8e1f4a2c93
+Create Date: 2026-10-19 00:37:52.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a6d2e7b14'
+down_revision: Union[str, None] = '6b8e1f4a2c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('lease_expires_at', 'qa_lease_expires_at')
+
+
+def upgrade() -> None:
+    # Aware values were stored converted to the session time zone, so they are read back in it.
+    for column in COLUMNS:
+        op.alter_column('task', column, type_=sa.DateTime(timezone=True), existing_nullable=True)
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.alter_column('task', column, type_=sa.DateTime(), existing_nullable=True)
@@ -0,0 +1,26 @@
+"""job difficulty
+
+Revision ID: 9a4e7c2b1f36
+Revises: 5d1f8b3e6a90
+Create Date: 2026-10-18 21:04:12.531907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e7c2b1f36'
+down_revision: Union[str, None] = '5d1f8b3e6a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('difficulty', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('job', 'difficulty')
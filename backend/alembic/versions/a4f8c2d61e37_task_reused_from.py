@@ -0,0 +1,30 @@
+"""task reused from
+
+Revision ID: a4f8c2d61e37
+Revises: 7c1d3e5f9a20
+Create Date: 2026-10-18 15:08:52.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f8c2d61e37'
+down_revision: Union[str, None] = '7c1d3e5f9a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('reused_from_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('task_reused_from_id_fkey', 'task', 'task', ['reused_from_id'], ['task_id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_task_reused_from_id'), 'task', ['reused_from_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_reused_from_id'), table_name='task')
+    op.drop_constraint('task_reused_from_id_fkey', 'task', type_='foreignkey')
+    op.drop_column('task', 'reused_from_id')
@@ -0,0 +1,27 @@
+"""job ingesting status
+
+Revision ID: b09cbf074676
+Revises: e3ec01af0632
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b09cbf074676'
+down_revision: Union[str, None] = 'e3ec01af0632'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'INGESTING' BEFORE 'IN_PROGRESS'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop a value from an enum type; move any rows off it instead.
+    op.execute("DELETE FROM job WHERE job_status = 'INGESTING'")
@@ -0,0 +1,43 @@
+"""job progress counters
+
+Revision ID: c5e9b7a3d218
+Revises: a4f8c2d61e37
+Create Date: 2026-10-18 16:12:05.771932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e9b7a3d218'
+down_revision: Union[str, None] = 'a4f8c2d61e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = {
+    'open_tasks': 'OPEN',
+    'assigned_tasks': 'ASSIGNED_TO_FL',
+    'under_review_tasks': 'UNDER_REVIEW',
+    'completed_tasks': 'COMPLETE',
+}
+
+
+def upgrade() -> None:
+    for column in COUNTERS:
+        op.add_column('job', sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute(
+        "UPDATE job SET "
+        + ", ".join(f"{column} = counts.{column}" for column in COUNTERS)
+        + " FROM (SELECT job_id, "
+        + ", ".join(f"count(*) FILTER (WHERE task_status = '{status}') AS {column}" for column, status in COUNTERS.items())
+        + " FROM task GROUP BY job_id) AS counts WHERE counts.job_id = job.job_id"
+    )
+
+
+def downgrade() -> None:
+    for column in reversed(list(COUNTERS)):
+        op.drop_column('job', column)
@@ -0,0 +1,51 @@
+"""task dispatch lease
+
+Revision ID: d2a7f4c8e915
+Revises: c5e9b7a3d218
+Create Date: 2026-10-18 17:03:44.120586
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c8e915'
+down_revision: Union[str, None] = 'c5e9b7a3d218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE task SET lease_expires_at = assigned_at + make_interval(mins => max_time_per_task) "
+        "WHERE task_status = 'ASSIGNED_TO_FL' AND assigned_at IS NOT NULL"
+    )
+    # Assigned tasks without an assignment time could never expire before; release them now.
+    op.execute(
+        "UPDATE task SET lease_expires_at = now() "
+        "WHERE task_status = 'ASSIGNED_TO_FL' AND assigned_at IS NULL"
+    )
+    op.create_index(
+        'ix_task_dispatch_open',
+        'task',
+        ['source_language_id', 'target_language_id', 'is_assessment', 'job_id', 'task_id'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'OPEN' AND duplicate_of_id IS NULL"),
+    )
+    op.create_index(
+        'ix_task_dispatch_lease',
+        'task',
+        ['source_language_id', 'target_language_id', 'is_assessment', 'lease_expires_at'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'ASSIGNED_TO_FL'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_dispatch_lease', table_name='task')
+    op.drop_index('ix_task_dispatch_open', table_name='task')
+    op.drop_column('task', 'lease_expires_at')
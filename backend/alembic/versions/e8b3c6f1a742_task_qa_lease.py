@@ -0,0 +1,60 @@
+"""task qa lease
+
+Revision ID: e8b3c6f1a742
+Revises: d2a7f4c8e915
+Create Date: 2026-10-18 18:21:37.905164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3c6f1a742'
+down_revision: Union[str, None] = 'd2a7f4c8e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Matches the QA_LEASE_MINUTES default for reviews already in progress.
+QA_LEASE_MINUTES = 60
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('qa_lease_expires_at', sa.DateTime(), nullable=True))
+    op.execute(
+        f"UPDATE task SET qa_lease_expires_at = qa_assigned_at + make_interval(mins => {QA_LEASE_MINUTES}) "
+        "WHERE task_status = 'UNDER_REVIEW' AND qa_assigned_id IS NOT NULL AND qa_assigned_at IS NOT NULL"
+    )
+
+    # Claims no longer look at expired leases, so the per-pair lease index is replaced by
+    # plain expiry indexes for the reaper.
+    op.drop_index('ix_task_dispatch_lease', table_name='task')
+    op.create_index(
+        'ix_task_lease_expires_at',
+        'task',
+        ['lease_expires_at'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'ASSIGNED_TO_FL'"),
+    )
+    op.create_index(
+        'ix_task_qa_lease_expires_at',
+        'task',
+        ['qa_lease_expires_at'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'UNDER_REVIEW'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_qa_lease_expires_at', table_name='task')
+    op.drop_index('ix_task_lease_expires_at', table_name='task')
+    op.create_index(
+        'ix_task_dispatch_lease',
+        'task',
+        ['source_language_id', 'target_language_id', 'is_assessment', 'lease_expires_at'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'ASSIGNED_TO_FL'"),
+    )
+    op.drop_column('task', 'qa_lease_expires_at')
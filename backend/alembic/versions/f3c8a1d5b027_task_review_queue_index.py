@@ -0,0 +1,32 @@
+"""task review queue index
+
+Revision ID: f3c8a1d5b027
+Revises: e8b3c6f1a742
+Create Date: 2026-10-18 19:04:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d5b027'
+down_revision: Union[str, None] = 'e8b3c6f1a742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_task_review_queue',
+        'task',
+        ['source_language_id', 'target_language_id', 'is_assessment', 'submitted_at', 'task_id'],
+        unique=False,
+        postgresql_where=sa.text("task_status = 'UNDER_REVIEW' AND qa_assigned_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_review_queue', table_name='task')
@@ -1,9 +1,25 @@
 from pydantic_settings import BaseSettings
 
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the async driver of the same backend, see core.database.
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    # Connections older than this are replaced on checkout; -1 keeps them forever.
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode:
+    # no server-side prepared statements, and LISTEN goes to DB_DIRECT_URL.
+    DB_PGBOUNCER: bool = False
+    DB_DIRECT_URL: Optional[str] = None
+    # Optional read replica for heavy read-only routes, see core.read_routing.
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_STALENESS_SECONDS: int = 5
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -18,6 +34,35 @@ class Settings(BaseSettings):
     TEMPLATE_FOLDER: str
     MAIL_FROM_NAME: str
     ADMIN_EMAIL: str
+    INGEST_BATCH_SIZE: int = 5000
+    INGEST_WORKERS: int = 2
+    INGEST_SPOOL_DIR: str = "ingest_spool"
+    # INGESTING jobs older than this without a live worker are deleted on startup.
+    INGEST_STALE_MINUTES: int = 60
+    INGEST_PARSE_WORKERS: int = 1
+    INGEST_PARSE_CHUNK_BYTES: int = 16 * 1024 * 1024
+    TM_ENABLED: bool = True
+    TM_INDEX_DIR: str = "tm_index"
+    TM_MIN_SIMILARITY: float = 0.5
+    TM_REFRESH_SECONDS: int = 60
+    # qa_reviewed_at is stamped before commit by the app, so catch-up re-reads this far behind its watermark.
+    TM_CATCH_UP_OVERLAP_SECONDS: int = 600
+    TM_SAVE_EVERY: int = 500
+    QA_LEASE_MINUTES: int = 60
+    OPEN_BATCH_MAX_TASKS: int = 50
+    TASK_WAIT_MAX_SECONDS: int = 30
+    SCHEDULER_DEADLINE_HORIZON_HOURS: int = 24
+    SCHEDULER_CANDIDATE_JOBS: int = 5
+    ELIGIBILITY_MIN_ACCURACY: float = 50.0
+    ELIGIBILITY_CACHE_SECONDS: int = 60
+    ROUTING_EXPERT_ACCURACY: float = 85.0
+    ROUTING_DEMANDING_DIFFICULTY: int = 4
+    ROUTING_DEMANDING_PRIORITY: int = 5
+    TASK_NOTIFY_CHANNEL: str = "task_available"
+    LEASE_REAPER_ENABLED: bool = True
+    LEASE_REAPER_INTERVAL_SECONDS: int = 30
+    LEASE_REAPER_BATCH_SIZE: int = 500
+    LEASE_REAPER_MAX_BATCHES: int = 20
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,13 @@
+from uuid import uuid4
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from .read_routing import reads_from_primary
 
 settings = get_settings()
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -8,12 +15,97 @@ SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Async drivers for the same databases: asyncpg for PostgreSQL, aiosqlite for local runs.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one of the same backend."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    query = dict(url.query)
+    # asyncpg takes ``ssl`` where libpq takes ``sslmode``.
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}", query=query).render_as_string(hide_password=False)
+
+
+def engine_options(url: str, poolclass) -> dict:
+    """Pool settings from ``Settings``; SQLite keeps SQLAlchemy's default pool."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_PGBOUNCER and url.get_driver_name() == "asyncpg":
+        # PgBouncer may run each transaction on a different server connection, where a
+        # statement prepared earlier does not exist. psycopg2 never prepares statements.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool))
+engine.pool.pool_name = "sync"
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool))
+async_engine.sync_engine.pool.pool_name = "async"
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Without DATABASE_REPLICA_URL, reads share the primary engines.
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL, InstrumentedQueuePool)
+    )
+    replica_engine.pool.pool_name = "replica"
+    ASYNC_REPLICA_URL = async_database_url(settings.DATABASE_REPLICA_URL)
+    async_replica_engine = create_async_engine(
+        ASYNC_REPLICA_URL, **engine_options(ASYNC_REPLICA_URL, InstrumentedAsyncQueuePool)
+    )
+    async_replica_engine.sync_engine.pool.pool_name = "async replica"
+else:
+    replica_engine, async_replica_engine = engine, async_engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+
+async def get_async_db():
+    """Like get_db, for ``async def`` routes: queries are awaited instead of blocking the event loop."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes: the replica, or the primary right after the client's own write."""
+    db = SessionLocal() if reads_from_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db for ``async def`` routes."""
+    factory = AsyncSessionLocal if reads_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
@@ -0,0 +1,89 @@
+"""
+Connection pools that record how long requests wait for a connection.
+
+core.database builds its engines with these pool classes. Each pool keeps
+running counters of checkouts, time spent waiting for a connection and
+checkout timeouts. get_pool_metrics adds the live size, in-use and
+overflow counts; /health/db_pool publishes them.
+"""
+import threading
+import time
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics(BaseModel):
+    name: str
+    size: int = 0
+    checked_in: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    checkouts: int = 0
+    checkout_timeouts: int = 0
+    checkout_wait_seconds_total: float = 0.0
+    checkout_wait_seconds_max: float = 0.0
+    checkout_wait_seconds_avg: float = 0.0
+
+
+class _InstrumentedPool:
+    """Times ``_do_get``, which is where a checkout blocks when every connection is in use."""
+
+    # Set by core.database; shown as PoolMetrics.name.
+    pool_name = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._counters = PoolMetrics(name=self.pool_name)
+        self._counters_lock = threading.Lock()
+
+    def recreate(self):
+        # Engine.dispose() swaps in a recreated pool; carry the counters over.
+        pool = super().recreate()
+        pool.pool_name, pool._counters, pool._counters_lock = self.pool_name, self._counters, self._counters_lock
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._counters_lock:
+                self._counters.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._counters_lock:
+                self._counters.checkouts += 1
+                self._counters.checkout_wait_seconds_total += waited
+                self._counters.checkout_wait_seconds_max = max(self._counters.checkout_wait_seconds_max, waited)
+
+    def metrics(self) -> PoolMetrics:
+        with self._counters_lock:
+            metrics = self._counters.model_copy()
+        metrics.name = self.pool_name
+        metrics.size = self.size()
+        metrics.checked_in = self.checkedin()
+        metrics.checked_out = self.checkedout()
+        metrics.overflow = self.overflow()
+        metrics.checkout_wait_seconds_total = round(metrics.checkout_wait_seconds_total, 6)
+        metrics.checkout_wait_seconds_max = round(metrics.checkout_wait_seconds_max, 6)
+        if metrics.checkouts:
+            metrics.checkout_wait_seconds_avg = round(metrics.checkout_wait_seconds_total / metrics.checkouts, 6)
+        return metrics
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_metrics(*engines) -> List[PoolMetrics]:
+    """Metrics of every instrumented pool among ``engines`` (sync or async)."""
+    pools = [getattr(engine, "sync_engine", engine).pool for engine in engines]
+    return [pool.metrics() for pool in pools if isinstance(pool, _InstrumentedPool)]
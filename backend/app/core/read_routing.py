@@ -0,0 +1,53 @@
+"""
+Read-your-writes guard for replica reads.
+
+A replica may lag the primary by a moment. After a client's write, their
+reads go to the primary for ``REPLICA_STALENESS_SECONDS``; otherwise a
+page reloaded right after a save could show the data from before it.
+ReadAfterWriteMiddleware marks a write by adding an X-Read-Primary-Until
+response header, holding the time until which that client's reads should
+use the primary, whenever an unsafe method (POST, PUT, PATCH, DELETE)
+succeeds. The frontend echoes the header on its requests until then, and
+core.database.get_read_db and get_async_read_db follow it. A header
+rather than a cookie keeps the hint working across origins without
+sending the app's cookies along with every cross-site request.
+"""
+import time
+
+from starlette.requests import HTTPConnection
+
+from .config import get_settings
+
+settings = get_settings()
+
+READ_HINT_HEADER = "X-Read-Primary-Until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def reads_from_primary(connection: HTTPConnection) -> bool:
+    """True while the client's last write may not have reached the replica yet."""
+    try:
+        until = float(connection.headers.get(READ_HINT_HEADER, 0))
+    except ValueError:
+        return False
+    now = time.time()
+    # The hint comes from the client; one further out than a write could set is ignored.
+    return now < until <= now + settings.REPLICA_STALENESS_SECONDS
+
+
+class ReadAfterWriteMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_hint(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = f"{time.time() + settings.REPLICA_STALENESS_SECONDS:.3f}"
+                message["headers"] = [*message.get("headers", []), (READ_HINT_HEADER.lower().encode(), until.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_hint)
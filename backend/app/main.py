@@ -12,6 +12,11 @@ from .routes.freelancer import router as freelancer_router
 from .routes.assessment import router as assessment_router
 from .routes.payment import router as payment_router
 from .routes.reports import router as reports_router
+from .services import ingestion, translation_memory, lease_reaper, task_notifier
+from .core.config import get_settings
+from .core.database import SessionLocal, async_engine, async_replica_engine, engine
+from .core.read_routing import READ_HINT_HEADER, ReadAfterWriteMiddleware
+import asyncio
 
 app = FastAPI()
 
@@ -21,8 +26,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_HINT_HEADER],
 )
 
+settings = get_settings()
+
+if settings.DATABASE_REPLICA_URL:
+    app.add_middleware(ReadAfterWriteMiddleware)
+
+@app.on_event("startup")
+def sweep_stale_ingestions():
+    ingestion.sweep_stale_ingestions(SessionLocal)
+
+@app.on_event("startup")
+async def start_lease_reaper():
+    if settings.LEASE_REAPER_ENABLED:
+        app.state.lease_reaper = asyncio.create_task(lease_reaper.run_forever(SessionLocal))
+
+@app.on_event("startup")
+async def start_task_notifier():
+    task_notifier.start(engine)
+
+@app.on_event("shutdown")
+async def stop_task_notifier():
+    task_notifier.stop()
+
+@app.on_event("shutdown")
+async def stop_lease_reaper():
+    reaper = getattr(app.state, "lease_reaper", None)
+    if reaper:
+        reaper.cancel()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
+    if async_replica_engine is not async_engine:
+        await async_replica_engine.dispose()
+
+@app.on_event("shutdown")
+def save_translation_memory():
+    translation_memory.save_all()
+
 @app.get("/")
 def read_root():
     return {"message": "Hello, World!"}
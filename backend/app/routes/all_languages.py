@@ -1,28 +1,29 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas.language import Language, LanguageCreate
-from ..core.database import get_db
+from ..core.database import get_async_db
 
 router = APIRouter()
 
 @router.get("/all_languages")
-async def get_all_languages(db: Session = Depends(get_db)):
-    languages = db.query(Language).all()
+async def get_all_languages(db: AsyncSession = Depends(get_async_db)):
+    languages = (await db.scalars(select(Language))).all()
     return languages
 
 
 @router.post("/create_language")
 async def create_language(
     language: LanguageCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     language_name = language.language_name
-    all_languages = db.query(Language).all()
+    all_languages = (await db.scalars(select(Language))).all()
     for lang in all_languages:
         if lang.language_name.lower() == language_name.lower():
             return {"error": "Language already exists"}
     new_language = Language(language_name=language_name)
     db.add(new_language)
-    db.commit()
-    db.refresh(new_language)
+    await db.commit()
+    await db.refresh(new_language)
     return new_language
\ No newline at end of file
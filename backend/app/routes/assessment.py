@@ -11,6 +11,8 @@ from ..schemas.qa_member import QAMember
 from ..schemas.freelancer import Freelancer
 from ..schemas.language import Language
 from ..services.email import send_assessment_result_email
+from ..services.eligibility import invalidate
+from ..services.review_stats import record_pair, record_reviewer
 
 from pydantic import BaseModel
 from typing import List
@@ -48,7 +50,7 @@ def add_language_pair(db: Session, freelancer_id: int, source_language_id: int,
         db.add(new_pair)
 
 @router.post("/assessment_attempts")
-async def create_assessment_attempts(
+def create_assessment_attempts(
     attempts: List[AssessmentAttemptInput],
     db: Session = Depends(get_db)
 ):
@@ -95,12 +97,8 @@ async def update_ass_reviewed_data(reviews: CheckSubmitRequest, db: Session = De
     source_lang_id = reviews.source_lang_id
     target_lang_id = reviews.target_lang_id
 
-    review_qa = db.query(QAMember).filter(QAMember.qa_member_id == qa_id).first()
-
-    previoue_complete_of_qa = review_qa.total_tasks_reviewed or 0
-    previous_reject_of_qa = review_qa.total_tasks_rejected or 0
-    review_qa.total_tasks_reviewed = previoue_complete_of_qa + total_reviews
-    review_qa.total_tasks_rejected = previous_reject_of_qa + (total_reviews - approved_reviews)
+    rejected_reviews = total_reviews - approved_reviews
+    record_reviewer(db, qa_id, reviewed=total_reviews, rejected=rejected_reviews)
 
     # Update assessment attempts (Set all related attempts to COMPLETE)
     task_ids = [review.taskid for review in reviews.data]
@@ -115,23 +113,16 @@ async def update_ass_reviewed_data(reviews: CheckSubmitRequest, db: Session = De
     for attempt in assessment_attempts:
         attempt.attempt_status = AssTaskStatus.COMPLETE
 
-    freelancer_language_pair = db.query(FreelancerLanguagePair).filter(
-        FreelancerLanguagePair.freelancer_id == fl_id,
-        FreelancerLanguagePair.source_language_id == source_lang_id,
-        FreelancerLanguagePair.target_language_id == target_lang_id,
-    ).first()
+    # Marks the pair as assessed and recomputes its accuracy in the same UPDATE.
+    freelancer_language_pair = record_pair(
+        db, fl_id, source_lang_id, target_lang_id, reviewed=total_reviews, rejected=rejected_reviews, assessment=True
+    )
 
     if not freelancer_language_pair:
         raise HTTPException(status_code=404, detail="Freelancer language pair record not found.")
 
-    previous_complete_task = freelancer_language_pair.complete_task or 0
-    previous_rejected_task = freelancer_language_pair.rejected_task or 0
-    freelancer_language_pair.status = AssSubmission.COMPLETE
-    freelancer_language_pair.accuracy_rate = ((approved_reviews + (previous_complete_task - previous_rejected_task)) / (total_reviews + previous_complete_task)) * 100
-    freelancer_language_pair.complete_task = previous_complete_task + total_reviews
-    freelancer_language_pair.rejected_task = previous_rejected_task + (total_reviews - approved_reviews)
-
     db.commit()
+    invalidate(fl_id, source_lang_id, target_lang_id)
 
     if approved_reviews > (total_reviews / 2):
         freelancer = db.query(Freelancer).filter(Freelancer.freelancer_id == fl_id).first()
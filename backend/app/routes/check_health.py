@@ -1,5 +1,8 @@
+from typing import List
 from fastapi import APIRouter
-from ..core.database import get_db
+from ..core.database import async_engine, async_replica_engine, engine, get_db, replica_engine
+from ..core.pool_metrics import PoolMetrics, get_pool_metrics
+from ..services.lease_reaper import LeaseReaperMetrics, get_metrics
 
 router = APIRouter()
 
@@ -9,4 +12,15 @@ async def check_health():
         db = next(get_db())
         return {"message": "db is alive!"}
     except Exception as e:
-        return {"message": "db is dead!"}
\ No newline at end of file
+        return {"message": "db is dead!"}
+
+@router.get("/leases", response_model=LeaseReaperMetrics)
+async def lease_metrics():
+    return get_metrics()
+
+@router.get("/db_pool", response_model=List[PoolMetrics])
+async def db_pool_metrics():
+    engines = [engine, async_engine]
+    if replica_engine is not engine:
+        engines += [replica_engine, async_replica_engine]
+    return get_pool_metrics(*engines)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from ..core.database import get_db
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import get_async_db
 from ..schemas.freelancer_language_pair import FreelancerLanguagePair
 
 router = APIRouter()
@@ -11,13 +11,13 @@ async def get_language_pair(
     freelancer_id: int,
     source_language_id: int,
     target_language_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retrieve the language pair for a freelancer.
     The source and target language IDs can be swapped.
     """
-    language_pair = db.query(FreelancerLanguagePair).filter(
+    language_pair = await db.scalar(select(FreelancerLanguagePair).where(
         FreelancerLanguagePair.freelancer_id == freelancer_id,
         or_(
             and_(
@@ -29,7 +29,7 @@ async def get_language_pair(
                 FreelancerLanguagePair.target_language_id == source_language_id
             )
         )
-    ).first()
+    ).limit(1))
 
     if language_pair:
         return {
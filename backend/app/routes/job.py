@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Body
-from ..core.database import get_db
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Body, Query
+from starlette.concurrency import run_in_threadpool
+from ..core.database import get_async_db, get_async_read_db, get_db, SessionLocal
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 from typing import List, Optional
 from ..schemas.job import Job
 from ..schemas.task import Task
 from ..schemas.language import Language
 from ..schemas.task import TaskStatus
-from ..schemas.job import JobProgress, JobUpdateInput
-import pandas as pd
+from ..schemas.job import JobProgress, JobListItem, JobUpdateInput, JobScheduleInput, JobIngestionState, IngestionOptions
+from ..schemas.enums import JobStatus, TranslationReuse
+from ..services.importers import get_importer, resolve_content_type
+from ..services.ingestion import create_job_with_tasks, discard_spool, spool_upload, submit_ingestion, get_ingestion
+from ..services.job_progress import get_progress, jobs_linked_to, recount_jobs, to_progress
+from ..services.task_notifier import notify_pairs
 from datetime import datetime
-import io
 
 router = APIRouter()
 
-@router.post("/create")
+@router.post("/create", status_code=202)
 async def create_job(
     job_title: str = Form(...),
     source_language_id: int = Form(...),
@@ -22,81 +28,146 @@ async def create_job(
     task_price: float = Form(...),
     instructions: str = Form(...),
     notes: Optional[str] = Form(None),
+    dedupe: bool = Form(False),
+    dedupe_across_jobs: bool = Form(False),
+    reuse_translations: TranslationReuse = Form(TranslationReuse.OFF),
+    priority: int = Form(1, ge=1, le=100),
+    deadline: Optional[datetime] = Form(None),
+    max_active_assignments: Optional[int] = Form(None, ge=1),
+    difficulty: int = Form(1, ge=1, le=5),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
-    csv_content = await file.read()
-    csv_file = io.BytesIO(csv_content)
-    df = pd.read_csv(csv_file, header=None)
-    
-    new_job = Job(
-        job_title=job_title,
-        source_language_id=source_language_id,
-        target_language_id=target_language_id,
-        total_tasks=len(df),
-        max_time_per_task=max_time_per_task,
-        created_at=datetime.now(),
-        task_price=task_price,
-        instructions=instructions,
-        notes=notes or "",
-    )
+    try:
+        content_type = resolve_content_type(file.content_type, file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
 
-    db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    spool_path = await run_in_threadpool(spool_upload, file.file)
 
-    for _, row in df.iterrows():
-        task = Task(
-            job_id=new_job.job_id,
+    try:
+        # The job stays INGESTING (and its tasks invisible) until the worker commits.
+        new_job = Job(
+            job_title=job_title,
             source_language_id=source_language_id,
-            source_text=row.iloc[0], 
             target_language_id=target_language_id,
+            total_tasks=0,
+            job_status=JobStatus.INGESTING,
             max_time_per_task=max_time_per_task,
+            created_at=datetime.now(),
             task_price=task_price,
-            is_assessment=False
+            instructions=instructions,
+            notes=notes or "",
+            is_assessment=False,
+            priority=priority,
+            deadline=deadline,
+            max_active_assignments=max_active_assignments,
+            difficulty=difficulty,
         )
-        db.add(task)
+        db.add(new_job)
         db.commit()
-        db.refresh(task)
+        db.refresh(new_job)
 
-    return {"message": "Job created successfully"}
+        options = IngestionOptions(
+            dedupe=dedupe,
+            dedupe_across_jobs=dedupe_across_jobs,
+            reuse_translations=reuse_translations,
+        )
+        ingestion = submit_ingestion(SessionLocal, new_job.job_id, spool_path, content_type, options)
+    except Exception:
+        # The worker never got the file, so nothing else will delete it.
+        discard_spool(spool_path)
+        raise
 
-@router.get("/get_all_jobs")
-async def get_all_jobs(db: Session = Depends(get_db)):
-    jobs = db.query(Job).filter(Job.is_assessment == "f").all()
-    for job in jobs:
-        job.source_language_name = db.query(Language).filter(Language.language_id == job.source_language_id).first().language_name
-        job.target_language_name = db.query(Language).filter(Language.language_id == job.target_language_id).first().language_name
-    return jobs
+    return {"message": "Job accepted for ingestion", "job_id": new_job.job_id, "ingestion_id": ingestion.ingestion_id}
 
+@router.get("/ingestion/{ingestion_id}", response_model=JobIngestionState)
+async def get_job_ingestion(ingestion_id: str):
+    ingestion = get_ingestion(ingestion_id)
+    if not ingestion:
+        raise HTTPException(status_code=404, detail="Ingestion not found")
+    return ingestion
 
-@router.get("/get_job_progress/{job_id}")
-async def get_job_progress(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.job_id == job_id).first()
-    total_tasks = db.query(Task).filter(Task.job_id == job_id).count()
-    completed_tasks = db.query(Task).filter(Task.job_id == job_id, Task.task_status == "COMPLETE").count()
-    under_review_tasks = db.query(Task).filter(Task.job_id == job_id, Task.task_status == "UNDER_REVIEW").count()
-    return JobProgress(job_id=job.job_id, total_tasks=total_tasks, completed_tasks=completed_tasks, under_review_tasks=under_review_tasks)
+async def _list_jobs(db: AsyncSession, is_assessment: bool) -> List[JobListItem]:
+    """Jobs with their language names and progress counters, fetched in a single query."""
+    SourceLanguage = aliased(Language)
+    TargetLanguage = aliased(Language)
+    rows = await db.execute(
+        select(
+            Job.job_id,
+            Job.job_title,
+            Job.job_status,
+            Job.is_assessment,
+            Job.source_language_id,
+            SourceLanguage.language_name.label("source_language_name"),
+            Job.target_language_id,
+            TargetLanguage.language_name.label("target_language_name"),
+            Job.total_tasks,
+            Job.completed_tasks,
+            Job.under_review_tasks,
+            Job.max_time_per_task,
+            Job.task_price,
+            Job.instructions,
+            Job.notes,
+            Job.created_at,
+            Job.priority,
+            Job.deadline,
+            Job.max_active_assignments,
+            Job.difficulty,
+        )
+        .join(SourceLanguage, Job.source_language_id == SourceLanguage.language_id)
+        .join(TargetLanguage, Job.target_language_id == TargetLanguage.language_id)
+        .where(Job.is_assessment.is_(is_assessment))
+        .order_by(Job.job_id)
+    )
+    return [JobListItem.model_validate(row) for row in rows]
 
 
-@router.delete("/delete_job/{job_id}")
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.job_id == job_id).first()
+@router.get("/get_all_jobs", response_model=List[JobListItem])
+async def get_all_jobs(db: AsyncSession = Depends(get_async_read_db)):
+    return await _list_jobs(db, is_assessment=False)
+
+
+@router.get("/get_job_progress/{job_id}", response_model=JobProgress)
+async def get_job_progress(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    db.delete(job)
-    db.commit()
+    return to_progress(job)
+
+
+@router.get("/get_jobs_progress", response_model=List[JobProgress])
+async def get_jobs_progress(job_ids: List[int] = Query(..., max_length=1000), db: AsyncSession = Depends(get_async_db)):
+    return await get_progress(db, job_ids)
+
+
+@router.delete("/delete_job/{job_id}")
+async def delete_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    linked_job_ids = (await db.scalars(jobs_linked_to(job_id))).all()
+    # The database cascades the delete to the job's tasks; its counters go with the job row.
+    deleted = await db.execute(
+        delete(Job).where(Job.job_id == job_id).returning(Job.source_language_id, Job.target_language_id),
+        execution_options={"synchronize_session": False},
+    )
+    pair = deleted.first()
+    if not pair:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if linked_job_ids:
+        # Duplicates in later jobs lost the task they waited on and are claimable again.
+        await db.run_sync(recount_jobs, linked_job_ids)
+        await db.run_sync(notify_pairs, [tuple(pair)])
+    await db.commit()
     return {"message": "Job and its related tasks deleted successfully"}
 
 @router.get("/get_job/{job_id}")
-async def get_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.job_id == job_id).first()
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
 @router.put("/update_job/{job_id}")
-async def update_job(job_id: int, job: JobUpdateInput, db: Session = Depends(get_db)):
+def update_job(job_id: int, job: JobUpdateInput, db: Session = Depends(get_db)):
     db_job = db.query(Job).filter(Job.job_id == job_id).first()
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -130,9 +201,24 @@ async def update_job(job_id: int, job: JobUpdateInput, db: Session = Depends(get
     return {"message": "Job and related tasks updated successfully", "updated_job": db_job}
 
 
+@router.put("/update_schedule/{job_id}")
+def update_job_schedule(job_id: int, schedule: JobScheduleInput, db: Session = Depends(get_db)):
+    """Change a job's scheduling weight, deadline, assignment cap and difficulty; takes effect on the next claim."""
+    db_job = db.query(Job).filter(Job.job_id == job_id).first()
+    if not db_job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    db_job.priority = schedule.priority
+    db_job.deadline = schedule.deadline
+    db_job.max_active_assignments = schedule.max_active_assignments
+    db_job.difficulty = schedule.difficulty
+    db.commit()
+    return {"message": "Job schedule updated successfully", "job_id": job_id, **schedule.model_dump()}
+
+
 
 @router.post("/create_assessment_job")
-async def create_assessment_job(
+def create_assessment_job(
     job_title: str = Form(...),
     source_language_id: int = Form(...),
     target_language_id: int = Form(...),
@@ -141,9 +227,10 @@ async def create_assessment_job(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
-    csv_content = await file.read()
-    csv_file = io.BytesIO(csv_content)
-    df = pd.read_csv(csv_file, header=None)
+    try:
+        importer = get_importer(resolve_content_type(file.content_type, file.filename))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
 
     task_price = 0 
     
@@ -151,7 +238,6 @@ async def create_assessment_job(
         job_title=job_title,
         source_language_id=source_language_id,
         target_language_id=target_language_id,
-        total_tasks=len(df),
         max_time_per_task=max_time_per_task,
         created_at=datetime.now(),
         task_price=task_price,
@@ -160,30 +246,13 @@ async def create_assessment_job(
         is_assessment=True
     )
 
-    db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
-
-    for _, row in df.iterrows():
-        task = Task(
-            job_id=new_job.job_id,
-            source_language_id=source_language_id,
-            source_text=row.iloc[0], 
-            target_language_id=target_language_id,
-            max_time_per_task=max_time_per_task,
-            task_price=task_price,
-            is_assessment=True
-        )
-        db.add(task)
-        db.commit()
-        db.refresh(task)
+    try:
+        summary = create_job_with_tasks(db, new_job, importer(file.file))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"message": "Job created successfully"}
+    return {"message": "Job created successfully", **summary.model_dump()}
 
-@router.get("/get_all_ass_jobs")
-async def get_all_jobs(db: Session = Depends(get_db)):
-    jobs = db.query(Job).filter(Job.is_assessment == "t").all()
-    for job in jobs:
-        job.source_language_name = db.query(Language).filter(Language.language_id == job.source_language_id).first().language_name
-        job.target_language_name = db.query(Language).filter(Language.language_id == job.target_language_id).first().language_name
-    return jobs
\ No newline at end of file
+@router.get("/get_all_ass_jobs", response_model=List[JobListItem])
+async def get_all_ass_jobs(db: AsyncSession = Depends(get_async_read_db)):
+    return await _list_jobs(db, is_assessment=True)
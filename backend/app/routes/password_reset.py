@@ -46,7 +46,7 @@ async def send_verification_code(email_data: EmailVerification, db: Session = De
     return {"message": "Verification code sent"}
 
 @router.post("/auth/verify-code")
-async def verify_code(verification: CodeVerification, db: Session = Depends(get_db)):
+def verify_code(verification: CodeVerification, db: Session = Depends(get_db)):
     entry = db.query(VerificationCode).filter(VerificationCode.email == verification.email).first()
 
     if not entry:
@@ -67,7 +67,7 @@ async def verify_code(verification: CodeVerification, db: Session = Depends(get_
     return {"message": "Code verified successfully"}
 
 @router.post("/auth/reset-password")
-async def reset_password(reset_data: PasswordReset, db: Session = Depends(get_db)):
+def reset_password(reset_data: PasswordReset, db: Session = Depends(get_db)):
     if reset_data.new_password != reset_data.confirm_password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
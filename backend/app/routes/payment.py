@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from ..schemas.freelancer import *
 from ..schemas.withdrawal import Withdrawal
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db
 from datetime import datetime
 from ..schemas.enums import WithdrawalStatus
 import asyncio
@@ -88,8 +89,20 @@ def request_new_payment(
     db_withdrawal = Withdrawal(**withdrawal_data)
     db.add(db_withdrawal)
 
-    freelancer.current_balance -= amount
-    freelancer.pending_withdrawal += amount
+    # Debited in SQL and guarded by the balance, so a QA approval crediting the freelancer
+    # meanwhile is neither overwritten nor withdrawn twice.
+    debited = db.execute(
+        update(Freelancer)
+        .where(Freelancer.freelancer_id == freelancer_id, Freelancer.current_balance >= amount)
+        .values(
+            current_balance=Freelancer.current_balance - amount,
+            pending_withdrawal=func.coalesce(Freelancer.pending_withdrawal, 0.0) + amount,
+        )
+        .returning(Freelancer.current_balance),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if debited is None:
+        raise HTTPException(status_code=400, detail="Insufficient balance")
     db.commit()
     db.refresh(db_withdrawal)
 
@@ -106,7 +119,7 @@ def request_new_payment(
 
 
 @router.get("/get_all_withdrawals")
-def get_withdrawals(db: Session = Depends(get_db)):
+def get_withdrawals(db: Session = Depends(get_read_db)):
     withdrawals = db.query(Withdrawal).all()
     return withdrawals
 
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from ..schemas.freelancer import *
-from ..core.database import get_db
-from sqlalchemy.orm import Session
+from ..core.database import get_async_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from ..services.auth import get_current_user, generate_code, send_verification_email, get_password_hash, verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, check_existing_user
 from datetime import datetime, timedelta
 from ..schemas.verification_code import VerificationCode
@@ -10,12 +12,12 @@ from ..schemas.verification_code import VerificationCode
 router = APIRouter()    
 
 @router.post("/auth/register", response_model=FreelancerResponse)
-async def register(freelancer: RegisterRequest, db: Session = Depends(get_db)):
+async def register(freelancer: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
     existing_user, _ = await check_existing_user(db, freelancer.email)
     if existing_user is not None:
         raise HTTPException(status_code=409, detail="Email already registered")
     
-    hashed_password = get_password_hash(freelancer.password)
+    hashed_password = await run_in_threadpool(get_password_hash, freelancer.password)
     db_freelancer = Freelancer(
         email=freelancer.email,
         full_name=freelancer.full_name,
@@ -28,12 +30,12 @@ async def register(freelancer: RegisterRequest, db: Session = Depends(get_db)):
         pending_withdrawal=0.0
     )
     db.add(db_freelancer)
-    db.commit()
-    db.refresh(db_freelancer)
+    await db.commit()
+    await db.refresh(db_freelancer)
     return db_freelancer
 
 @router.post("/auth/send-code")
-async def send_verification_code(email_data: EmailVerification, db: Session = Depends(get_db)):
+async def send_verification_code(email_data: EmailVerification, db: AsyncSession = Depends(get_async_db)):
     existing_user, _ = await check_existing_user(db, email_data.email)
     if existing_user is not None:
         raise HTTPException(status_code=409, detail="Email already registered")
@@ -41,7 +43,7 @@ async def send_verification_code(email_data: EmailVerification, db: Session = De
     code = generate_code()
     expires_at = datetime.utcnow() + timedelta(minutes=10)
 
-    existing_entry = db.query(VerificationCode).filter(VerificationCode.email == email_data.email).first()
+    existing_entry = await db.scalar(select(VerificationCode).where(VerificationCode.email == email_data.email))
 
     if existing_entry:
         existing_entry.code = code
@@ -51,15 +53,15 @@ async def send_verification_code(email_data: EmailVerification, db: Session = De
         new_entry = VerificationCode(email=email_data.email, code=code, expires_at=expires_at)
         db.add(new_entry)
 
-    db.commit()
+    await db.commit()
 
     await send_verification_email(email_data.email, code)
 
     return {"message", code}
 
 @router.post("/auth/verify-code")
-async def verify_code(verification: CodeVerification, db: Session = Depends(get_db)):
-    entry = db.query(VerificationCode).filter(VerificationCode.email == verification.email).first()
+async def verify_code(verification: CodeVerification, db: AsyncSession = Depends(get_async_db)):
+    entry = await db.scalar(select(VerificationCode).where(VerificationCode.email == verification.email))
 
     if not entry:
         raise HTTPException(status_code=400, detail="Email not found")
@@ -74,19 +76,20 @@ async def verify_code(verification: CodeVerification, db: Session = Depends(get_
         raise HTTPException(status_code=400, detail="Verification code expired")
 
     entry.is_verified = True
-    db.commit()
+    await db.commit()
 
     return {"message": "Code verified successfully"}
 
 
 @router.post("/auth/login")
-async def login(form_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(form_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     existing_user, user_type = await check_existing_user(db, form_data.email)
 
     if existing_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(form_data.password, existing_user.password_hash):
+    # bcrypt is deliberately slow; keep it off the event loop.
+    if not await run_in_threadpool(verify_password, form_data.password, existing_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -133,7 +136,7 @@ async def read_current_user(current_user: Freelancer = Depends(get_current_user)
 @router.post("/token")
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     This endpoint is used for the OAuth2 flow (Swagger UI).
@@ -144,7 +147,7 @@ async def login_for_access_token(
     if existing_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(form_data.password, existing_user.password_hash):
+    if not await run_in_threadpool(verify_password, form_data.password, existing_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 import asyncio
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 from ..schemas.enums import Issues, RPstatus
-from ..core.database import get_db
+from ..core.database import get_async_read_db, get_db
 from ..schemas.freelancer import Freelancer
 from ..schemas.issue_report import IssueReport, IssueResolveRequest, IssueReportRequest
 from ..schemas.task import Task
@@ -14,12 +16,13 @@ from ..schemas.admin import Admin
 from ..schemas.enums import TaskStatus
 from ..schemas.language import Language
 from ..services.email import send_appeal_accept_email, send_issue_report_email, send_issue_resolution_email
+from ..services.eligibility import invalidate
 
 router = APIRouter()
 
 
 @router.post("/report_issue")
-async def report_issue(
+def report_issue(
     request_body: IssueReportRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -62,8 +65,8 @@ async def report_issue(
     return issue_report
 
 @router.get("/get_issue_reports")
-async def get_issue_reports(db: Session = Depends(get_db)):
-    issue_reports = db.query(IssueReport).all()
+async def get_issue_reports(db: AsyncSession = Depends(get_async_read_db)):
+    issue_reports = (await db.scalars(select(IssueReport))).all()
     result = []
     for issue in issue_reports:
         # Convert SQLAlchemy model to a dict, excluding internal state.
@@ -72,7 +75,7 @@ async def get_issue_reports(db: Session = Depends(get_db)):
 
         # If there is a taskId, fetch the corresponding Task.
         if issue.taskId:
-            task = db.query(Task).filter(Task.task_id == issue.taskId).first()
+            task = await db.get(Task, issue.taskId, options=[joinedload(Task.source_language), joinedload(Task.target_language)])
             if task:
                 task_data = task.__dict__.copy()
                 task_data.pop("_sa_instance_state", None)
@@ -88,11 +91,16 @@ async def get_issue_reports(db: Session = Depends(get_db)):
         # If source_language_id and target_language_id are provided on the issue,
         # retrieve the language pair information.
         if issue.source_language_id and issue.target_language_id:
-            language_pair = db.query(FreelancerLanguagePair).filter(
-                FreelancerLanguagePair.freelancer_id == issue.freelancer_id,
-                FreelancerLanguagePair.source_language_id == issue.source_language_id,
-                FreelancerLanguagePair.target_language_id == issue.target_language_id,
-            ).first()
+            language_pair = await db.scalar(
+                select(FreelancerLanguagePair)
+                .options(joinedload(FreelancerLanguagePair.source_language), joinedload(FreelancerLanguagePair.target_language))
+                .where(
+                    FreelancerLanguagePair.freelancer_id == issue.freelancer_id,
+                    FreelancerLanguagePair.source_language_id == issue.source_language_id,
+                    FreelancerLanguagePair.target_language_id == issue.target_language_id,
+                )
+                .limit(1)
+            )
             if language_pair:
                 language_pair_data = {
                     "language_pair_id": language_pair.language_pair_id,
@@ -115,7 +123,7 @@ async def get_issue_reports(db: Session = Depends(get_db)):
     return result
 
 @router.post("/resolve_issue")
-async def resolve_issue(
+def resolve_issue(
     request_body: IssueResolveRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -128,6 +136,7 @@ async def resolve_issue(
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
+    revoked = None
     if request_body.decision:
         issue_report.report_status = RPstatus.PROCEED
         issue_report.resolved_at = datetime.now()
@@ -175,6 +184,7 @@ async def resolve_issue(
 
             if language_pair:
                 db.delete(language_pair)
+                revoked = (language_pair.freelancer_id, language_pair.source_language_id, language_pair.target_language_id)
 
                 freelancer = db.query(Freelancer).filter(Freelancer.freelancer_id == issue_report.freelancer_id).first()
                 source_language = db.query(Language).filter(Language.language_id == source_language_id).first()
@@ -206,4 +216,6 @@ async def resolve_issue(
             lambda: asyncio.run(send_issue_resolution_email(**email_params)))
 
     db.commit()
+    if revoked:
+        invalidate(*revoked)
     return issue_report
\ No newline at end of file
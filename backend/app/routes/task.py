@@ -1,34 +1,44 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Body
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Body, Query
 from fastapi.responses import StreamingResponse
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db
 from sqlalchemy.orm import Session
 from ..schemas.task import *
 from ..schemas.enums import TaskStatus as TaskStatus
 from ..schemas.enums import AssTaskStatus as AssTaskStatus
-from ..schemas.freelancer import Freelancer
 from ..schemas.assessment_attempt import AssessmentAttempt
-from ..schemas.freelancer_language_pair import FreelancerLanguagePair
 from ..schemas.qa_member import QAMember
 from ..schemas.job import Job
 from ..schemas.language import Language
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.sql import func
-from typing import Optional
+from typing import List, Optional, Tuple
 import pandas as pd
 import io
 from sqlalchemy.exc import SQLAlchemyError
 import logging
-from datetime import datetime, timezone
-from sqlalchemy import text
-from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import aliased
+from ..core.config import get_settings
+from ..services.translation_memory import find_matches, record_approved_task
+from ..services.job_progress import LINKED_DUPLICATE, move_task_counts, move_task_counts_for_tasks
+from ..services.dispatch import claim_any_task, claim_reviews, claim_task, claim_tasks, release_task
+from ..services.languages import get_language_names
+from ..services.eligibility import get_accuracy, invalidate, is_expert, qualified_pairs
+from ..services.review_stats import credit_earnings, record_pair, record_reviewer
+from ..services import task_notifier
+from ..services.task_notifier import notify_pairs
+from starlette.concurrency import run_in_threadpool
+import time
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 
 router = APIRouter()
 
 @router.get("/download_tasks")
-async def download_tasks(job_id: int, db: Session = Depends(get_db)):
+def download_tasks(job_id: int, db: Session = Depends(get_read_db)):
     job = db.query(Job).filter(Job.job_id == job_id).first()
     if not job:
         return {"error": "Job not found"}
@@ -36,7 +46,16 @@ async def download_tasks(job_id: int, db: Session = Depends(get_db)):
     source_language = db.query(Language).filter(Language.language_id == job.source_language_id).first()
     target_language = db.query(Language).filter(Language.language_id == job.target_language_id).first()
     
-    tasks = db.query(Task).filter(Task.job_id == job_id).all()
+    # Deduplicated tasks fan back out here: a linked task takes its canonical
+    # task's translation, and a collapsed task is repeated once per source row.
+    CanonicalTask = aliased(Task)
+    tasks = (
+        db.query(Task, CanonicalTask.translated_text.label("canonical_translated_text"))
+        .outerjoin(CanonicalTask, Task.duplicate_of_id == CanonicalTask.task_id)
+        .filter(Task.job_id == job_id)
+        .order_by(Task.task_id)
+        .all()
+    )
 
     if not tasks:
         return {"error": "No tasks found"}
@@ -51,9 +70,10 @@ async def download_tasks(job_id: int, db: Session = Depends(get_db)):
             "submitted_freelancer_id": task.submitted_by_id,
             "qa_reviewer_id": task.qa_reviewed_by_id,
             "source_text": task.source_text,
-            "translated_text": task.translated_text,
+            "translated_text": task.translated_text or canonical_translated_text,
         }
-        for task in tasks
+        for task, canonical_translated_text in tasks
+        for _ in range(task.occurrences or 1)
     ]
 
     tasks_df = pd.DataFrame(task_dicts)
@@ -113,7 +133,6 @@ async def get_all_languages_pairs(db: Session = Depends(get_db)):
         logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
-from sqlalchemy.orm import aliased
 
 @router.get("/get_assessment_tasks_up_to_5")
 async def get_assessment_tasks_up_to_5(source_language_id: int, target_language_id: int, db: Session = Depends(get_db)):
@@ -175,69 +194,124 @@ async def get_assessment_tasks_up_to_5(source_language_id: int, target_language_
 
 
 
+def _require_qualified(db: Session, freelancer_id: int, source_language_id: int, target_language_id: int) -> bool:
+    """Raise 403 unless the freelancer passed the pair's assessment; returns whether they count as an expert."""
+    accuracy = get_accuracy(db, freelancer_id, source_language_id, target_language_id)
+    if accuracy is None:
+        raise HTTPException(status_code=403, detail="Not qualified for this language pair")
+    return is_expert(accuracy)
+
+
+def _lease_next_task(
+    db: Session,
+    freelancer_id: int,
+    source_language_id: int,
+    target_language_id: int,
+    expert: Optional[bool] = None,
+) -> Optional[OpenTaskResponse]:
+    """Lease the next OPEN task of a pair and describe it; the caller commits."""
+    task = claim_task(db, freelancer_id, source_language_id, target_language_id, expert=expert)
+    return _describe_task(db, task) if task else None
+
+
+# The statements of the claim, submit and review paths are built once and bound per request.
+_SourceLanguage = aliased(Language)
+_TargetLanguage = aliased(Language)
+_TASK_DETAILS = (
+    select(
+        Job.instructions.label("instruction"),
+        _SourceLanguage.language_name.label("source_language_name"),
+        _TargetLanguage.language_name.label("target_language_name"),
+    )
+    .join(_SourceLanguage, _SourceLanguage.language_id == Job.source_language_id)
+    .join(_TargetLanguage, _TargetLanguage.language_id == Job.target_language_id)
+    .where(Job.job_id == bindparam("job_id"))
+)
+
+
+def _describe_task(db: Session, task: Task) -> OpenTaskResponse:
+    details = db.execute(_TASK_DETAILS, {"job_id": task.job_id}).one()
+    return OpenTaskResponse(
+        task_id=task.task_id,
+        instruction=details.instruction,
+        max_time_per_task=task.max_time_per_task,
+        price=task.task_price,
+        source_text=task.source_text,
+        translated_text=task.translated_text,
+        source_language_name=details.source_language_name,
+        target_language_name=details.target_language_name,
+    )
+
+
+def _attach_tm_match(db: Session, task_data: OpenTaskResponse, source_language_id: int, target_language_id: int) -> None:
+    if not settings.TM_ENABLED:
+        return
+    # A suggestion is a convenience; never fail or delay the claim because of it.
+    try:
+        matches = find_matches(db, source_language_id, target_language_id, task_data.source_text, k=1, wait=False)
+        task_data.tm_match = matches[0] if matches else None
+    except Exception as e:
+        logger.warning(f"Translation memory lookup failed for task {task_data.task_id}: {str(e)}")
+
+
 @router.get("/open", response_model=Optional[OpenTaskResponse])
 def get_open_task(
     params: OpenTaskRequest = Depends(),
     db: Session = Depends(get_db)
 ):
     try:
-        now = datetime.now(timezone.utc)
-        SourceLanguage = aliased(Language)
-        TargetLanguage = aliased(Language)
-
-        task_data = (
-            db.query(
-                    Task.task_id,
-                    Task.source_text,
-                    Task.translated_text,
-                    Task.max_time_per_task,
-                    Task.task_price,
-                    Job.instructions.label("instruction"),
-                    SourceLanguage.language_name.label("source_language_name"),
-                    TargetLanguage.language_name.label("target_language_name"),
-                    Task.task_status,
-                )
-                .join(Job, Task.job_id == Job.job_id)
-                .join(SourceLanguage, Task.source_language_id == SourceLanguage.language_id)
-                .join(TargetLanguage, Task.target_language_id == TargetLanguage.language_id)
-                .filter(
-                    Task.source_language_id == params.source_language_id,
-                    Task.target_language_id == params.target_language_id,
-                    Task.is_assessment == "f",
-                    (
-                        (Task.task_status == "OPEN")
-                        |
-                        (
-                            (Task.task_status == "ASSIGNED_TO_FL") &
-                            (Task.assigned_at.isnot(None)) &
-                            text("(task.assigned_at + (task.max_time_per_task || ' minutes')::interval) < now()")
-                        )
-                    )
-                )
-                .order_by(Task.task_id)
-                .with_for_update(skip_locked=True)
-                .first()
-            )
-        
+        expert = _require_qualified(db, params.freelancer_id, params.source_language_id, params.target_language_id)
+        task_data = _lease_next_task(db, params.freelancer_id, params.source_language_id, params.target_language_id, expert)
         if not task_data:
-            return 
-        
-        task_to_update = db.query(Task).filter(Task.task_id == task_data.task_id).first()
-        task_to_update.assigned_freelancer_id = params.freelancer_id
-        task_to_update.assigned_at = now
-        task_to_update.task_status = "ASSIGNED_TO_FL"
+            return
         db.commit()
 
-        return OpenTaskResponse(
-            task_id=task_data.task_id,
-            instruction=task_data.instruction,
-            max_time_per_task=task_data.max_time_per_task,
-            price=task_data.task_price,
-            source_text=task_data.source_text,
-            translated_text=task_data.translated_text,
-            source_language_name=task_data.source_language_name,
-            target_language_name=task_data.target_language_name,
+        if params.include_tm_match:
+            _attach_tm_match(db, task_data, params.source_language_id, params.target_language_id)
+        return task_data
+
+    except HTTPException:
+        db.rollback()
+        raise
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error. Please try again later.")
+
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@router.get("/open_any", response_model=Optional[OpenTaskResponse])
+def get_open_task_any_pair(
+    params: OpenAnyTaskRequest = Depends(),
+    db: Session = Depends(get_db)
+):
+    """Lease the best OPEN task across every language pair the freelancer qualifies for."""
+    try:
+        pairs = qualified_pairs(db, params.freelancer_id)
+        if not pairs:
+            raise HTTPException(status_code=403, detail="Not qualified for any language pair")
+        task = claim_any_task(
+            db, params.freelancer_id, {pair: is_expert(accuracy) for pair, accuracy in pairs.items()}
         )
+        if not task:
+            db.commit()
+            return
+        task_data = _describe_task(db, task)
+        source_language_id, target_language_id = task.source_language_id, task.target_language_id
+        db.commit()
+
+        if params.include_tm_match:
+            _attach_tm_match(db, task_data, source_language_id, target_language_id)
+        return task_data
+
+    except HTTPException:
+        db.rollback()
+        raise
 
     except SQLAlchemyError as e:
         logger.error(f"Database error: {str(e)}")
@@ -250,48 +324,224 @@ def get_open_task(
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
 
+def _try_lease_next_task(db: Session, params: OpenTaskRequest, expert: Optional[bool]) -> Optional[OpenTaskResponse]:
+    try:
+        task_data = _lease_next_task(db, params.freelancer_id, params.source_language_id, params.target_language_id, expert)
+        # Commit even on a miss so no connection is held while the request waits.
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if task_data and params.include_tm_match:
+        _attach_tm_match(db, task_data, params.source_language_id, params.target_language_id)
+    return task_data
+
 
-@router.post("/submit", response_model=SubmitTaskResponse)
-def submit_task(
-    submission: SubmitTaskRequest,
+@router.get("/open_wait", response_model=Optional[OpenTaskResponse])
+async def wait_for_open_task(
+    params: OpenTaskRequest = Depends(),
+    timeout: int = Query(25, ge=0, le=settings.TASK_WAIT_MAX_SECONDS),
+    db: Session = Depends(get_db)
+):
+    """
+    Long-poll variant of /task/open: when the pair has no OPEN task, wait up
+    to ``timeout`` seconds for one to appear instead of returning null.
+    """
+    pair = (params.source_language_id, params.target_language_id)
+    deadline = time.monotonic() + timeout
+    try:
+        expert = await run_in_threadpool(
+            _require_qualified, db, params.freelancer_id, params.source_language_id, params.target_language_id
+        )
+        while True:
+            seen = task_notifier.version(pair)
+            task_data = await run_in_threadpool(_try_lease_next_task, db, params, expert)
+            remaining = deadline - time.monotonic()
+            if task_data or remaining <= 0:
+                return task_data
+            if not await task_notifier.wait(pair, seen, remaining):
+                return
+
+    except HTTPException:
+        raise
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error. Please try again later.")
+
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@router.get("/open_batch", response_model=Optional[OpenTaskBatchResponse])
+def get_open_task_batch(
+    params: OpenTaskRequest = Depends(),
+    n: int = Query(10, ge=1, le=settings.OPEN_BATCH_MAX_TASKS),
+    db: Session = Depends(get_db)
+):
+    try:
+        expert = _require_qualified(db, params.freelancer_id, params.source_language_id, params.target_language_id)
+        rows = claim_tasks(db, params.freelancer_id, params.source_language_id, params.target_language_id, n, expert=expert)
+        if not rows:
+            db.commit()
+            return
+
+        job_ids = {row.job_id for row in rows}
+        instructions = dict(db.query(Job.job_id, Job.instructions).filter(Job.job_id.in_(job_ids)).all())
+        language_names = dict(
+            db.query(Language.language_id, Language.language_name)
+            .filter(Language.language_id.in_([params.source_language_id, params.target_language_id]))
+            .all()
+        )
+        db.commit()
+
+        tasks = []
+        for row in rows:
+            tm_match = None
+            if settings.TM_ENABLED and params.include_tm_match:
+                try:
+                    matches = find_matches(db, params.source_language_id, params.target_language_id, row.source_text, k=1, wait=False)
+                    tm_match = matches[0] if matches else None
+                except Exception as e:
+                    logger.warning(f"Translation memory lookup failed for task {row.task_id}: {str(e)}")
+            tasks.append(LeasedTask(
+                task_id=row.task_id,
+                job_id=row.job_id,
+                max_time_per_task=row.max_time_per_task,
+                price=row.task_price,
+                source_text=row.source_text,
+                translated_text=row.translated_text,
+                lease_expires_at=row.lease_expires_at.astimezone(timezone.utc),
+                tm_match=tm_match,
+            ))
+
+        return OpenTaskBatchResponse(
+            source_language_name=language_names[params.source_language_id],
+            target_language_name=language_names[params.target_language_id],
+            instructions=instructions,
+            tasks=tasks,
+        )
+
+    except HTTPException:
+        db.rollback()
+        raise
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error. Please try again later.")
+
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@router.get("/tm_matches", response_model=List[TranslationMemoryMatch])
+def get_tm_matches(
+    source_language_id: int,
+    target_language_id: int,
+    source_text: str,
+    k: int = Query(5, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
+    if not settings.TM_ENABLED:
+        raise HTTPException(status_code=404, detail="Translation memory is disabled")
+    return find_matches(db, source_language_id, target_language_id, source_text, k=k)
+
+
+# Expiry is judged by the database clock, the same one the lease was written against.
+# The row lock makes the lease reaper skip a task being submitted and makes a
+# concurrent second submit of it find the task no longer assigned.
+_ASSIGNED_TASK = (
+    select(Task, (Task.lease_expires_at < func.now()).label("lease_expired"))
+    .where(
+        Task.task_id == bindparam("task_id"),
+        Task.assigned_freelancer_id == bindparam("freelancer_id"),
+        Task.task_status == "ASSIGNED_TO_FL",
+    )
+    .limit(1)
+    .with_for_update(of=Task)
+    .execution_options(populate_existing=True)
+)
+
+
+def _apply_submission(db: Session, submission: SubmitTaskRequest) -> Tuple[Task, SubmitTaskResponse]:
+    """Validate and store a submission (or release an expired lease); the caller commits."""
     now = datetime.now(timezone.utc)
     
-    task = db.query(Task).filter(
-        Task.task_id == submission.task_id,
-        Task.assigned_freelancer_id == submission.freelancer_id,
-        Task.task_status == "ASSIGNED_TO_FL"
+    row = db.execute(
+        _ASSIGNED_TASK, {"task_id": submission.task_id, "freelancer_id": submission.freelancer_id}
     ).first()
     
-    if not task:
+    if not row:
         raise HTTPException(status_code=404, detail="Task not found or not assigned to you")
+    task, lease_expired = row
     
-    if task.assigned_at is None:
+    if task.lease_expires_at is None:
         raise HTTPException(status_code=400, detail="Task has no assignment time set")
     
-    local_tz = ZoneInfo("Asia/Bangkok")
-    assigned_local = task.assigned_at.replace(tzinfo=local_tz)
-    assigned_at_aware = assigned_local.astimezone(timezone.utc)
-    
-    elapsed_initial = (now - assigned_at_aware).total_seconds() / 60  # elapsed time in minutes
-    elapsed = elapsed_initial
-    
-    if elapsed > task.max_time_per_task:
-        task.task_status = "OPEN"
-        db.commit()
-        return SubmitTaskResponse(message="Time to complete the task has expired")
+    if lease_expired:
+        release_task(db, task)
+        return task, SubmitTaskResponse(message="Time to complete the task has expired")
     
     task.translated_text = submission.translated_text
     task.submitted_by_id = submission.freelancer_id
     task.submitted_at = now
     task.task_status = "UNDER_REVIEW"
+    task.lease_expires_at = None
+    move_task_counts(db, task.job_id, TaskStatus.ASSIGNED_TO_FL, TaskStatus.UNDER_REVIEW)
+    return task, SubmitTaskResponse(message="Task submitted successfully")
+
+
+@router.post("/submit", response_model=SubmitTaskResponse)
+def submit_task(
+    submission: SubmitTaskRequest,
+    db: Session = Depends(get_db)
+):
+    _, response = _apply_submission(db, submission)
     db.commit()
-    
-    return SubmitTaskResponse(message="Task submitted successfully")
+    return response
+
+
+@router.post("/submit_and_next", response_model=SubmitAndNextResponse)
+def submit_and_next(
+    submission: SubmitAndNextRequest,
+    db: Session = Depends(get_db)
+):
+    """Submit a task and lease the next one of the same language pair in one transaction."""
+    try:
+        task, response = _apply_submission(db, submission)
+        accuracy = get_accuracy(db, submission.freelancer_id, task.source_language_id, task.target_language_id)
+        next_task = None
+        if accuracy is not None:
+            next_task = _lease_next_task(
+                db, submission.freelancer_id, task.source_language_id, task.target_language_id, is_expert(accuracy)
+            )
+        db.commit()
+
+        if next_task and submission.include_tm_match:
+            _attach_tm_match(db, next_task, task.source_language_id, task.target_language_id)
+        return SubmitAndNextResponse(message=response.message, next_task=next_task)
+
+    except HTTPException:
+        db.rollback()
+        raise
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error. Please try again later.")
+
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
 
 @router.get("/get_all_task_info")
-def get_all_task_info(db: Session = Depends(get_db)):
+def get_all_task_info(db: Session = Depends(get_read_db)):
     assessment_total = (
         db.query(func.count(AssessmentAttempt.attempt_id))
           .join(Task, Task.task_id == AssessmentAttempt.task_id)
@@ -406,47 +656,66 @@ def get_assessment_tasks(source_language_id: int, target_language_id: int, db: S
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _claim_reviews(db: Session, qa_id: int, source_language_id: int, target_language_id: int, limit: int):
+    """Lease up to ``limit`` submissions to ``qa_id`` and look up the pair's names; commits."""
+    qa_member = db.query(QAMember.qa_member_id).filter(QAMember.qa_member_id == qa_id).first()
+    if not qa_member:
+        raise HTTPException(status_code=400, detail="QA Member not found")
+
+    language_names = get_language_names(db, (source_language_id, target_language_id))
+    if len(language_names) < len({source_language_id, target_language_id}):
+        raise HTTPException(status_code=404, detail="One or both languages not found")
+
+    # Read the columns before the commit expires them.
+    tasks = [
+        {column.key: getattr(task, column.key) for column in Task.__table__.columns}
+        for task in claim_reviews(db, qa_id, source_language_id, target_language_id, limit)
+    ]
+    db.commit()
+    return tasks, language_names[source_language_id], language_names[target_language_id]
+
+
 @router.get("/get_submitted_tasks")
-async def get_submitted_tasks(
+def get_submitted_tasks(
     qa_id: int, source_language_id: int, target_language_id: int, db: Session = Depends(get_db)
 ):
     try:
-        qa_member = db.query(QAMember).filter(QAMember.qa_member_id == qa_id).first()
-        if not qa_member:
-            raise HTTPException(status_code=400, detail="QA Member not found")
-
-        task = db.query(Task).filter(
-            Task.source_language_id == source_language_id,
-            Task.target_language_id == target_language_id,
-            Task.is_assessment.is_(False),
-            Task.task_status == "UNDER_REVIEW",
-            Task.qa_assigned_at.is_(None),
-            Task.qa_assigned_id.is_(None)
-        ).first()
-
-        if task is None:
+        tasks, source_language, target_language = _claim_reviews(db, qa_id, source_language_id, target_language_id, 1)
+        if not tasks:
             return None
 
-        # Assign the task to the QA member
-        task.qa_assigned_at = datetime.now(timezone.utc)
-        task.qa_assigned_id = qa_id
-        db.commit()
-        db.refresh(task)
+        return {
+            "task": tasks[0],
+            "source_language": source_language,
+            "target_language": target_language
+        }
 
-        source_language = db.query(Language).filter(Language.language_id == source_language_id).first()
-        target_language = db.query(Language).filter(Language.language_id == target_language_id).first()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
 
-        if not source_language or not target_language:
-            raise HTTPException(status_code=404, detail="One or both languages not found")
 
+@router.get("/get_submitted_tasks_batch")
+def get_submitted_tasks_batch(
+    qa_id: int,
+    source_language_id: int,
+    target_language_id: int,
+    n: int = Query(10, ge=1, le=settings.OPEN_BATCH_MAX_TASKS),
+    db: Session = Depends(get_db)
+):
+    """Lease up to ``n`` submissions of a pair to one reviewer, oldest submission first."""
+    try:
+        tasks, source_language, target_language = _claim_reviews(db, qa_id, source_language_id, target_language_id, n)
         return {
-            "task": task,
-            "source_language": source_language.language_name,
-            "target_language": target_language.language_name
+            "tasks": tasks,
+            "source_language": source_language,
+            "target_language": target_language
         }
 
     except SQLAlchemyError as e:
         logger.error(f"Database error: {str(e)}")
+        db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -458,6 +727,26 @@ class QaReviewSubmit(BaseModel):
     qa_id: int
     decision: bool
 
+
+_TASK_UNDER_REVIEW = select(Task).where(
+    Task.task_id == bindparam("task_id"),
+    Task.qa_assigned_id == bindparam("qa_id"),
+    Task.task_status == "UNDER_REVIEW",
+).limit(1).with_for_update().execution_options(populate_existing=True)
+_OPEN_DUPLICATES = (Task.duplicate_of_id == bindparam("original_id"), Task.task_status == TaskStatus.OPEN)
+_COMPLETE_DUPLICATES = (
+    update(Task)
+    .where(*_OPEN_DUPLICATES)
+    .values(
+        translated_text=bindparam("approved_text"),
+        task_status=TaskStatus.COMPLETE,
+        qa_reviewed_by_id=bindparam("reviewer_id"),
+        qa_reviewed_at=bindparam("reviewed_at"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+
 @router.post("/submit_qa_review")
 def submit_qa_review(
     review_data: QaReviewSubmit,
@@ -465,71 +754,67 @@ def submit_qa_review(
 ):
     now = datetime.now(timezone.utc)
     
-    task = db.query(Task).filter(
-        Task.task_id == review_data.task_id,
-        Task.qa_assigned_id == review_data.qa_id,
-        Task.task_status == "UNDER_REVIEW"
-    ).first()
+    # The row stays locked until the commit; a second review of the same task waits here and then finds it reviewed.
+    task = db.scalars(_TASK_UNDER_REVIEW, {"task_id": review_data.task_id, "qa_id": review_data.qa_id}).first()
     
     if not task:
-        raise HTTPException(status_code=404, detail="Task not found or not assigned to you")
+        if db.scalar(select(Task.task_id).where(Task.task_id == review_data.task_id)) is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        raise HTTPException(status_code=409, detail="Task is not under review by you")
 
     submitted_fl_id = task.submitted_by_id
     source_language_id = task.source_language_id
     target_language_id = task.target_language_id
+    task_price = task.task_price
 
-    freelancer_language_pair = db.query(FreelancerLanguagePair).filter(
-            FreelancerLanguagePair.freelancer_id == submitted_fl_id,
-            FreelancerLanguagePair.source_language_id == source_language_id,
-            FreelancerLanguagePair.target_language_id == target_language_id
-        ).first()
-
-    review_qa = db.query(QAMember).filter(QAMember.qa_member_id == review_data.qa_id).first()
-
-    previoue_complete_of_qa = review_qa.total_tasks_reviewed or 0
-    previous_reject_of_qa = review_qa.total_tasks_rejected or 0
-    review_qa.total_tasks_reviewed = previoue_complete_of_qa + 1
-    
     # For an approved task:
     if review_data.decision:
         task.task_status = TaskStatus.COMPLETE
+        move_task_counts(db, task.job_id, TaskStatus.UNDER_REVIEW, TaskStatus.COMPLETE)
         task.qa_reviewed_by_id = review_data.qa_id
         task.qa_reviewed_at = now
+        task.qa_lease_expires_at = None
 
-        freelancer = db.query(Freelancer).filter(Freelancer.freelancer_id == submitted_fl_id).first()
-        task_price = task.task_price
-        freelancer.total_earnings += task_price
-        freelancer.current_balance += task_price
-
-        # Increment complete tasks
-        previous_complete_task = freelancer_language_pair.complete_task or 0
-        freelancer_language_pair.complete_task = previous_complete_task + 1
-
-        # Recalculate accuracy: (approved tasks / total complete tasks) * 100
-        current_rejected = freelancer_language_pair.rejected_task or 0
-        freelancer_language_pair.accuracy_rate = (((previous_complete_task + 1) - current_rejected) / (previous_complete_task + 1)) * 100
+        # Tasks in later jobs that were linked to this one as duplicates share its translation.
+        move_task_counts_for_tasks(db, _OPEN_DUPLICATES, LINKED_DUPLICATE, TaskStatus.COMPLETE, {"original_id": task.task_id})
+        db.execute(_COMPLETE_DUPLICATES, {
+            "original_id": task.task_id,
+            "approved_text": task.translated_text,
+            "reviewer_id": review_data.qa_id,
+            "reviewed_at": now,
+        })
 
     else:
         task.task_status = TaskStatus.OPEN
+        move_task_counts(db, task.job_id, TaskStatus.UNDER_REVIEW, TaskStatus.OPEN)
         task.assigned_freelancer_id = None
         task.assigned_at = None
+        task.lease_expires_at = None
         task.submitted_by_id = None
         task.translated_text = None
         task.submitted_at = None
         task.qa_assigned_id = None
         task.qa_assigned_at = None
+        task.qa_lease_expires_at = None
+        task.reused_from_id = None
+        notify_pairs(db, [(task.source_language_id, task.target_language_id)])
 
-        review_qa.total_tasks_rejected = previous_reject_of_qa + 1
-
-        # For a rejected task, complete_task remains unchanged; only update rejected count
-        previous_complete_task = freelancer_language_pair.complete_task or 0
-        freelancer_language_pair.complete_task = previous_complete_task + 1
-        previous_rejected_task = freelancer_language_pair.rejected_task or 0
-        freelancer_language_pair.rejected_task = previous_rejected_task + 1
-
-        freelancer_language_pair.accuracy_rate = (((previous_complete_task + 1) - (previous_rejected_task + 1)) / (previous_complete_task + 1)) * 100
+    # Counters move in SQL, so concurrent reviews of the same QA member or freelancer cannot lose updates.
+    rejected = 0 if review_data.decision else 1
+    record_reviewer(db, review_data.qa_id, reviewed=1, rejected=rejected)
 
+    # Reused translations have no submitting freelancer to pay or score.
+    if submitted_fl_id is not None:
+        # A rejection counts as reviewed work too; accuracy is the share of it that was approved.
+        record_pair(db, submitted_fl_id, source_language_id, target_language_id, reviewed=1, rejected=rejected)
+        if review_data.decision:
+            credit_earnings(db, submitted_fl_id, task_price)
 
     db.commit()
+    if submitted_fl_id is not None:
+        invalidate(submitted_fl_id, source_language_id, target_language_id)
+
+    if review_data.decision:
+        record_approved_task(task)
     
     return "QA review submitted successfully"
\ No newline at end of file
@@ -7,10 +7,22 @@ class TaskStatus(Enum):
     COMPLETE = "complete"
 
 class JobStatus(str, Enum):
+    INGESTING = "ingesting"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CLOSED = "closed"
 
+class IngestionStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class TranslationReuse(str, Enum):
+    OFF = "off"
+    COMPLETE = "complete"
+    REVIEW = "review"
+
 class IssueType(Enum):
     WRONG_SOURCE_LANGUAGE = "wrong_source_language"
     PAYMENT_DELAY = "payment_delay"
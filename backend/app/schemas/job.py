@@ -1,14 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from .base import Base
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from .enums import JobStatus
+from .enums import JobStatus, IngestionStatus, TranslationReuse
 from typing import Optional
 
 class Job(Base):
     __tablename__ = "job"
-
+    __table_args__ = (
+        Index(
+            "ix_job_dispatch",
+            "source_language_id", "target_language_id", "is_assessment",
+            postgresql_where=text("job_status = 'IN_PROGRESS'"),
+        ),
+    )
 
     job_id = Column(Integer, primary_key=True, autoincrement=True)
     job_title = Column(String, nullable=False)
@@ -22,6 +28,21 @@ class Job(Base):
     task_price = Column(Float, nullable=False)
     instructions = Column(String, nullable=False)
     notes = Column(String, nullable=True)
+    # Scheduling, see services.scheduler.
+    priority = Column(Integer, nullable=False, default=1, server_default="1")
+    deadline = Column(DateTime, nullable=True)
+    virtual_time = Column(Float, nullable=False, default=0.0, server_default="0")
+    # 1 (routine) to 5 (specialist); demanding jobs are routed to high-accuracy freelancers first.
+    difficulty = Column(Integer, nullable=False, default=1, server_default="1")
+    # At most this many tasks may be ASSIGNED_TO_FL at once; None means no limit.
+    max_active_assignments = Column(Integer, nullable=True)
+    # Task counts by status, kept current by services.job_progress.
+    open_tasks = Column(Integer, nullable=False, default=0)
+    # OPEN tasks waiting on a task of an earlier job with the same source; not claimable.
+    duplicate_tasks = Column(Integer, nullable=False, default=0)
+    assigned_tasks = Column(Integer, nullable=False, default=0)
+    under_review_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
 
     tasks = relationship("Task", back_populates="job", cascade="all, delete-orphan")
     source_language = relationship("Language", foreign_keys=[source_language_id])
@@ -43,8 +64,72 @@ class JobProgress(BaseModel):
     total_tasks: int
     completed_tasks: int
     under_review_tasks: int
+    open_tasks: int = 0
+    # Linked to an untranslated task of an earlier job; completed along with it.
+    duplicate_tasks: int = 0
+    # Active freelancer leases, limited by max_active_assignments when set.
+    assigned_tasks: int = 0
+    max_active_assignments: Optional[int] = None
     model_config = ConfigDict(from_attributes=True)
 
+class JobListItem(BaseModel):
+    job_id: int
+    job_title: str
+    job_status: JobStatus
+    is_assessment: bool
+    source_language_id: int
+    source_language_name: str
+    target_language_id: int
+    target_language_name: str
+    total_tasks: Optional[int]
+    completed_tasks: int
+    under_review_tasks: int
+    max_time_per_task: int
+    task_price: float
+    instructions: str
+    notes: Optional[str]
+    created_at: datetime
+    priority: int = 1
+    deadline: Optional[datetime] = None
+    max_active_assignments: Optional[int] = None
+    difficulty: int = 1
+    model_config = ConfigDict(from_attributes=True)
+
+class JobScheduleInput(BaseModel):
+    priority: int = Field(1, ge=1, le=100)
+    deadline: Optional[datetime] = None
+    max_active_assignments: Optional[int] = Field(None, ge=1)
+    difficulty: int = Field(1, ge=1, le=5)
+
+class IngestionOptions(BaseModel):
+    dedupe: bool = False
+    dedupe_across_jobs: bool = False
+    reuse_translations: TranslationReuse = TranslationReuse.OFF
+
+class JobIngestionSummary(BaseModel):
+    job_id: int
+    source_rows: int
+    total_tasks: int
+    duplicate_rows: int = 0
+    linked_tasks: int = 0
+    reused_tasks: int = 0
+    elapsed_seconds: float
+    rows_per_second: float
+
+class JobIngestionState(BaseModel):
+    ingestion_id: str
+    job_id: int
+    content_type: str
+    status: IngestionStatus
+    rows_processed: int = 0
+    rows_per_second: float = 0.0
+    total_tasks: Optional[int] = None
+    duplicate_rows: int = 0
+    linked_tasks: int = 0
+    reused_tasks: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
 
 class JobUpdateInput(BaseModel):
     job_title: str
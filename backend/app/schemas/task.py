@@ -1,13 +1,44 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from .base import Base
 from .job import JobStatus
 from .enums import TaskStatus
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
+from datetime import datetime
 
 class Task(Base):
     __tablename__ = "task"
+    __table_args__ = (
+        Index("ix_task_pair_source_hash", "source_language_id", "target_language_id", "source_hash"),
+        Index(
+            "ix_task_pair_completed_reviewed_at",
+            "source_language_id", "target_language_id", "qa_reviewed_at",
+            postgresql_where=text("task_status = 'COMPLETE'"),
+        ),
+        # Dispatch queue, see services.dispatch.
+        Index(
+            "ix_task_dispatch_open",
+            "source_language_id", "target_language_id", "is_assessment", "job_id", "task_id",
+            postgresql_where=text("task_status = 'OPEN' AND duplicate_of_id IS NULL"),
+        ),
+        Index(
+            "ix_task_review_queue",
+            "source_language_id", "target_language_id", "is_assessment", "submitted_at", "task_id",
+            postgresql_where=text("task_status = 'UNDER_REVIEW' AND qa_assigned_id IS NULL"),
+        ),
+        # Lease expiry, see services.lease_reaper.
+        Index(
+            "ix_task_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=text("task_status = 'ASSIGNED_TO_FL'"),
+        ),
+        Index(
+            "ix_task_qa_lease_expires_at",
+            "qa_lease_expires_at",
+            postgresql_where=text("task_status = 'UNDER_REVIEW'"),
+        ),
+    )
 
     task_id = Column(Integer, primary_key=True, autoincrement=True)
     job_id = Column(Integer, ForeignKey("job.job_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -25,9 +56,16 @@ class Task(Base):
     task_price = Column(Float, nullable=False)
     is_assessment = Column(Boolean, nullable=False, default=False)
     assigned_at = Column(DateTime, nullable=True)
+    # Lease deadlines are compared with the database clock, so they carry their time zone.
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     submitted_at = Column(DateTime, nullable=True)
     qa_assigned_at = Column(DateTime, nullable=True)
+    qa_lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     qa_reviewed_at = Column(DateTime, nullable=True)
+    source_hash = Column(String(64), nullable=True)
+    occurrences = Column(Integer, nullable=False, default=1)
+    duplicate_of_id = Column(Integer, ForeignKey("task.task_id", ondelete="SET NULL"), nullable=True, index=True)
+    reused_from_id = Column(Integer, ForeignKey("task.task_id", ondelete="SET NULL"), nullable=True, index=True)
 
     job = relationship("Job", back_populates="tasks")
     source_language = relationship("Language", foreign_keys=[source_language_id])
@@ -41,6 +79,17 @@ class OpenTaskRequest(BaseModel):
     freelancer_id: int
     source_language_id: int
     target_language_id: int
+    include_tm_match: bool = True
+
+class OpenAnyTaskRequest(BaseModel):
+    freelancer_id: int
+    include_tm_match: bool = True
+
+class TranslationMemoryMatch(BaseModel):
+    task_id: int
+    source_text: str
+    translated_text: str
+    similarity: float
 
 class OpenTaskResponse(BaseModel):
     task_id: int
@@ -51,6 +100,24 @@ class OpenTaskResponse(BaseModel):
     translated_text: Optional[str]
     source_language_name: str
     target_language_name: str
+    tm_match: Optional[TranslationMemoryMatch] = None
+
+class LeasedTask(BaseModel):
+    task_id: int
+    job_id: int
+    max_time_per_task: int
+    price: Optional[float]
+    source_text: str
+    translated_text: Optional[str]
+    lease_expires_at: datetime
+    tm_match: Optional[TranslationMemoryMatch] = None
+
+class OpenTaskBatchResponse(BaseModel):
+    source_language_name: str
+    target_language_name: str
+    # Instructions per job, sent once however many of the job's tasks were leased.
+    instructions: Dict[int, str]
+    tasks: List[LeasedTask]
 
 class SubmitTaskRequest(BaseModel):
     freelancer_id: int
@@ -58,4 +125,12 @@ class SubmitTaskRequest(BaseModel):
     translated_text: str
 
 class SubmitTaskResponse(BaseModel):
-    message: str
\ No newline at end of file
+    message: str
+
+class SubmitAndNextRequest(SubmitTaskRequest):
+    include_tm_match: bool = True
+
+class SubmitAndNextResponse(BaseModel):
+    message: str
+    # None when the pair has no OPEN task left.
+    next_task: Optional[OpenTaskResponse] = None
\ No newline at end of file
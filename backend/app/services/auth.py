@@ -3,10 +3,11 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from fastapi import HTTPException, Depends, status
-from ..core.database import get_db
+from ..core.database import get_async_db
 from ..core.config import get_settings
 from ..schemas.freelancer import Freelancer
 from ..schemas.admin import Admin
@@ -63,11 +64,11 @@ async def send_verification_email(email: str, verification_code: str):
     fm = FastMail(conf)
     await fm.send_message(message, template_name="email_verify.html")
 
-async def check_existing_user(db: Session, email: str):
+async def check_existing_user(db: AsyncSession, email: str):
     try:
-        admin = db.query(Admin).filter(Admin.email == email).first()
-        freelancer = db.query(Freelancer).filter(Freelancer.email == email).first()
-        qa_member = db.query(QAMember).filter(QAMember.email == email).first()
+        admin = await db.scalar(select(Admin).where(Admin.email == email))
+        freelancer = await db.scalar(select(Freelancer).where(Freelancer.email == email))
+        qa_member = await db.scalar(select(QAMember).where(QAMember.email == email))
 
         if admin:
             return admin, "admin"
@@ -83,7 +84,7 @@ async def check_existing_user(db: Session, email: str):
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Exception to raise if credentials are invalid
     credentials_exception = HTTPException(
@@ -105,7 +106,7 @@ async def get_current_user(
 
     # Query the database for the user with the provided email
     for model in [Freelancer, Admin, QAMember]:
-        user = db.query(model).filter(model.email == email).first()
+        user = await db.scalar(select(model).where(model.email == email))
         if user:
             break
 
@@ -0,0 +1,333 @@
+"""
+Task dispatch: hands out claimable tasks per language pair.
+
+Only OPEN tasks are claimable; assignments whose ``lease_expires_at`` has
+passed are returned to OPEN by services.lease_reaper, so the claim never
+evaluates expiry. The partial index ``ix_task_dispatch_open`` is keyed by
+(source, target, is_assessment, job_id) and orders each job's OPEN tasks
+by task_id. services.scheduler decides which job is served next; the
+claim then walks that job's slice of the index. The primary key cannot
+produce that order, so the planner is never tempted to walk it past a
+long history of completed tasks.
+
+QA reviews are dispatched the same way from ``ix_task_review_queue``:
+UNDER_REVIEW submissions without a reviewer, oldest submission first.
+Expired QA leases are unassigned by the reaper and rejoin the queue.
+
+Claims use ``FOR UPDATE SKIP LOCKED`` so concurrent freelancers and
+reviewers never wait on, or receive, the same row.
+
+Every claim also updates its job row: the counters of services.job_progress,
+the cap check and the scheduler's charge are one UPDATE, and its row lock
+is held until the claim commits. Claims of one job therefore queue on that
+row for the rest of their transaction, however many tasks it has. The
+charge adds no lock of its own, and the cap check needs the lock anyway,
+so the cost is paid once per claim; a batch claim (claim_tasks) pays it
+once per job per batch, which is the way to go for heavy single-job
+traffic. Keep the work after a claim short so the lock is short.
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Row, Select, bindparam, func, literal_column, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..schemas.enums import TaskStatus
+from ..schemas.job import Job
+from ..schemas.task import Task
+from .job_progress import COUNT, counter_update, move_task_counts
+from .scheduler import (
+    IS_ASSESSMENT,
+    SOURCE_LANGUAGE_ID,
+    TARGET_LANGUAGE_ID,
+    any_pair_queue,
+    charge,
+    has_room,
+    next_job,
+    pair_params,
+    pick_jobs,
+)
+from .task_notifier import notify_pairs
+
+# Inlined rather than bound so the planner can match the partial index
+# predicate even for generic prepared-statement plans.
+OPEN = literal_column("'OPEN'")
+UNDER_REVIEW = literal_column("'UNDER_REVIEW'")
+
+settings = get_settings()
+
+
+def open_tasks_query(source_language_id, target_language_id, is_assessment=False):
+    return (
+        select(Task)
+        .where(
+            Task.source_language_id == source_language_id,
+            Task.target_language_id == target_language_id,
+            Task.is_assessment == is_assessment,
+            Task.task_status == OPEN,
+            Task.duplicate_of_id.is_(None),
+        )
+        .order_by(Task.job_id, Task.task_id)
+    )
+
+
+def lease_expiry():
+    """
+    A claimed task's deadline, ``max_time_per_task`` minutes from now by the database clock.
+
+    Submissions and the lease reaper judge expiry against ``now()`` as well,
+    so the app hosts' clocks never enter into it.
+    """
+    return func.now() + func.make_interval(0, 0, 0, 0, 0, Task.max_time_per_task)
+
+
+def _open_tasks_in(source_language_id, target_language_id, is_assessment, job_id):
+    query = open_tasks_query(source_language_id, target_language_id, is_assessment)
+    if job_id is None:
+        # The pair-wide fallback never touches capped jobs; those are only served through the scheduler.
+        return query.where(Task.job_id.notin_(select(Job.job_id).where(Job.max_active_assignments.isnot(None))))
+    return query.where(Task.job_id == job_id)
+
+
+def _claimable(query):
+    return query.limit(1).with_for_update(skip_locked=True)
+
+
+# The claim statements are built once, with the pair and job as bind parameters,
+# so a request neither rebuilds them nor recomputes their compiled-cache key.
+@lru_cache(maxsize=None)
+def _scheduled_claim(expert: Optional[bool]):
+    # The scheduler's job, inlined into the claim.
+    job_id = next_job(SOURCE_LANGUAGE_ID, TARGET_LANGUAGE_ID, IS_ASSESSMENT, expert)
+    return _claimable(_open_tasks_in(SOURCE_LANGUAGE_ID, TARGET_LANGUAGE_ID, IS_ASSESSMENT, job_id))
+
+
+_JOB_CLAIM = _claimable(_open_tasks_in(SOURCE_LANGUAGE_ID, TARGET_LANGUAGE_ID, IS_ASSESSMENT, bindparam("job_id")))
+_PAIR_CLAIM = _claimable(_open_tasks_in(SOURCE_LANGUAGE_ID, TARGET_LANGUAGE_ID, IS_ASSESSMENT, None))
+_CLAIM_COUNTS = counter_update(TaskStatus.OPEN, TaskStatus.ASSIGNED_TO_FL, values=charge(COUNT), condition=has_room())
+
+
+def _claim_order(db: Session, source_language_id: int, target_language_id: int, is_assessment: bool, expert: Optional[bool]) -> Iterator:
+    # The scheduler's job first; the other candidates and then the whole pair only
+    # if every task of that job is locked or it reached its cap meanwhile.
+    params = pair_params(source_language_id, target_language_id, is_assessment)
+    yield _scheduled_claim(expert), params
+    for job_id in pick_jobs(db, source_language_id, target_language_id, is_assessment, expert)[1:]:
+        yield _JOB_CLAIM, {**params, "job_id": job_id}
+    yield _PAIR_CLAIM, params
+
+
+def claim_task(
+    db: Session,
+    freelancer_id: int,
+    source_language_id: int,
+    target_language_id: int,
+    is_assessment: bool = False,
+    expert: Optional[bool] = None,
+) -> Optional[Task]:
+    """
+    Assign the next OPEN task of a language pair to ``freelancer_id``; the caller commits.
+
+    ``expert`` is passed to the scheduler for accuracy-based routing.
+    """
+    return _claim_first(
+        db, freelancer_id, _claim_order(db, source_language_id, target_language_id, is_assessment, expert)
+    )
+
+
+def any_pair_open_tasks_query(pairs: Dict[Tuple[int, int], bool], is_assessment: bool = False):
+    """OPEN tasks of the best job across ``pairs``; the job's pair and id form the ``ix_task_dispatch_open`` key."""
+    best = any_pair_queue(pairs, is_assessment).limit(1).scalar_subquery()
+    return (
+        select(Task)
+        .where(
+            tuple_(Task.source_language_id, Task.target_language_id, Task.job_id) == best,
+            Task.is_assessment == is_assessment,
+            Task.task_status == OPEN,
+            Task.duplicate_of_id.is_(None),
+        )
+        .order_by(Task.task_id)
+    )
+
+
+def _any_pair_claim_order(db: Session, pairs: Dict[Tuple[int, int], bool], is_assessment: bool) -> Iterator:
+    # Same fallbacks as _claim_order, across every pair.
+    yield _claimable(any_pair_open_tasks_query(pairs, is_assessment)), None
+    queue = any_pair_queue(pairs, is_assessment)
+    for source_language_id, target_language_id, job_id in db.execute(queue.limit(settings.SCHEDULER_CANDIDATE_JOBS)).all()[1:]:
+        yield _JOB_CLAIM, {**pair_params(source_language_id, target_language_id, is_assessment), "job_id": job_id}
+    for source_language_id, target_language_id in pairs:
+        yield _PAIR_CLAIM, pair_params(source_language_id, target_language_id, is_assessment)
+
+
+def claim_any_task(
+    db: Session,
+    freelancer_id: int,
+    pairs: Dict[Tuple[int, int], bool],
+    is_assessment: bool = False,
+) -> Optional[Task]:
+    """
+    Assign the best OPEN task of any of ``pairs`` to ``freelancer_id``; the caller commits.
+
+    ``pairs`` maps each ``(source, target)`` the freelancer qualifies for to
+    whether they count as an expert in it. The job is chosen by
+    scheduler.any_pair_queue inside the claim statement itself.
+    """
+    return _claim_first(db, freelancer_id, _any_pair_claim_order(db, pairs, is_assessment))
+
+
+def _claim_first(db: Session, freelancer_id: int, claims: Iterator[Tuple[Select, Optional[Dict]]]) -> Optional[Task]:
+    # Claim the first task any of the ``(statement, params)`` in ``claims`` yields whose job still has room.
+    for statement, params in claims:
+        task = db.scalars(statement, params).first()
+        # The counter move doubles as the cap check, so concurrent claims cannot overshoot it.
+        if task is not None and move_task_counts(
+            db, task.job_id, TaskStatus.OPEN, TaskStatus.ASSIGNED_TO_FL, statement=_CLAIM_COUNTS
+        ):
+            break
+    else:
+        return None
+
+    task.task_status = TaskStatus.ASSIGNED_TO_FL
+    task.assigned_freelancer_id = freelancer_id
+    # Written as SQL expressions, so the flush uses the database clock; the
+    # attributes are reloaded if read afterwards.
+    task.assigned_at = func.now()
+    task.lease_expires_at = lease_expiry()
+    db.flush()
+    return task
+
+
+def _room(db: Session, job_id: int, wanted: int) -> int:
+    """
+    How many more tasks a job may have assigned, up to ``wanted``.
+
+    A capped job's row is locked until commit, so concurrent batches cannot
+    overshoot the cap. FOR UPDATE only locks the rows the WHERE clause
+    matches, so an uncapped job is not locked here; its row is only locked
+    by the counter move once the batch is leased.
+    """
+    assigned = db.execute(
+        select(Job.max_active_assignments, Job.assigned_tasks)
+        .where(Job.job_id == job_id, Job.max_active_assignments.isnot(None))
+        .with_for_update()
+    ).one_or_none()
+    if assigned is None:
+        return wanted
+    cap, assigned = assigned
+    return max(min(wanted, cap - assigned), 0)
+
+
+def claim_tasks(
+    db: Session,
+    freelancer_id: int,
+    source_language_id: int,
+    target_language_id: int,
+    limit: int,
+    is_assessment: bool = False,
+    expert: Optional[bool] = None,
+) -> List[Row]:
+    """
+    Lease up to ``limit`` OPEN tasks of a language pair to ``freelancer_id``.
+
+    Tasks are taken from the scheduler's jobs in order, one UPDATE per job
+    until the batch is full, never taking a job past its cap. Each task
+    gets its own deadline from its max_time_per_task. Returns the leased
+    rows in dispatch order; the caller commits.
+    """
+    rows = []
+    for job_id in [*pick_jobs(db, source_language_id, target_language_id, is_assessment, expert), None]:
+        wanted = limit - len(rows)
+        if job_id is not None:
+            wanted = _room(db, job_id, wanted)
+            if not wanted:
+                continue
+        candidates = (
+            _open_tasks_in(source_language_id, target_language_id, is_assessment, job_id)
+            .with_only_columns(Task.task_id)
+            .limit(wanted)
+            .with_for_update(skip_locked=True)
+            .subquery()
+        )
+        rows += db.execute(
+            update(Task)
+            .where(Task.task_id.in_(select(candidates.c.task_id)))
+            .values(
+                task_status=TaskStatus.ASSIGNED_TO_FL,
+                assigned_freelancer_id=freelancer_id,
+                assigned_at=func.now(),
+                lease_expires_at=lease_expiry(),
+            )
+            .returning(
+                Task.task_id,
+                Task.job_id,
+                Task.max_time_per_task,
+                Task.task_price,
+                Task.source_text,
+                Task.translated_text,
+                Task.lease_expires_at,
+            ),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if len(rows) >= limit:
+            break
+
+    for job_id, count in Counter(row.job_id for row in rows).items():
+        move_task_counts(db, job_id, TaskStatus.OPEN, TaskStatus.ASSIGNED_TO_FL, count, values=charge(count))
+    return sorted(rows, key=lambda row: (row.job_id, row.task_id))
+
+
+def release_task(db: Session, task: Task) -> None:
+    """Return an assigned task to the OPEN pool; the caller commits."""
+    move_task_counts(db, task.job_id, TaskStatus.ASSIGNED_TO_FL, TaskStatus.OPEN)
+    task.task_status = TaskStatus.OPEN
+    task.assigned_freelancer_id = None
+    task.assigned_at = None
+    task.lease_expires_at = None
+    notify_pairs(db, [(task.source_language_id, task.target_language_id)])
+
+
+def review_queue_query(source_language_id: int, target_language_id: int, is_assessment: bool = False):
+    return (
+        select(Task.task_id)
+        .where(
+            Task.source_language_id == source_language_id,
+            Task.target_language_id == target_language_id,
+            Task.is_assessment == is_assessment,
+            Task.task_status == UNDER_REVIEW,
+            Task.qa_assigned_id.is_(None),
+        )
+        .order_by(Task.submitted_at, Task.task_id)
+    )
+
+
+def claim_reviews(
+    db: Session,
+    qa_id: int,
+    source_language_id: int,
+    target_language_id: int,
+    limit: int,
+) -> List[Task]:
+    """Lease up to ``limit`` unassigned submissions of a pair to ``qa_id`` in one statement; the caller commits."""
+    now = datetime.now(timezone.utc)
+    candidates = (
+        review_queue_query(source_language_id, target_language_id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    tasks = db.scalars(
+        update(Task)
+        .where(Task.task_id.in_(candidates))
+        .values(
+            qa_assigned_id=qa_id,
+            qa_assigned_at=now,
+            qa_lease_expires_at=now + timedelta(minutes=settings.QA_LEASE_MINUTES),
+        )
+        .returning(Task),
+        execution_options={"synchronize_session": False},
+    ).all()
+    return sorted(tasks, key=lambda task: (task.submitted_at is None, task.submitted_at, task.task_id))
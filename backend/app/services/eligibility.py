@@ -0,0 +1,102 @@
+"""
+In-memory cache of which freelancers may claim tasks of a language pair.
+
+A freelancer qualifies for a pair once their assessment is reviewed
+(status COMPLETE) with an accuracy of at least ``ELIGIBILITY_MIN_ACCURACY``,
+the same rule the freelancer UI applies. The cache maps
+``(freelancer_id, source, target)`` to that accuracy, or None when the
+freelancer does not qualify, so the claim path needs no query on
+``freelancer_language_pair`` once an entry is warm.
+
+``qualified_pairs`` caches the same rule for all of a freelancer's pairs
+at once, for claims that may be served from any of them.
+
+This process drops an entry as soon as it commits a change to the pair
+(assessment review, QA decision, appeal). Entries also expire after
+``ELIGIBILITY_CACHE_SECONDS``, which bounds how long another worker
+process can act on a stale accuracy.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..schemas.enums import AssSubmission
+from ..schemas.freelancer_language_pair import FreelancerLanguagePair
+
+settings = get_settings()
+
+Key = Tuple[int, int, int]
+
+_entries: Dict[Key, Tuple[float, Optional[float]]] = {}
+_pairs: Dict[int, Tuple[float, Dict[Tuple[int, int], float]]] = {}
+_lock = threading.Lock()
+
+
+def _qualifying(status, accuracy_rate) -> Optional[float]:
+    if status != AssSubmission.COMPLETE:
+        return None
+    accuracy = accuracy_rate or 0.0
+    return accuracy if accuracy >= settings.ELIGIBILITY_MIN_ACCURACY else None
+
+
+def _load(db: Session, key: Key) -> Optional[float]:
+    freelancer_id, source_language_id, target_language_id = key
+    row = db.query(FreelancerLanguagePair.status, FreelancerLanguagePair.accuracy_rate).filter(
+        FreelancerLanguagePair.freelancer_id == freelancer_id,
+        FreelancerLanguagePair.source_language_id == source_language_id,
+        FreelancerLanguagePair.target_language_id == target_language_id,
+    ).first()
+    return None if row is None else _qualifying(row.status, row.accuracy_rate)
+
+
+def get_accuracy(db: Session, freelancer_id: int, source_language_id: int, target_language_id: int) -> Optional[float]:
+    """The freelancer's accuracy for the pair if they qualify for it, otherwise None."""
+    key = (freelancer_id, source_language_id, target_language_id)
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+    if entry is not None and now - entry[0] < settings.ELIGIBILITY_CACHE_SECONDS:
+        return entry[1]
+
+    accuracy = _load(db, key)
+    with _lock:
+        _entries[key] = (now, accuracy)
+    return accuracy
+
+
+def qualified_pairs(db: Session, freelancer_id: int) -> Dict[Tuple[int, int], float]:
+    """``{(source, target): accuracy}`` for every pair the freelancer qualifies for."""
+    now = time.monotonic()
+    with _lock:
+        entry = _pairs.get(freelancer_id)
+    if entry is not None and now - entry[0] < settings.ELIGIBILITY_CACHE_SECONDS:
+        return entry[1]
+
+    rows = db.query(
+        FreelancerLanguagePair.source_language_id,
+        FreelancerLanguagePair.target_language_id,
+        FreelancerLanguagePair.status,
+        FreelancerLanguagePair.accuracy_rate,
+    ).filter(FreelancerLanguagePair.freelancer_id == freelancer_id).all()
+    pairs = {}
+    for row in rows:
+        accuracy = _qualifying(row.status, row.accuracy_rate)
+        if accuracy is not None:
+            pairs[(row.source_language_id, row.target_language_id)] = accuracy
+    with _lock:
+        _pairs[freelancer_id] = (now, pairs)
+    return pairs
+
+
+def is_expert(accuracy: Optional[float]) -> bool:
+    return accuracy is not None and accuracy >= settings.ROUTING_EXPERT_ACCURACY
+
+
+def invalidate(freelancer_id: int, source_language_id: int, target_language_id: int) -> None:
+    """Forget a cached entry; call after committing a change to the pair."""
+    with _lock:
+        _entries.pop((freelancer_id, source_language_id, target_language_id), None)
+        _pairs.pop(freelancer_id, None)
@@ -0,0 +1,309 @@
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+SourceTextImporter = Callable[[BinaryIO], Iterator[str]]
+
+CSV_CONTENT_TYPE = "text/csv"
+JSONL_CONTENT_TYPE = "application/jsonl"
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+XLIFF_CONTENT_TYPE = "application/xliff+xml"
+TMX_CONTENT_TYPE = "application/x-tmx+xml"
+
+# Importers are keyed by canonical content type; aliases and file extensions
+# resolve to one of those keys because browsers report uploads inconsistently.
+IMPORTERS: Dict[str, SourceTextImporter] = {}
+CONTENT_TYPE_ALIASES: Dict[str, str] = {}
+EXTENSION_CONTENT_TYPES: Dict[str, str] = {}
+
+# TMX inline elements whose content is native markup rather than translatable text.
+TMX_INLINE_CODES = ("bpt", "ept", "it", "ph", "ut")
+
+
+def register_importer(content_type: str, aliases: Iterable[str] = (), extensions: Iterable[str] = ()):
+    def decorator(func: SourceTextImporter) -> SourceTextImporter:
+        IMPORTERS[content_type] = func
+        for alias in aliases:
+            CONTENT_TYPE_ALIASES[alias] = content_type
+        for extension in extensions:
+            EXTENSION_CONTENT_TYPES[extension] = content_type
+        return func
+    return decorator
+
+
+def resolve_content_type(content_type: Optional[str], filename: Optional[str] = None) -> str:
+    """Pick the importer for an upload, preferring its file extension over the reported type."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in EXTENSION_CONTENT_TYPES:
+        return EXTENSION_CONTENT_TYPES[extension]
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    media_type = CONTENT_TYPE_ALIASES.get(media_type, media_type)
+    if media_type in IMPORTERS:
+        return media_type
+    if media_type in ("", "application/octet-stream"):
+        # Uploads without a usable type have always been treated as CSV.
+        return CSV_CONTENT_TYPE
+
+    raise ValueError(f"Unsupported upload format: {filename or content_type}")
+
+
+def get_importer(content_type: str) -> SourceTextImporter:
+    return IMPORTERS[content_type]
+
+
+def iter_batches(rows: Iterable, batch_size: int) -> Iterator[List]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def normalize_source_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def source_text_hash(text: str) -> str:
+    """SHA-256 of an already-normalised source text, used to spot identical segments."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_source_texts(texts: Iterable[str]) -> Iterator[str]:
+    for text in texts:
+        text = normalize_source_text(text)
+        if text:
+            yield text
+
+
+@register_importer(CSV_CONTENT_TYPE, aliases=("application/csv", "application/vnd.ms-excel"), extensions=(".csv",))
+def iter_csv_source_texts(fileobj: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[str]:
+    """
+    Yield the first column of a headerless CSV upload one row at a time.
+
+    The file is decoded and tokenised incrementally, so only the current
+    read buffer and row are held in memory regardless of the file size.
+    Blank rows are skipped.
+    """
+    text_stream = io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+    line_number = 0
+    try:
+        for line_number, row in enumerate(csv.reader(text_stream), start=1):
+            if not row or not row[0].strip():
+                continue
+            yield row[0]
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Could not parse CSV upload near row {line_number + 1}: {e}") from e
+    finally:
+        # Hand the underlying file back to the caller instead of closing it.
+        text_stream.detach()
+
+
+@register_importer(JSONL_CONTENT_TYPE, aliases=("application/x-ndjson", "application/jsonlines"), extensions=(".jsonl", ".ndjson"))
+def iter_jsonl_source_texts(fileobj: BinaryIO) -> Iterator[str]:
+    """Yield one segment per JSON line: either a bare string or an object with ``source_text``."""
+    text_stream = io.TextIOWrapper(fileobj, encoding="utf-8-sig")
+    line_number = 0
+    try:
+        for line_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record = record.get("source_text", record.get("source"))
+            if not isinstance(record, str):
+                raise ValueError("expected a string or an object with a source_text field")
+            if record.strip():
+                yield record
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Could not parse JSONL upload at line {line_number}: {e}") from e
+    finally:
+        text_stream.detach()
+
+
+@register_importer(XLSX_CONTENT_TYPE, extensions=(".xlsx",))
+def iter_xlsx_source_texts(fileobj: BinaryIO) -> Iterator[str]:
+    """Yield the first column of the first worksheet using openpyxl's streaming read-only mode."""
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Could not open XLSX upload: {e}") from e
+
+    try:
+        worksheet = workbook.worksheets[0]
+        for (value,) in worksheet.iter_rows(min_col=1, max_col=1, values_only=True):
+            if value is None or not str(value).strip():
+                continue
+            yield str(value)
+    finally:
+        workbook.close()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _segment_text(elem, inline_codes=()) -> str:
+    """Flatten a segment's text, dropping the content (but not the tail) of inline code tags."""
+    parts = [elem.text or ""]
+    for child in elem:
+        if _local_name(child.tag) not in inline_codes:
+            parts.append(_segment_text(child, inline_codes))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _iter_xml_events(fileobj: BinaryIO, label: str):
+    """Yield ``(event, element, parent)`` from an incremental parse of ``fileobj``."""
+    stack = []
+    try:
+        for event, elem in iterparse(fileobj, events=("start", "end")):
+            if event == "start":
+                yield event, elem, stack[-1] if stack else None
+                stack.append(elem)
+            else:
+                stack.pop()
+                yield event, elem, stack[-1] if stack else None
+    except SyntaxError as e:
+        # ElementTree.ParseError subclasses SyntaxError.
+        raise ValueError(f"Could not parse {label} upload: {e}") from e
+
+
+def _discard(elem, parent) -> None:
+    # Drop a fully-read unit from the tree so memory stays constant.
+    elem.clear()
+    if parent is not None:
+        parent.remove(elem)
+
+
+@register_importer(XLIFF_CONTENT_TYPE, aliases=("application/x-xliff+xml",), extensions=(".xlf", ".xliff"))
+def iter_xliff_source_texts(fileobj: BinaryIO) -> Iterator[str]:
+    """
+    Yield the <source> of every XLIFF 1.2 trans-unit or XLIFF 2.x segment.
+
+    Sources inside <alt-trans> are suggestions, not segments, and are skipped.
+    """
+    alt_trans_depth = 0
+    for event, elem, parent in _iter_xml_events(fileobj, "XLIFF"):
+        name = _local_name(elem.tag)
+        if event == "start":
+            if name == "alt-trans":
+                alt_trans_depth += 1
+            continue
+
+        if name == "alt-trans":
+            alt_trans_depth -= 1
+        elif name == "source" and not alt_trans_depth:
+            text = _segment_text(elem)
+            if text.strip():
+                yield text
+        elif name in ("trans-unit", "unit"):
+            _discard(elem, parent)
+
+
+@register_importer(TMX_CONTENT_TYPE, aliases=("application/tmx+xml",), extensions=(".tmx",))
+def iter_tmx_source_texts(fileobj: BinaryIO) -> Iterator[str]:
+    """
+    Yield the source-language <seg> of every TMX translation unit.
+
+    The source language comes from the header's ``srclang``; when it is
+    missing or ``*all*`` the first variant of each unit is used.
+    """
+    xml_lang = "{http://www.w3.org/XML/1998/namespace}lang"
+    source_lang = None
+    unit_text = None
+    first_text = None
+    current_lang = None
+
+    for event, elem, parent in _iter_xml_events(fileobj, "TMX"):
+        name = _local_name(elem.tag)
+        if event == "start":
+            if name == "header":
+                srclang = (elem.get("srclang") or "").lower()
+                source_lang = None if srclang in ("", "*all*") else srclang
+            elif name == "tu":
+                unit_text = first_text = None
+            elif name == "tuv":
+                current_lang = (elem.get(xml_lang) or elem.get("lang") or "").lower()
+            continue
+
+        if name == "seg":
+            text = _segment_text(elem, TMX_INLINE_CODES)
+            if first_text is None:
+                first_text = text
+            if source_lang and unit_text is None and current_lang.split("-")[0] == source_lang.split("-")[0]:
+                unit_text = text
+        elif name == "tu":
+            text = unit_text if unit_text is not None else first_text
+            if text and text.strip():
+                yield text
+            _discard(elem, parent)
+
+
+def split_csv_ranges(path: str, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield ``(start, end)`` byte ranges of roughly ``chunk_bytes`` that end on record boundaries.
+
+    A newline only ends a record when the number of quote characters before
+    it is even, so quoted fields that span lines are never split.
+    """
+    start = 0
+    quotes_open = False
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            quotes_open ^= bool(data.count(b'"') & 1)
+            while quotes_open or not data.endswith(b"\n"):
+                data = f.readline()
+                if not data:
+                    break
+                quotes_open ^= bool(data.count(b'"') & 1)
+            end = f.tell()
+            yield start, end
+            start = end
+
+
+def _parse_csv_range(path: str, start: int, end: int) -> List[str]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    try:
+        text = data.decode("utf-8-sig" if start == 0 else "utf-8")
+        rows = csv.reader(io.StringIO(text, newline=""))
+        return list(normalize_source_texts(row[0] for row in rows if row))
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Could not parse CSV upload between bytes {start} and {end}: {e}") from e
+
+
+def iter_csv_source_texts_parallel(path: str, workers: int, chunk_bytes: int) -> Iterator[str]:
+    """
+    Parse and normalise a spooled CSV file in a process pool, yielding rows in file order.
+
+    At most ``2 * workers`` chunks are in flight, so memory is bounded by the
+    chunk size rather than the file size.
+    """
+    # Spawned workers only import this module, never the app or its settings.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = deque()
+        for start, end in split_csv_ranges(path, chunk_bytes):
+            pending.append(pool.submit(_parse_csv_range, path, start, end))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
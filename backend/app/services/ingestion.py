@@ -0,0 +1,455 @@
+import contextlib
+import csv
+import io
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from ..core.config import get_settings
+from ..schemas.enums import IngestionStatus, JobStatus, TaskStatus, TranslationReuse
+from ..schemas.job import Job, IngestionOptions, JobIngestionState, JobIngestionSummary
+from ..schemas.task import Task
+from .job_progress import recount_jobs
+from .scheduler import start_virtual_time
+from .task_notifier import notify_pairs
+from .importers import (
+    CSV_CONTENT_TYPE,
+    get_importer,
+    iter_batches,
+    iter_csv_source_texts_parallel,
+    normalize_source_texts,
+    source_text_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Column order used for both the COPY payload and the executemany fallback.
+TASK_COPY_COLUMNS = (
+    "job_id",
+    "job_status",
+    "source_language_id",
+    "source_text",
+    "target_language_id",
+    "max_time_per_task",
+    "task_status",
+    "task_price",
+    "is_assessment",
+    "source_hash",
+    "occurrences",
+    "duplicate_of_id",
+    "translated_text",
+    "reused_from_id",
+)
+
+
+def _supports_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _task_rows(
+    job: Job,
+    texts: List[str],
+    hashes: List[str],
+    canonical_ids: Dict[str, int],
+    approved: Dict[str, Tuple[int, str]],
+    reuse: TranslationReuse,
+) -> List[dict]:
+    # Reused tasks skip translation: they are either complete already or wait for QA only.
+    reused_status = TaskStatus.COMPLETE if reuse == TranslationReuse.COMPLETE else TaskStatus.UNDER_REVIEW
+    rows = []
+    for text, source_hash in zip(texts, hashes):
+        reused_from_id, translated_text = approved.get(source_hash, (None, None))
+        rows.append({
+            "job_id": job.job_id,
+            "job_status": JobStatus.IN_PROGRESS,
+            "source_language_id": job.source_language_id,
+            "source_text": text,
+            "target_language_id": job.target_language_id,
+            "max_time_per_task": job.max_time_per_task,
+            "task_status": reused_status if reused_from_id else TaskStatus.OPEN,
+            "task_price": job.task_price,
+            "is_assessment": job.is_assessment,
+            "source_hash": source_hash,
+            "occurrences": 1,
+            "duplicate_of_id": None if reused_from_id else canonical_ids.get(source_hash),
+            "translated_text": translated_text,
+            "reused_from_id": reused_from_id,
+        })
+    return rows
+
+
+def _find_canonical_tasks(db: Session, job: Job, hashes: List[str]) -> Dict[str, int]:
+    """Map each hash to the oldest untranslated task with that source in an earlier job of the same pair."""
+    rows = db.execute(
+        select(Task.source_hash, func.min(Task.task_id))
+        .where(
+            Task.source_language_id == job.source_language_id,
+            Task.target_language_id == job.target_language_id,
+            Task.source_hash.in_(set(hashes)),
+            Task.is_assessment.is_(False),
+            Task.duplicate_of_id.is_(None),
+            Task.task_status != TaskStatus.COMPLETE,
+            Task.job_id != job.job_id,
+        )
+        .group_by(Task.source_hash)
+    ).all()
+    return dict(rows)
+
+
+def _find_approved_translations(db: Session, job: Job, hashes: List[str]) -> Dict[str, Tuple[int, str]]:
+    """Map each hash to the latest approved task and translation with that source in the same pair."""
+    latest_task_ids = (
+        select(func.max(Task.task_id))
+        .where(
+            Task.source_language_id == job.source_language_id,
+            Task.target_language_id == job.target_language_id,
+            Task.source_hash.in_(set(hashes)),
+            Task.is_assessment.is_(False),
+            Task.task_status == TaskStatus.COMPLETE,
+            Task.translated_text.isnot(None),
+        )
+        .group_by(Task.source_hash)
+    )
+    rows = db.execute(
+        select(Task.source_hash, Task.task_id, Task.translated_text)
+        .where(Task.task_id.in_(latest_task_ids))
+    ).all()
+    return {source_hash: (task_id, translated_text) for source_hash, task_id, translated_text in rows}
+
+
+def _copy_value(value):
+    # Enum columns are stored by name, matching what the ORM writes.
+    if isinstance(value, (JobStatus, TaskStatus)):
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return value
+
+
+def _copy_tasks(db: Session, rows: List[dict]) -> None:
+    """Stream a batch of task rows through PostgreSQL COPY on the session's connection."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in TASK_COPY_COLUMNS])
+    buffer.seek(0)
+
+    raw_connection = db.connection().connection
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY task ({', '.join(TASK_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def write_task_batch(
+    db: Session,
+    job: Job,
+    texts: List[str],
+    link_across_jobs: bool = False,
+    reuse: TranslationReuse = TranslationReuse.OFF,
+) -> Tuple[int, int]:
+    """
+    Insert one batch of tasks for ``job`` inside the caller's transaction.
+
+    Sources that already have an approved translation in the same pair reuse
+    it when ``reuse`` is on. Returns the number of rows written and how many
+    of them were linked to an untranslated task of an earlier job.
+    """
+    if not texts:
+        return 0, 0
+    hashes = [source_text_hash(text) for text in texts]
+    approved = _find_approved_translations(db, job, hashes) if reuse != TranslationReuse.OFF else {}
+    canonical_ids = _find_canonical_tasks(db, job, hashes) if link_across_jobs else {}
+    rows = _task_rows(job, texts, hashes, canonical_ids, approved, reuse)
+    if _supports_copy(db):
+        _copy_tasks(db, rows)
+    else:
+        db.execute(insert(Task), rows)
+    linked = sum(1 for row in rows if row["duplicate_of_id"] is not None)
+    return len(rows), linked
+
+
+def collapse_duplicate_tasks(db: Session, job_id: int) -> int:
+    """
+    Fold repeated sources within a job into the first task that carries them.
+
+    The surviving task's ``occurrences`` records how many source rows it
+    stands for, and the export repeats its translation that many times.
+    Runs set-wise in the database so memory does not grow with the job.
+    Returns the number of task rows removed.
+    """
+    first_task_ids = (
+        select(func.min(Task.task_id))
+        .where(Task.job_id == job_id)
+        .group_by(Task.source_hash)
+    )
+    repeated_task_ids = (
+        select(func.min(Task.task_id))
+        .where(Task.job_id == job_id)
+        .group_by(Task.source_hash)
+        .having(func.count() > 1)
+    )
+    Duplicate = aliased(Task)
+    occurrence_count = (
+        select(func.count())
+        .where(Duplicate.job_id == job_id, Duplicate.source_hash == Task.source_hash)
+        .scalar_subquery()
+    )
+
+    db.execute(
+        Task.__table__.update()
+        .where(Task.task_id.in_(repeated_task_ids))
+        .values(occurrences=occurrence_count)
+    )
+    removed = db.execute(
+        Task.__table__.delete()
+        .where(Task.job_id == job_id, Task.task_id.not_in(first_task_ids))
+    )
+    return removed.rowcount
+
+
+def _write_tasks(
+    db: Session,
+    job: Job,
+    texts: Iterable[str],
+    options: IngestionOptions,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> Dict[str, int]:
+    source_rows = 0
+    linked_tasks = 0
+    for batch in iter_batches(texts, settings.INGEST_BATCH_SIZE):
+        written, linked = write_task_batch(
+            db, job, batch,
+            link_across_jobs=options.dedupe_across_jobs,
+            reuse=options.reuse_translations,
+        )
+        source_rows += written
+        linked_tasks += linked
+        if on_batch:
+            on_batch(source_rows)
+
+    duplicate_rows = collapse_duplicate_tasks(db, job.job_id) if options.dedupe else 0
+    recount_jobs(db, [job.job_id])
+    reused_tasks = 0
+    if options.reuse_translations != TranslationReuse.OFF:
+        # Counted after collapsing so it matches the tasks that actually remain.
+        reused_tasks = db.execute(
+            select(func.count()).where(Task.job_id == job.job_id, Task.reused_from_id.isnot(None))
+        ).scalar_one()
+    return {
+        "source_rows": source_rows,
+        "total_tasks": source_rows - duplicate_rows,
+        "duplicate_rows": duplicate_rows,
+        "linked_tasks": linked_tasks,
+        "reused_tasks": reused_tasks,
+    }
+
+
+def create_job_with_tasks(
+    db: Session,
+    job: Job,
+    texts: Iterable[str],
+    options: Optional[IngestionOptions] = None,
+) -> JobIngestionSummary:
+    """
+    Create ``job`` and all of its tasks in a single transaction.
+
+    Tasks are written in batches of ``INGEST_BATCH_SIZE`` using COPY on
+    PostgreSQL and a multi-row INSERT elsewhere. Any failure rolls the whole
+    transaction back, so no job is left behind without its tasks.
+    """
+    started = time.perf_counter()
+    try:
+        db.add(job)
+        db.flush()
+
+        counts = _write_tasks(db, job, normalize_source_texts(texts), options or IngestionOptions())
+
+        job.total_tasks = counts["total_tasks"]
+        job.virtual_time = start_virtual_time(db, job)
+        notify_pairs(db, [(job.source_language_id, job.target_language_id)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    source_rows = counts["source_rows"]
+    rows_per_second = source_rows / elapsed if elapsed > 0 else float(source_rows)
+    logger.info(f"Ingested {source_rows} rows into {counts['total_tasks']} tasks for job {job.job_id} in {elapsed:.2f}s ({rows_per_second:.0f} rows/s)")
+
+    return JobIngestionSummary(
+        job_id=job.job_id,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(rows_per_second, 1),
+        **counts,
+    )
+
+
+# Background ingestion: uploads are spooled to disk and converted to tasks by
+# a small worker pool so that /job/create can return immediately.
+_executor = ThreadPoolExecutor(max_workers=settings.INGEST_WORKERS, thread_name_prefix="ingest")
+_ingestions: Dict[str, JobIngestionState] = {}
+_ingestions_lock = threading.Lock()
+
+
+def spool_upload(fileobj: BinaryIO) -> str:
+    """Copy an upload to the local spool directory and return its path."""
+    os.makedirs(settings.INGEST_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(settings.INGEST_SPOOL_DIR, f"{uuid.uuid4().hex}.upload")
+    try:
+        with open(path, "wb") as spool_file:
+            shutil.copyfileobj(fileobj, spool_file, length=1024 * 1024)
+    except BaseException:
+        discard_spool(path)
+        raise
+    return path
+
+
+def discard_spool(path: str) -> None:
+    """Delete a spool file that no ingestion will read (any more)."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def get_ingestion(ingestion_id: str) -> Optional[JobIngestionState]:
+    with _ingestions_lock:
+        state = _ingestions.get(ingestion_id)
+        return state.model_copy() if state else None
+
+
+def _update_ingestion(ingestion_id: str, **fields) -> None:
+    with _ingestions_lock:
+        state = _ingestions[ingestion_id]
+        for key, value in fields.items():
+            setattr(state, key, value)
+
+
+def submit_ingestion(
+    session_factory: Callable[[], Session],
+    job_id: int,
+    spool_path: str,
+    content_type: str,
+    options: IngestionOptions,
+) -> JobIngestionState:
+    """Queue a spooled upload for ``job_id``, which must be in the INGESTING state."""
+    state = JobIngestionState(
+        ingestion_id=uuid.uuid4().hex,
+        job_id=job_id,
+        content_type=content_type,
+        status=IngestionStatus.QUEUED,
+    )
+    with _ingestions_lock:
+        _ingestions[state.ingestion_id] = state
+    _executor.submit(_run_ingestion, session_factory, state.ingestion_id, job_id, spool_path, content_type, options)
+    return state.model_copy()
+
+
+def _iter_spooled_texts(spool_path: str, content_type: str) -> Iterator[str]:
+    """Yield normalised source texts from a spool file, parsing large CSVs in parallel."""
+    workers = settings.INGEST_PARSE_WORKERS
+    chunk_bytes = settings.INGEST_PARSE_CHUNK_BYTES
+    if content_type == CSV_CONTENT_TYPE and workers > 1 and os.path.getsize(spool_path) > chunk_bytes:
+        yield from iter_csv_source_texts_parallel(spool_path, workers, chunk_bytes)
+        return
+
+    importer = get_importer(content_type)
+    with open(spool_path, "rb") as spool_file:
+        yield from normalize_source_texts(importer(spool_file))
+
+
+def _run_ingestion(
+    session_factory: Callable[[], Session],
+    ingestion_id: str,
+    job_id: int,
+    spool_path: str,
+    content_type: str,
+    options: IngestionOptions,
+) -> None:
+    started = time.perf_counter()
+    _update_ingestion(ingestion_id, status=IngestionStatus.RUNNING, started_at=datetime.now())
+
+    def report_progress(rows: int) -> None:
+        elapsed = time.perf_counter() - started
+        _update_ingestion(ingestion_id, rows_processed=rows, rows_per_second=round(rows / elapsed, 1) if elapsed > 0 else 0.0)
+
+    db = session_factory()
+    try:
+        # Locked until the commit, so sweep_stale_ingestions can tell this job from one whose worker died.
+        job = db.query(Job).filter(Job.job_id == job_id).with_for_update().one()
+        texts = _iter_spooled_texts(spool_path, content_type)
+        counts = _write_tasks(db, job, texts, options, on_batch=report_progress)
+
+        # Tasks only become claimable once this commit makes the job IN_PROGRESS.
+        job.total_tasks = counts["total_tasks"]
+        job.job_status = JobStatus.IN_PROGRESS
+        job.virtual_time = start_virtual_time(db, job)
+        notify_pairs(db, [(job.source_language_id, job.target_language_id)])
+        db.commit()
+
+        report_progress(counts["source_rows"])
+        _update_ingestion(
+            ingestion_id,
+            status=IngestionStatus.COMPLETED,
+            finished_at=datetime.now(),
+            total_tasks=counts["total_tasks"],
+            duplicate_rows=counts["duplicate_rows"],
+            linked_tasks=counts["linked_tasks"],
+            reused_tasks=counts["reused_tasks"],
+        )
+        logger.info(f"Ingestion {ingestion_id} finished: {counts['source_rows']} rows into {counts['total_tasks']} tasks for job {job_id}")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Ingestion {ingestion_id} for job {job_id} failed: {str(e)}")
+        # Remove the placeholder job so a failed upload leaves nothing behind.
+        try:
+            db.query(Job).filter(Job.job_id == job_id, Job.job_status == JobStatus.INGESTING).delete(synchronize_session=False)
+            db.commit()
+        except Exception as cleanup_error:
+            db.rollback()
+            logger.error(f"Could not remove job {job_id} of failed ingestion {ingestion_id}, left for the startup sweep: {str(cleanup_error)}")
+        _update_ingestion(ingestion_id, status=IngestionStatus.FAILED, error=str(e), finished_at=datetime.now())
+
+    finally:
+        db.close()
+        discard_spool(spool_path)
+
+
+def sweep_stale_ingestions(session_factory: Callable[[], Session]) -> int:
+    """
+    Delete INGESTING jobs whose ingestion died with its process; run on startup.
+
+    Jobs still being ingested are locked by their worker and skipped, and
+    jobs younger than ``INGEST_STALE_MINUTES`` may still be queued in
+    another process, so they are left alone too. Returns how many jobs
+    were deleted.
+    """
+    cutoff = datetime.now() - timedelta(minutes=settings.INGEST_STALE_MINUTES)
+    stale = (
+        select(Job.job_id)
+        .where(Job.job_status == JobStatus.INGESTING, Job.created_at < cutoff)
+        .with_for_update(skip_locked=True)
+    )
+    db = session_factory()
+    try:
+        deleted = db.execute(delete(Job).where(Job.job_id.in_(stale)), execution_options={"synchronize_session": False})
+        db.commit()
+    finally:
+        db.close()
+    if deleted.rowcount:
+        logger.warning(f"Deleted {deleted.rowcount} job(s) left INGESTING by an interrupted ingestion")
+    return deleted.rowcount
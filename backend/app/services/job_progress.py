@@ -0,0 +1,256 @@
+"""
+Per-job task counters.
+
+Every task status change updates the matching counters on its job in the
+same transaction, with a relative ``UPDATE job SET x = x + n`` so
+concurrent requests never overwrite each other. Progress reads are then a
+primary-key lookup instead of a scan of the job's tasks. The price is that
+status changes of one job serialize on its row until they commit; see
+services.dispatch for what that means for claims.
+
+OPEN tasks linked to a task of an earlier job (``duplicate_of_id``) cannot
+be claimed; they wait for that task's translation. They are counted in
+``duplicate_tasks`` rather than ``open_tasks``, so ``open_tasks`` is the
+job's claimable backlog. Moves of such tasks pass LINKED_DUPLICATE as
+their status.
+
+Run ``python -m app.services.job_progress`` to compare the counters with
+the task table, and add ``--fix`` to rewrite the ones that drifted.
+"""
+import argparse
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from ..schemas.enums import TaskStatus
+from ..schemas.job import Job, JobProgress
+from ..schemas.task import Task
+
+LINKED_DUPLICATE = "LINKED_DUPLICATE"
+
+STATUS_COUNTERS = {
+    TaskStatus.OPEN: "open_tasks",
+    LINKED_DUPLICATE: "duplicate_tasks",
+    TaskStatus.ASSIGNED_TO_FL: "assigned_tasks",
+    TaskStatus.UNDER_REVIEW: "under_review_tasks",
+    TaskStatus.COMPLETE: "completed_tasks",
+}
+
+JOB_ID = bindparam("counted_job_id")
+COUNT = bindparam("count")
+
+
+def _status(status):
+    # Routes still assign statuses by name ("ASSIGNED_TO_FL") as well as by member.
+    if isinstance(status, TaskStatus) or status == LINKED_DUPLICATE:
+        return status
+    return TaskStatus[status]
+
+
+def _counted_as(status):
+    """Filter on the task table matching the tasks a counter of STATUS_COUNTERS stands for."""
+    if status == LINKED_DUPLICATE:
+        return and_(Task.task_status == TaskStatus.OPEN, Task.duplicate_of_id.isnot(None))
+    if status == TaskStatus.OPEN:
+        return and_(Task.task_status == TaskStatus.OPEN, Task.duplicate_of_id.is_(None))
+    return Task.task_status == status
+
+
+def counter_update(from_status: Optional[TaskStatus], to_status: Optional[TaskStatus], values: Optional[Dict] = None, condition=None):
+    """
+    UPDATE moving ``:count`` tasks of job ``:counted_job_id`` between status counters; see move_task_counts.
+
+    The statement takes its job and count as bind parameters, so hot paths
+    build it once and pass it to move_task_counts as ``statement``. Job
+    objects already loaded in the session are not synchronized; they see
+    the new counters once expired, as every commit does.
+    """
+    values = dict(values or {})
+    if from_status is not None:
+        column = STATUS_COUNTERS[from_status]
+        values[column] = getattr(Job, column) - COUNT
+    if to_status is not None:
+        column = STATUS_COUNTERS[to_status]
+        values[column] = getattr(Job, column) + COUNT
+    statement = update(Job).where(Job.job_id == JOB_ID).values(values)
+    if condition is not None:
+        statement = statement.where(condition)
+    return statement.execution_options(synchronize_session=False)
+
+
+@lru_cache(maxsize=None)
+def _plain_counter_update(from_status: Optional[TaskStatus], to_status: Optional[TaskStatus]):
+    return counter_update(from_status, to_status)
+
+
+def move_task_counts(
+    db: Session,
+    job_id: int,
+    from_status: Optional[TaskStatus],
+    to_status: Optional[TaskStatus],
+    count: int = 1,
+    values: Optional[Dict] = None,
+    condition=None,
+    statement=None,
+) -> bool:
+    """
+    Move ``count`` tasks of ``job_id`` between status counters; None on either side adds or removes them.
+
+    ``values`` are further job columns to set in the same UPDATE. With a
+    ``condition`` the move only happens if the job row satisfies it once
+    locked, and False is returned if it did not. A ``statement`` built by
+    counter_update for the same statuses replaces ``values`` and ``condition``.
+    """
+    if not count:
+        return True
+    from_status = _status(from_status) if from_status is not None else None
+    to_status = _status(to_status) if to_status is not None else None
+    if from_status == to_status:
+        return True
+
+    if statement is None:
+        if values is None and condition is None:
+            statement = _plain_counter_update(from_status, to_status)
+        else:
+            statement = counter_update(from_status, to_status, values, condition)
+    return db.execute(statement, {"counted_job_id": job_id, "count": count}).rowcount > 0
+
+
+def move_task_counts_for_tasks(
+    db: Session,
+    task_filter,
+    from_status: TaskStatus,
+    to_status: TaskStatus,
+    params: Optional[Dict] = None,
+) -> None:
+    """
+    Apply a status move to every job owning a task matched by ``task_filter``, before those tasks are updated.
+
+    ``params`` are the values of any bind parameters in ``task_filter``.
+    """
+    rows = db.execute(
+        select(Task.job_id, func.count()).where(*task_filter).group_by(Task.job_id), params
+    ).all()
+    for job_id, count in rows:
+        move_task_counts(db, job_id, from_status, to_status, count)
+
+
+def _actual_counts():
+    return select(
+        Task.job_id,
+        *[
+            func.count().filter(_counted_as(status)).label(column)
+            for status, column in STATUS_COUNTERS.items()
+        ],
+    ).group_by(Task.job_id).subquery()
+
+
+def recount_jobs(db: Session, job_ids: List[int]) -> None:
+    """Set the counters of ``job_ids`` from their tasks in one statement; used after bulk writes."""
+    db.execute(
+        update(Job)
+        .where(Job.job_id.in_(job_ids))
+        .values({
+            column: (
+                select(func.count())
+                .where(Task.job_id == Job.job_id, _counted_as(status))
+                .scalar_subquery()
+            )
+            for status, column in STATUS_COUNTERS.items()
+        })
+    )
+
+
+def jobs_linked_to(job_id: int):
+    """
+    SELECT of the other jobs with duplicates linked to tasks of ``job_id``.
+
+    Deleting the job unlinks them (``duplicate_of_id`` is SET NULL), which
+    makes them claimable, so those jobs are recounted afterwards.
+    """
+    Original = aliased(Task)
+    return (
+        select(Task.job_id)
+        .distinct()
+        .join(Original, Task.duplicate_of_id == Original.task_id)
+        .where(Original.job_id == job_id, Task.job_id != job_id)
+    )
+
+
+def to_progress(job: Job) -> JobProgress:
+    return JobProgress(
+        job_id=job.job_id,
+        total_tasks=sum(getattr(job, column) for column in STATUS_COUNTERS.values()),
+        open_tasks=job.open_tasks,
+        duplicate_tasks=job.duplicate_tasks,
+        assigned_tasks=job.assigned_tasks,
+        under_review_tasks=job.under_review_tasks,
+        completed_tasks=job.completed_tasks,
+        max_active_assignments=job.max_active_assignments,
+    )
+
+
+async def get_progress(db: AsyncSession, job_ids: List[int]) -> List[JobProgress]:
+    jobs = await db.scalars(select(Job).where(Job.job_id.in_(job_ids)).order_by(Job.job_id))
+    return [to_progress(job) for job in jobs]
+
+
+def reconcile(db: Session, fix: bool = False) -> List[Dict[str, int]]:
+    """
+    Compare every job's counters with a set-wise recount of its tasks.
+
+    Returns one entry per drifted job with the stored and actual values.
+    With ``fix`` the drifted jobs are recounted in one UPDATE and committed.
+    """
+    actual = _actual_counts()
+    columns = list(STATUS_COUNTERS.values())
+    drift_condition = or_(*[
+        getattr(Job, column) != func.coalesce(getattr(actual.c, column), 0)
+        for column in columns
+    ])
+    rows = db.execute(
+        select(
+            Job.job_id,
+            *[getattr(Job, column) for column in columns],
+            *[func.coalesce(getattr(actual.c, column), 0).label(f"actual_{column}") for column in columns],
+        )
+        .outerjoin(actual, actual.c.job_id == Job.job_id)
+        .where(drift_condition)
+        .order_by(Job.job_id)
+    ).mappings().all()
+    drifted = [dict(row) for row in rows]
+
+    if fix and drifted:
+        recount_jobs(db, [row["job_id"] for row in drifted])
+        db.commit()
+    return drifted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-job task counters against the task table.")
+    parser.add_argument("--fix", action="store_true", help="rewrite counters that have drifted")
+    args = parser.parse_args()
+
+    from ..core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        drifted = reconcile(db, fix=args.fix)
+    finally:
+        db.close()
+
+    for row in drifted:
+        changes = ", ".join(
+            f"{column} {row[column]} -> {row[f'actual_{column}']}"
+            for column in STATUS_COUNTERS.values()
+            if row[column] != row[f"actual_{column}"]
+        )
+        print(f"job {row['job_id']}: {changes}")
+    print(f"{len(drifted)} job(s) drifted" + (", fixed" if args.fix and drifted else ""))
+
+
+if __name__ == "__main__":
+    main()
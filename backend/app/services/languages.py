@@ -0,0 +1,25 @@
+"""
+Process-wide cache of language names.
+
+Languages are only ever added (see routes.all_languages), so a cached name
+never goes stale; an id the cache has not seen yet triggers one reload of
+the whole table, which holds a few dozen rows at most.
+"""
+import threading
+from typing import Dict, Iterable
+
+from sqlalchemy.orm import Session
+
+from ..schemas.language import Language
+
+_names: Dict[int, str] = {}
+_lock = threading.Lock()
+
+
+def get_language_names(db: Session, language_ids: Iterable[int]) -> Dict[int, str]:
+    """Return ``{language_id: language_name}`` for the ids that exist."""
+    language_ids = set(language_ids)
+    with _lock:
+        if not language_ids <= _names.keys():
+            _names.update(db.query(Language.language_id, Language.language_name).all())
+        return {language_id: _names[language_id] for language_id in language_ids if language_id in _names}
@@ -0,0 +1,188 @@
+"""
+Background reaper for expired task leases.
+
+Freelancer assignments carry ``lease_expires_at`` and QA assignments carry
+``qa_lease_expires_at``. The reaper returns expired ones to their pool in
+bounded batches, each in its own short transaction:
+
+* expired freelancer leases go back to OPEN and can be claimed again;
+* expired QA leases stay UNDER_REVIEW but lose their reviewer, so
+  ``get_submitted_tasks`` can hand them to someone else.
+
+Rows are picked with ``FOR UPDATE SKIP LOCKED``, so several app processes
+can run the reaper at once. It can also be run once from cron with
+``python -m app.services.lease_reaper``.
+"""
+import asyncio
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import func, literal_column, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import get_settings
+from ..schemas.enums import TaskStatus
+from ..schemas.task import Task
+from .job_progress import move_task_counts
+from .task_notifier import notify_pairs
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Inlined for the same reason as in services.dispatch: partial index matching.
+ASSIGNED_TO_FL = literal_column("'ASSIGNED_TO_FL'")
+UNDER_REVIEW = literal_column("'UNDER_REVIEW'")
+
+
+class LeaseReaperMetrics(BaseModel):
+    runs: int = 0
+    last_run_at: Optional[datetime] = None
+    last_run_seconds: float = 0.0
+    last_reaped_freelancer_leases: int = 0
+    last_reaped_qa_leases: int = 0
+    total_reaped_freelancer_leases: int = 0
+    total_reaped_qa_leases: int = 0
+    # How long the most overdue lease left behind by the last run has been expired.
+    oldest_expired_freelancer_lease_seconds: float = 0.0
+    oldest_expired_qa_lease_seconds: float = 0.0
+    active_freelancer_leases: int = 0
+    active_qa_leases: int = 0
+    last_error: Optional[str] = None
+
+
+_metrics = LeaseReaperMetrics()
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> LeaseReaperMetrics:
+    with _metrics_lock:
+        return _metrics.model_copy()
+
+
+def expired_freelancer_leases():
+    return (
+        select(Task.task_id)
+        .where(Task.task_status == ASSIGNED_TO_FL, Task.lease_expires_at < func.now())
+        .order_by(Task.lease_expires_at)
+    )
+
+
+def expired_qa_leases():
+    return (
+        select(Task.task_id)
+        .where(Task.task_status == UNDER_REVIEW, Task.qa_lease_expires_at < func.now())
+        .order_by(Task.qa_lease_expires_at)
+    )
+
+
+def reap_freelancer_leases(db: Session, batch_size: int) -> int:
+    """Reopen one batch of tasks whose freelancer lease has expired and commit."""
+    expired = expired_freelancer_leases().limit(batch_size).with_for_update(skip_locked=True)
+    rows = db.execute(
+        update(Task)
+        .where(Task.task_id.in_(expired.scalar_subquery()))
+        .values(
+            task_status=TaskStatus.OPEN,
+            assigned_freelancer_id=None,
+            assigned_at=None,
+            lease_expires_at=None,
+        )
+        .returning(Task.job_id, Task.source_language_id, Task.target_language_id),
+        execution_options={"synchronize_session": False},
+    ).all()
+
+    for job_id, count in Counter(row.job_id for row in rows).items():
+        move_task_counts(db, job_id, TaskStatus.ASSIGNED_TO_FL, TaskStatus.OPEN, count)
+    notify_pairs(db, [(row.source_language_id, row.target_language_id) for row in rows])
+    db.commit()
+    return len(rows)
+
+
+def reap_qa_leases(db: Session, batch_size: int) -> int:
+    """Unassign one batch of reviews whose QA lease has expired and commit."""
+    expired = expired_qa_leases().limit(batch_size).with_for_update(skip_locked=True)
+    result = db.execute(
+        update(Task)
+        .where(Task.task_id.in_(expired.scalar_subquery()))
+        .values(qa_assigned_id=None, qa_assigned_at=None, qa_lease_expires_at=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _lease_stats(db: Session, status, expires_at):
+    """Return (active leases, seconds the most overdue one has been expired)."""
+    active, overdue = db.execute(
+        select(
+            func.count(),
+            func.coalesce(
+                func.extract("epoch", func.now() - func.min(expires_at).filter(expires_at < func.now())),
+                0,
+            ),
+        ).where(Task.task_status == status, expires_at.isnot(None))
+    ).one()
+    return active, float(overdue)
+
+
+def run_once(session_factory: Callable[[], Session]) -> LeaseReaperMetrics:
+    """Reap until no expired lease is left or ``LEASE_REAPER_MAX_BATCHES`` is reached for each kind."""
+    started = datetime.now(timezone.utc)
+    reaped = {"freelancer": 0, "qa": 0}
+    db = session_factory()
+    try:
+        for kind, reap in (("freelancer", reap_freelancer_leases), ("qa", reap_qa_leases)):
+            for _ in range(settings.LEASE_REAPER_MAX_BATCHES):
+                count = reap(db, settings.LEASE_REAPER_BATCH_SIZE)
+                reaped[kind] += count
+                if count < settings.LEASE_REAPER_BATCH_SIZE:
+                    break
+
+        active_freelancer, overdue_freelancer = _lease_stats(db, ASSIGNED_TO_FL, Task.lease_expires_at)
+        active_qa, overdue_qa = _lease_stats(db, UNDER_REVIEW, Task.qa_lease_expires_at)
+        db.commit()
+        error = None
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Lease reaper run failed: {str(e)}")
+        error = str(e)
+    finally:
+        db.close()
+
+    with _metrics_lock:
+        _metrics.runs += 1
+        _metrics.last_run_at = started
+        _metrics.last_run_seconds = round((datetime.now(timezone.utc) - started).total_seconds(), 3)
+        _metrics.last_reaped_freelancer_leases = reaped["freelancer"]
+        _metrics.last_reaped_qa_leases = reaped["qa"]
+        _metrics.total_reaped_freelancer_leases += reaped["freelancer"]
+        _metrics.total_reaped_qa_leases += reaped["qa"]
+        _metrics.last_error = error
+        if error is None:
+            _metrics.active_freelancer_leases = active_freelancer
+            _metrics.active_qa_leases = active_qa
+            _metrics.oldest_expired_freelancer_lease_seconds = round(overdue_freelancer, 1)
+            _metrics.oldest_expired_qa_lease_seconds = round(overdue_qa, 1)
+        metrics = _metrics.model_copy()
+
+    if reaped["freelancer"] or reaped["qa"]:
+        logger.info(f"Lease reaper returned {reaped['freelancer']} freelancer and {reaped['qa']} QA leases")
+    return metrics
+
+
+async def run_forever(session_factory: Callable[[], Session]) -> None:
+    while True:
+        await run_in_threadpool(run_once, session_factory)
+        await asyncio.sleep(settings.LEASE_REAPER_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    from ..core.database import SessionLocal
+
+    print(run_once(SessionLocal).model_dump_json(indent=2))
@@ -0,0 +1,111 @@
+"""
+Reviewer, language pair and earnings counters moved by QA decisions.
+
+Every counter changes with a single relative ``UPDATE ... SET x = x + :n
+RETURNING``, so concurrent reviews never overwrite each other and each
+row is only locked from that statement until the caller commits. A
+pair's ``accuracy_rate`` is recomputed in the same statement from the new
+counts: the share of everything reviewed in the pair that was not
+rejected, as a percentage.
+
+Callers update the rows in the order reviewer, language pair, freelancer,
+so two reviews never wait on each other's rows in opposite orders. The
+statements are built once and bound per call, like the claim path's.
+"""
+from typing import Optional
+
+from sqlalchemy import Float, Row, bindparam, cast, func, update
+from sqlalchemy.orm import Session
+
+from ..schemas.enums import AssSubmission
+from ..schemas.freelancer import Freelancer
+from ..schemas.freelancer_language_pair import FreelancerLanguagePair
+from ..schemas.qa_member import QAMember
+
+# Bind parameters of an UPDATE cannot share a name with a column of its table.
+REVIEWED = bindparam("reviewed")
+REJECTED = bindparam("rejected")
+FREELANCER_ID = bindparam("fl_id")
+AMOUNT = bindparam("amount", type_=Float)
+
+_REVIEWER = (
+    update(QAMember)
+    .where(QAMember.qa_member_id == bindparam("qa_id"))
+    .values(
+        total_tasks_reviewed=QAMember.total_tasks_reviewed + REVIEWED,
+        total_tasks_rejected=QAMember.total_tasks_rejected + REJECTED,
+    )
+    .returning(QAMember.total_tasks_reviewed, QAMember.total_tasks_rejected)
+    .execution_options(synchronize_session=False)
+)
+
+# SET expressions see the row as it was, so the accuracy is computed from the old counts plus the new reviews.
+_complete = func.coalesce(FreelancerLanguagePair.complete_task, 0) + REVIEWED
+_rejected = func.coalesce(FreelancerLanguagePair.rejected_task, 0) + REJECTED
+_PAIR = (
+    update(FreelancerLanguagePair)
+    .where(
+        FreelancerLanguagePair.freelancer_id == FREELANCER_ID,
+        FreelancerLanguagePair.source_language_id == bindparam("source_id"),
+        FreelancerLanguagePair.target_language_id == bindparam("target_id"),
+    )
+    .values(
+        complete_task=_complete,
+        rejected_task=_rejected,
+        accuracy_rate=cast(_complete - _rejected, Float) / func.nullif(_complete, 0) * 100,
+    )
+    .returning(
+        FreelancerLanguagePair.complete_task,
+        FreelancerLanguagePair.rejected_task,
+        FreelancerLanguagePair.accuracy_rate,
+    )
+    .execution_options(synchronize_session=False)
+)
+_ASSESSED_PAIR = _PAIR.values(status=AssSubmission.COMPLETE)
+
+_EARNINGS = (
+    update(Freelancer)
+    .where(Freelancer.freelancer_id == FREELANCER_ID)
+    .values(
+        total_earnings=func.coalesce(Freelancer.total_earnings, 0.0) + AMOUNT,
+        current_balance=func.coalesce(Freelancer.current_balance, 0.0) + AMOUNT,
+    )
+    .returning(Freelancer.total_earnings, Freelancer.current_balance)
+    .execution_options(synchronize_session=False)
+)
+
+
+def record_reviewer(db: Session, qa_id: int, reviewed: int, rejected: int) -> Optional[Row]:
+    """Count ``reviewed`` decisions, ``rejected`` of them rejections, for a QA member; None if there is no such member."""
+    return db.execute(_REVIEWER, {"qa_id": qa_id, "reviewed": reviewed, "rejected": rejected}).first()
+
+
+def record_pair(
+    db: Session,
+    freelancer_id: int,
+    source_language_id: int,
+    target_language_id: int,
+    reviewed: int,
+    rejected: int,
+    assessment: bool = False,
+) -> Optional[Row]:
+    """
+    Count reviewed work of a freelancer in a pair and recompute its accuracy.
+
+    With ``assessment`` the pair is also marked as assessed (COMPLETE).
+    Returns the new ``complete_task``, ``rejected_task`` and
+    ``accuracy_rate``, or None if the freelancer has no such pair. The
+    caller commits and then drops the pair from services.eligibility.
+    """
+    return db.execute(_ASSESSED_PAIR if assessment else _PAIR, {
+        "fl_id": freelancer_id,
+        "source_id": source_language_id,
+        "target_id": target_language_id,
+        "reviewed": reviewed,
+        "rejected": rejected,
+    }).first()
+
+
+def credit_earnings(db: Session, freelancer_id: int, amount: float) -> Optional[Row]:
+    """Add ``amount`` to a freelancer's earnings and balance; None if there is no such freelancer."""
+    return db.execute(_EARNINGS, {"fl_id": freelancer_id, "amount": amount}).first()
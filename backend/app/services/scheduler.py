@@ -0,0 +1,181 @@
+"""
+Picks which job of a language pair hands out tasks next.
+
+Two policies are combined:
+
+* Earliest deadline first: jobs whose ``deadline`` falls within
+  ``SCHEDULER_DEADLINE_HORIZON_HOURS`` (or has already passed) are served
+  before everything else, soonest deadline first.
+* Weighted fair queuing: all other jobs share the pair in proportion to
+  their ``priority``. Each job has a ``virtual_time`` that advances by
+  ``1 / priority`` for every task it hands out, and the job with the lowest
+  virtual time goes next. A job that becomes claimable starts at the
+  lowest virtual time among the pair's backlogged jobs, so neither a giant
+  old job nor a brand new one can monopolise the pair.
+
+Within those tiers, demanding jobs (high ``difficulty`` or ``priority``)
+are routed to expert freelancers first and to everyone else last. The
+claimant's accuracy comes from services.eligibility, so routing needs no
+join on ``freelancer_language_pair``.
+
+Only jobs with claimable OPEN tasks according to their counters (linked
+duplicates are counted apart, see services.job_progress), and fewer
+``assigned_tasks`` than their ``max_active_assignments`` cap, are
+considered, so the choice is a small scan of ``job``; the task itself is then claimed
+through ``ix_task_dispatch_open`` with the job id as part of the key.
+
+A job's virtual time and cap are columns of its row, moved in the same
+UPDATE as its counters (see services.dispatch for the lock that implies),
+rather than tracked in a table of their own.
+
+The queues take their pair either as values or as the bind parameters
+below. The claim path builds its statements once with the latter and
+binds the pair per request; the deadline horizon is computed whenever a
+statement is executed, not when it is built.
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, bindparam, case, cast, false, func, literal_column, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..schemas.job import Job
+
+settings = get_settings()
+
+# Inlined so the planner can match the partial index predicate.
+IN_PROGRESS = literal_column("'IN_PROGRESS'")
+
+SOURCE_LANGUAGE_ID = bindparam("source_language_id")
+TARGET_LANGUAGE_ID = bindparam("target_language_id")
+IS_ASSESSMENT = bindparam("is_assessment")
+
+
+def pair_params(source_language_id: int, target_language_id: int, is_assessment: bool = False) -> Dict:
+    """Values for the pair bind parameters above."""
+    return {
+        "source_language_id": source_language_id,
+        "target_language_id": target_language_id,
+        "is_assessment": is_assessment,
+    }
+
+
+def has_room():
+    """Jobs below their ``max_active_assignments`` cap, or without one."""
+    return or_(Job.max_active_assignments.is_(None), Job.assigned_tasks < Job.max_active_assignments)
+
+
+def _backlogged_jobs(source_language_id: int, target_language_id: int, is_assessment: bool):
+    return (
+        Job.source_language_id == source_language_id,
+        Job.target_language_id == target_language_id,
+        Job.is_assessment == is_assessment,
+        Job.job_status == IN_PROGRESS,
+        Job.open_tasks > 0,
+    )
+
+
+def demanding():
+    """Jobs that should go to high-accuracy freelancers first."""
+    return or_(
+        Job.difficulty >= settings.ROUTING_DEMANDING_DIFFICULTY,
+        Job.priority >= settings.ROUTING_DEMANDING_PRIORITY,
+    )
+
+
+def _horizon() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=settings.SCHEDULER_DEADLINE_HORIZON_HOURS)
+
+
+def _in_dispatch_order(query, expert):
+    urgent = Job.deadline <= bindparam("deadline_horizon", callable_=_horizon)
+    order = [case((urgent, 0), else_=1), case((urgent, Job.deadline))]
+    if expert is not None:
+        order.append(case((demanding() == expert, 0), else_=1))
+    return query.order_by(*order, Job.virtual_time, Job.job_id)
+
+
+def job_queue(
+    source_language_id: int,
+    target_language_id: int,
+    is_assessment: bool = False,
+    expert: Optional[bool] = None,
+):
+    """
+    Jobs of a pair with OPEN tasks and room under their cap, in the order they should be served.
+
+    After urgent deadlines, an ``expert`` claimant is offered demanding jobs
+    first and anyone else is offered them last; None leaves routing out.
+    """
+    return _in_dispatch_order(
+        select(Job.job_id).where(*_backlogged_jobs(source_language_id, target_language_id, is_assessment), has_room()),
+        expert,
+    )
+
+
+def any_pair_queue(pairs: Dict[Tuple[int, int], bool], is_assessment: bool = False):
+    """
+    ``(source, target, job_id)`` of claimable jobs in any of ``pairs``, best first.
+
+    ``pairs`` maps each pair to whether the claimant is an expert in it. Jobs
+    are ordered as in job_queue; virtual times of different pairs are
+    compared as they are, which favours the pairs that have handed out the
+    least work.
+    """
+    pair = tuple_(Job.source_language_id, Job.target_language_id)
+    experts = [key for key, expert in pairs.items() if expert]
+    return _in_dispatch_order(
+        select(Job.source_language_id, Job.target_language_id, Job.job_id).where(
+            pair.in_(list(pairs)),
+            Job.is_assessment == is_assessment,
+            Job.job_status == IN_PROGRESS,
+            Job.open_tasks > 0,
+            has_room(),
+        ),
+        pair.in_(experts) if experts else false(),
+    )
+
+
+@lru_cache(maxsize=None)
+def _candidate_jobs(expert: Optional[bool]):
+    return job_queue(SOURCE_LANGUAGE_ID, TARGET_LANGUAGE_ID, IS_ASSESSMENT, expert).limit(settings.SCHEDULER_CANDIDATE_JOBS)
+
+
+def pick_jobs(
+    db: Session,
+    source_language_id: int,
+    target_language_id: int,
+    is_assessment: bool = False,
+    expert: Optional[bool] = None,
+) -> List[int]:
+    """The next ``SCHEDULER_CANDIDATE_JOBS`` jobs to claim from, best first."""
+    return db.scalars(
+        _candidate_jobs(expert), pair_params(source_language_id, target_language_id, is_assessment)
+    ).all()
+
+
+def next_job(source_language_id: int, target_language_id: int, is_assessment: bool = False, expert: Optional[bool] = None):
+    """The best job as a scalar subquery, so a single claim needs no separate round trip."""
+    return job_queue(source_language_id, target_language_id, is_assessment, expert).limit(1).scalar_subquery()
+
+
+def charge(count=1) -> Dict:
+    """
+    Job values advancing its virtual time for ``count`` tasks handed out; see job_progress.move_task_counts.
+
+    ``count`` may be a bind parameter.
+    """
+    return {"virtual_time": Job.virtual_time + cast(count, Float) / Job.priority}
+
+
+def start_virtual_time(db: Session, job: Job) -> float:
+    """Virtual time for a job that is about to become claimable."""
+    current = db.scalar(
+        select(func.min(Job.virtual_time)).where(
+            *_backlogged_jobs(job.source_language_id, job.target_language_id, job.is_assessment),
+            Job.job_id != job.job_id,
+        )
+    )
+    return max(current or 0.0, job.virtual_time or 0.0)
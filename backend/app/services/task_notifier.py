@@ -0,0 +1,201 @@
+"""
+Wake-ups for freelancers waiting on a language pair with no OPEN tasks.
+
+``/task/open_wait`` parks a request here instead of having the client poll
+``/task/open``. Code that makes tasks claimable calls ``notify_pairs``
+inside its transaction; once that transaction commits:
+
+* waiters in this process are woken directly, and
+* on PostgreSQL a ``pg_notify`` on ``TASK_NOTIFY_CHANNEL``, which is
+  delivered only on commit, reaches every other app process. Each process
+  LISTENs on one dedicated connection driven by the event loop; behind
+  PgBouncer that connection goes straight to PostgreSQL via DB_DIRECT_URL.
+  If that connection fails it is reopened with exponential backoff, and
+  every waiter is woken once it is back, since notifications sent in
+  between are lost.
+
+Each pair has a version number that is bumped on every wake-up. Waiters
+read it before trying to claim, so a notification that arrives between a
+failed claim and the wait is never lost.
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+Pair = Tuple[int, int]
+
+_PENDING_KEY = "task_notifier_pairs"
+
+RECONNECT_INITIAL_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_versions: Dict[Pair, int] = {}
+_events: Dict[Pair, asyncio.Event] = {}
+_listen_engine = None
+_listen_connection = None
+_listen_fd: Optional[int] = None
+_reconnect_task: Optional[asyncio.Task] = None
+
+
+def notify_pairs(db: Session, pairs: Iterable[Pair]) -> None:
+    """Announce that ``pairs`` gained OPEN tasks once ``db`` commits."""
+    pairs = {(int(source), int(target)) for source, target in pairs}
+    if not pairs:
+        return
+    db.info.setdefault(_PENDING_KEY, set()).update(pairs)
+    if db.get_bind().dialect.name == "postgresql":
+        for source, target in pairs:
+            db.execute(select(func.pg_notify(settings.TASK_NOTIFY_CHANNEL, f"{source}:{target}:{os.getpid()}")))
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    pairs = session.info.pop(_PENDING_KEY, None)
+    if pairs:
+        _wake_threadsafe(pairs)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _wake(pairs: Set[Pair]) -> None:
+    for pair in pairs:
+        _versions[pair] = _versions.get(pair, 0) + 1
+        waiting = _events.pop(pair, None)
+        if waiting:
+            waiting.set()
+
+
+def _wake_threadsafe(pairs: Set[Pair]) -> None:
+    # Commits happen on threadpool workers; waiters live on the event loop.
+    if _loop is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_wake, set(pairs))
+
+
+def version(pair: Pair) -> int:
+    return _versions.get(pair, 0)
+
+
+async def wait(pair: Pair, since_version: int, timeout: float) -> bool:
+    """Wait until ``pair`` is woken after ``since_version``; False on timeout."""
+    if version(pair) != since_version:
+        return True
+    waiting = _events.setdefault(pair, asyncio.Event())
+    try:
+        await asyncio.wait_for(waiting.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def _drain_notifications() -> None:
+    global _reconnect_task
+    try:
+        _listen_connection.poll()
+    except Exception as e:
+        logger.error(f"Task notification listener failed, reconnecting: {str(e)}")
+        _detach()
+        _reconnect_task = _loop.create_task(_reconnect())
+        return
+
+    pairs = set()
+    own_pid = str(os.getpid())
+    while _listen_connection.notifies:
+        payload = _listen_connection.notifies.pop(0).payload
+        source, target, pid = payload.split(":")
+        # This process already woke its own waiters after the commit.
+        if pid != own_pid:
+            pairs.add((int(source), int(target)))
+    if pairs:
+        _wake(pairs)
+
+
+def _open_listen_connection():
+    # A dedicated connection outside the pool; it stays open until it fails or the process stops.
+    pooled = _listen_engine.raw_connection()
+    connection = pooled.driver_connection
+    pooled.detach()
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {settings.TASK_NOTIFY_CHANNEL}")
+    return connection
+
+
+def _attach(connection) -> None:
+    global _listen_connection, _listen_fd
+    _listen_connection = connection
+    # Kept apart from the connection: a broken one may no longer report its descriptor.
+    _listen_fd = connection.fileno()
+    _loop.add_reader(_listen_fd, _drain_notifications)
+
+
+def _detach() -> None:
+    global _listen_connection, _listen_fd
+    if _listen_connection is None:
+        return
+    if _loop is not None and not _loop.is_closed():
+        _loop.remove_reader(_listen_fd)
+    try:
+        _listen_connection.close()
+    except Exception:
+        pass
+    _listen_connection = None
+    _listen_fd = None
+
+
+async def _reconnect() -> None:
+    global _reconnect_task
+    delay = RECONNECT_INITIAL_SECONDS
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            connection = await _loop.run_in_executor(None, _open_listen_connection)
+        except Exception as e:
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+            logger.warning(f"Task notification listener could not reconnect, retrying in {delay:.0f}s: {str(e)}")
+            continue
+        _attach(connection)
+        _reconnect_task = None
+        logger.info("Task notification listener reconnected")
+        # Whatever was announced while disconnected is lost; let every waiter try to claim again.
+        _wake(set(_events))
+        return
+
+
+def start(engine) -> None:
+    """Bind to the running event loop and, on PostgreSQL, start listening for other processes."""
+    global _loop, _listen_engine
+    _loop = asyncio.get_running_loop()
+    if engine.dialect.name != "postgresql":
+        return
+    if settings.DB_PGBOUNCER:
+        # LISTEN is session state, which a transaction-pooled connection does not keep.
+        if not settings.DB_DIRECT_URL:
+            logger.warning("DB_PGBOUNCER is set without DB_DIRECT_URL; other processes' tasks wake waiters only on timeout")
+            return
+        engine = create_engine(settings.DB_DIRECT_URL, poolclass=NullPool)
+
+    _listen_engine = engine
+    _attach(_open_listen_connection())
+
+
+def stop() -> None:
+    global _reconnect_task
+    if _reconnect_task is not None:
+        _reconnect_task.cancel()
+        _reconnect_task = None
+    _detach()
@@ -0,0 +1,438 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..core.database import SessionLocal
+from ..schemas.enums import TaskStatus
+from ..schemas.task import Task, TranslationMemoryMatch
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# MinHash-LSH parameters: 32 bands of 4 rows put the 50% detection point at
+# a Jaccard similarity of about 0.42, just under the default match threshold.
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+INDEX_FORMAT_VERSION = 2
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: persisted signatures are only comparable under the same permutations.
+_permutation_state = np.random.RandomState(1)
+_PERM_A = _permutation_state.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _permutation_state.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+# Myanmar has no spaces between words, so text is compared by syllable.
+# A syllable starts at a consonant that is neither stacked under the previous
+# one (virama U+1039) nor killed by asat (U+103A) or another virama, at an
+# independent vowel or symbol, or at the first digit of a number.
+_MYANMAR = "\u1000-\u109f\ua9e0-\ua9ff\uaa60-\uaa7f"
+_MYANMAR_RUN = re.compile(f"[{_MYANMAR}]+")
+_MYANMAR_SYLLABLE_BREAK = re.compile(
+    r"(?<!\u1039)(?=[\u1000-\u1021\u103f](?![\u103a\u1039])|[\u1023-\u102a\u104a-\u104f])"
+    r"|(?<![\u1040-\u1049])(?=[\u1040-\u1049])"
+)
+_TOKEN = re.compile(f"[{_MYANMAR}]+|[^\\W{_MYANMAR}]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into Myanmar syllables and lower-cased words of other scripts, dropping punctuation."""
+    tokens = []
+    for run in _TOKEN.findall(text):
+        if _MYANMAR_RUN.fullmatch(run):
+            tokens.extend(syllable for syllable in _MYANMAR_SYLLABLE_BREAK.split(run) if syllable)
+        else:
+            tokens.append(run.lower())
+    # Myanmar section marks and other punctuation carry no meaning for matching.
+    return [token for token in tokens if token not in ("\u104a", "\u104b")]
+
+
+def shingles(text: str) -> Set[str]:
+    """Token bigrams of ``text``; a single-token text is its own shingle."""
+    tokens = tokenize(text)
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{a}\x1f{b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set: Iterable[str]) -> Optional[np.ndarray]:
+    hashes = np.array(
+        [int.from_bytes(hashlib.sha1(s.encode("utf-8")).digest()[:4], "little") for s in shingle_set],
+        dtype=np.uint64,
+    )
+    if not hashes.size:
+        return None
+    # uint64 overflow in a * h is intended: it is part of the hash family.
+    permuted = ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _band_keys(signature: np.ndarray) -> List[bytes]:
+    return [signature[i * ROWS_PER_BAND:(i + 1) * ROWS_PER_BAND].tobytes() for i in range(BANDS)]
+
+
+def _rows_as_bytes(matrix: np.ndarray) -> List[bytes]:
+    """The raw bytes of each row of a 2-D array, as ``row.tobytes()`` would give them."""
+    matrix = np.ascontiguousarray(matrix)
+    return matrix.view(np.dtype((np.void, matrix.shape[1] * matrix.itemsize))).ravel().tolist()
+
+
+class TranslationMemoryIndex:
+    """
+    MinHash-LSH index over the approved translations of one language pair.
+
+    Candidates come from LSH buckets and are re-ranked by exact Jaccard
+    similarity of their shingles, so lookups stay fast as the memory grows.
+    """
+
+    def __init__(self, source_language_id: int, target_language_id: int):
+        self.source_language_id = source_language_id
+        self.target_language_id = target_language_id
+        self.entries: Dict[int, Tuple[str, str]] = {}
+        self.signatures: Dict[int, bytes] = {}
+        self.buckets: List[Dict[bytes, Set[int]]] = [defaultdict(set) for _ in range(BANDS)]
+        # Latest qa_reviewed_at read from the database; later approvals are caught up from here.
+        self.watermark: Optional[datetime] = None
+        self.unsaved_changes = 0
+        self.refreshed_at = 0.0
+        self.refreshing = False
+        # Guards the index itself and is only held briefly; refresh_lock serializes catch-ups.
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+        self.save_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, task_id: int, source_text: str, translated_text: str) -> bool:
+        """Index an approved translation; False if it was already indexed as it is, or has no tokens."""
+        if self.entries.get(task_id) == (source_text, translated_text):
+            return False
+        signature = minhash(shingles(source_text))
+        if signature is None:
+            return False
+        with self.lock:
+            self.remove(task_id)
+            self.entries[task_id] = (source_text, translated_text)
+            self.signatures[task_id] = signature.tobytes()
+            for band, key in zip(self.buckets, _band_keys(signature)):
+                band[key].add(task_id)
+            self.unsaved_changes += 1
+        return True
+
+    def remove(self, task_id: int) -> None:
+        with self.lock:
+            signature = self.signatures.pop(task_id, None)
+            if signature is None:
+                return
+            del self.entries[task_id]
+            for band, key in zip(self.buckets, _band_keys(np.frombuffer(signature, dtype=np.uint32))):
+                band[key].discard(task_id)
+                if not band[key]:
+                    del band[key]
+
+    def discard(self, task_ids: Iterable[int]) -> None:
+        """Evict entries that are no longer approved translations."""
+        with self.lock:
+            for task_id in task_ids:
+                self.remove(task_id)
+                self.unsaved_changes += 1
+
+    def query(self, source_text: str, k: int = 5, min_similarity: float = 0.0) -> List[TranslationMemoryMatch]:
+        query_shingles = shingles(source_text)
+        signature = minhash(query_shingles)
+        if signature is None:
+            return []
+
+        with self.lock:
+            candidates = set()
+            for band, key in zip(self.buckets, _band_keys(signature)):
+                candidates.update(band.get(key, ()))
+            scored = []
+            for task_id in candidates:
+                candidate_source, candidate_translation = self.entries[task_id]
+                similarity = jaccard(query_shingles, shingles(candidate_source))
+                if similarity >= min_similarity:
+                    scored.append((similarity, task_id, candidate_source, candidate_translation))
+
+        scored.sort(key=lambda match: (-match[0], match[1]))
+        return [
+            TranslationMemoryMatch(
+                task_id=task_id,
+                source_text=candidate_source,
+                translated_text=candidate_translation,
+                similarity=round(similarity, 4),
+            )
+            for similarity, task_id, candidate_source, candidate_translation in scored[:k]
+        ]
+
+    def catch_up(self, db: Session) -> int:
+        """
+        Index every approved task of this pair reviewed since the watermark; returns how many were new.
+
+        qa_reviewed_at is stamped by the reviewing process before it commits,
+        so an approval can become visible after a later-stamped one has been
+        indexed. Catch-up therefore re-reads ``TM_CATCH_UP_OVERLAP_SECONDS``
+        behind the watermark; rows indexed already are skipped by add().
+        """
+        query = (
+            db.query(Task.task_id, Task.source_text, Task.translated_text, Task.qa_reviewed_at)
+            .filter(
+                Task.source_language_id == self.source_language_id,
+                Task.target_language_id == self.target_language_id,
+                Task.task_status == TaskStatus.COMPLETE,
+                Task.is_assessment.is_(False),
+                Task.translated_text.isnot(None),
+                Task.qa_reviewed_at.isnot(None),
+            )
+        )
+        if self.watermark is not None:
+            overlap = timedelta(seconds=settings.TM_CATCH_UP_OVERLAP_SECONDS)
+            query = query.filter(Task.qa_reviewed_at >= self.watermark - overlap)
+
+        # Each add() takes the lock on its own, so lookups are served while the rows stream in.
+        added = 0
+        watermark = self.watermark
+        for task_id, source_text, translated_text, reviewed_at in query.yield_per(5000):
+            added += self.add(task_id, source_text, translated_text)
+            if watermark is None or reviewed_at > watermark:
+                watermark = reviewed_at
+        with self.lock:
+            self.watermark = watermark
+            self.refreshed_at = time.monotonic()
+        return added
+
+    def path(self) -> str:
+        return os.path.join(settings.TM_INDEX_DIR, f"tm_{self.source_language_id}_{self.target_language_id}.npz")
+
+    def save(self) -> None:
+        """
+        Write the index as a NumPy archive of plain arrays; loading it runs no code from the file.
+
+        The signatures are stored as one matrix and the texts as JSON; the
+        LSH buckets are rebuilt from the signatures on load.
+        """
+        with self.save_lock:
+            with self.lock:
+                task_ids = np.fromiter(self.entries, dtype=np.int64, count=len(self.entries))
+                signatures = np.frombuffer(
+                    b"".join(self.signatures[task_id] for task_id in task_ids.tolist()), dtype=np.uint32
+                ).reshape(-1, NUM_PERM)
+                texts = json.dumps([self.entries[task_id] for task_id in task_ids.tolist()], ensure_ascii=False)
+                header = json.dumps({
+                    "version": INDEX_FORMAT_VERSION,
+                    "source_language_id": self.source_language_id,
+                    "target_language_id": self.target_language_id,
+                    "watermark": self.watermark.isoformat() if self.watermark else None,
+                })
+                self.unsaved_changes = 0
+
+            os.makedirs(settings.TM_INDEX_DIR, exist_ok=True)
+            path = self.path()
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                np.savez(
+                    f,
+                    header=np.frombuffer(header.encode("utf-8"), dtype=np.uint8),
+                    task_ids=task_ids,
+                    signatures=signatures,
+                    texts=np.frombuffer(texts.encode("utf-8"), dtype=np.uint8),
+                )
+            os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, source_language_id: int, target_language_id: int) -> Optional["TranslationMemoryIndex"]:
+        index = cls(source_language_id, target_language_id)
+        try:
+            with np.load(index.path(), allow_pickle=False) as data:
+                header = json.loads(data["header"].tobytes().decode("utf-8"))
+                if header.get("version") != INDEX_FORMAT_VERSION:
+                    return None
+                task_ids = data["task_ids"].tolist()
+                signatures = data["signatures"]
+                texts = json.loads(data["texts"].tobytes().decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable translation memory {index.path()}: {str(e)}")
+            return None
+
+        index.watermark = datetime.fromisoformat(header["watermark"]) if header["watermark"] else None
+        index.entries = {task_id: (source_text, translated_text) for task_id, (source_text, translated_text) in zip(task_ids, texts)}
+        index.signatures = dict(zip(task_ids, _rows_as_bytes(signatures)))
+        # Same keys as _band_keys, a band at a time for all signatures.
+        for i, band in enumerate(index.buckets):
+            keys = _rows_as_bytes(signatures[:, i * ROWS_PER_BAND:(i + 1) * ROWS_PER_BAND])
+            for task_id, key in zip(task_ids, keys):
+                band[key].add(task_id)
+        return index
+
+
+_indexes: Dict[Tuple[int, int], TranslationMemoryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(
+    db: Session,
+    source_language_id: int,
+    target_language_id: int,
+    wait: bool = True,
+) -> Optional[TranslationMemoryIndex]:
+    """
+    Return the index for a language pair, loading or building it on first use.
+
+    The index is also topped up from the database every ``TM_REFRESH_SECONDS``
+    so approvals made by other worker processes show up here too. With
+    ``wait=False`` the caller never runs a build or top-up itself: it is
+    started in a background thread, and the index is returned as it is, or
+    None if it has not been built yet.
+    """
+    key = (source_language_id, target_language_id)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = TranslationMemoryIndex.load(*key) or TranslationMemoryIndex(*key)
+            _indexes[key] = index
+
+    if not wait:
+        if _refresh_due(index):
+            _refresh_in_background(index)
+        return index if index.refreshed_at else None
+    if _refresh_due(index):
+        with index.refresh_lock:
+            if _refresh_due(index):
+                _refresh(db, index)
+    return index
+
+
+def _refresh_due(index: TranslationMemoryIndex) -> bool:
+    return not index.refreshed_at or time.monotonic() - index.refreshed_at >= settings.TM_REFRESH_SECONDS
+
+
+def _refresh(db: Session, index: TranslationMemoryIndex) -> None:
+    started = time.perf_counter()
+    added = index.catch_up(db)
+    if added:
+        logger.info(
+            f"Translation memory ({index.source_language_id}, {index.target_language_id}): "
+            f"indexed {added} tasks in {time.perf_counter() - started:.2f}s ({len(index)} total)"
+        )
+        _maybe_save(index)
+
+
+def _refresh_in_background(index: TranslationMemoryIndex) -> None:
+    with _indexes_lock:
+        if index.refreshing:
+            return
+        index.refreshing = True
+
+    def refresh() -> None:
+        db = SessionLocal()
+        try:
+            with index.refresh_lock:
+                if _refresh_due(index):
+                    _refresh(db, index)
+        except Exception as e:
+            logger.error(f"Could not refresh translation memory {index.path()}: {str(e)}")
+        finally:
+            db.close()
+            index.refreshing = False
+
+    threading.Thread(target=refresh, daemon=True, name="tm-refresh").start()
+
+
+def find_matches(
+    db: Session,
+    source_language_id: int,
+    target_language_id: int,
+    source_text: str,
+    k: int = 5,
+    min_similarity: Optional[float] = None,
+    wait: bool = True,
+) -> List[TranslationMemoryMatch]:
+    if min_similarity is None:
+        min_similarity = settings.TM_MIN_SIMILARITY
+    index = get_index(db, source_language_id, target_language_id, wait=wait)
+    if index is None:
+        return []
+    while True:
+        matches = index.query(source_text, k=k, min_similarity=min_similarity)
+        if not _evict_stale(db, index, matches):
+            return matches
+
+
+def _evict_stale(db: Session, index: TranslationMemoryIndex, matches: List[TranslationMemoryMatch]) -> bool:
+    """
+    Evict matches whose task was deleted, is no longer COMPLETE or was retranslated; True if there were any.
+
+    Entries are only ever added, by approvals in any process, so hits are
+    checked against the task table before they are offered.
+    """
+    if not matches:
+        return False
+    current = dict(db.execute(
+        select(Task.task_id, Task.translated_text).where(
+            Task.task_id.in_([match.task_id for match in matches]),
+            Task.task_status == TaskStatus.COMPLETE,
+        )
+    ).all())
+    stale = [match.task_id for match in matches if current.get(match.task_id) != match.translated_text]
+    if stale:
+        index.discard(stale)
+        _maybe_save(index)
+    return bool(stale)
+
+
+def record_approved_task(task: Task) -> None:
+    """Add a task approved in QA to its pair's index, if that index is loaded in this process."""
+    if task.is_assessment or not task.translated_text:
+        return
+    with _indexes_lock:
+        index = _indexes.get((task.source_language_id, task.target_language_id))
+    # An index that is not built yet picks the task up from the database when it is.
+    if index is None or not index.refreshed_at:
+        return
+    index.add(task.task_id, task.source_text, task.translated_text)
+    _maybe_save(index)
+
+
+def _maybe_save(index: TranslationMemoryIndex) -> None:
+    if index.unsaved_changes < settings.TM_SAVE_EVERY or index.save_lock.locked():
+        return
+    threading.Thread(target=_save_quietly, args=(index,), daemon=True, name="tm-save").start()
+
+
+def _save_quietly(index: TranslationMemoryIndex) -> None:
+    try:
+        index.save()
+    except Exception as e:
+        logger.error(f"Could not save translation memory {index.path()}: {str(e)}")
+
+
+def save_all() -> None:
+    """Write every index with unsaved changes to disk; called on shutdown."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        if index.unsaved_changes:
+            _save_quietly(index)
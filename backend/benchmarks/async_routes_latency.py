@@ -0,0 +1,123 @@
+"""
+Latency of fast requests while slow requests are in flight, sync vs async sessions.
+
+Mounts two copies of a fast route and a slow route on a scratch app:
+
+- ``/before``: ``async def`` handlers querying through the synchronous
+  ``get_db`` Session, as the routes did before the async port.
+- ``/after``: the same handlers on ``get_async_db``.
+
+The fast route lists the languages, like /all_languages/all_languages.
+The slow route runs ``pg_sleep(--slow-ms)``, standing in for a slow report
+query. ``--clients`` concurrent clients each send ``--requests`` requests
+through httpx's ASGI transport. About ``--slow-ratio`` of the requests are
+slow. The p50/p99 of the fast requests are reported for each variant. With
+the synchronous Session, every slow query blocks the event loop, so the
+fast requests queue behind it.
+
+Keep ``--clients`` within the synchronous pool (15 connections by
+default). Beyond that, a ``/before`` handler blocks the event loop waiting
+for a connection that only an exiting request can return, until the pool
+timeout. Needs PostgreSQL.
+
+    python -m benchmarks.async_routes_latency --clients 10 --requests 40 --slow-ratio 0.1 --slow-ms 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import async_engine, engine, get_async_db, get_db
+from app.schemas.language import Language
+
+
+def build_app(slow_seconds: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/fast")
+    async def before_fast(db: Session = Depends(get_db)):
+        return [language.language_name for language in db.scalars(select(Language))]
+
+    @app.get("/before/slow")
+    async def before_slow(db: Session = Depends(get_db)):
+        db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": slow_seconds})
+        return "done"
+
+    @app.get("/after/fast")
+    async def after_fast(db: AsyncSession = Depends(get_async_db)):
+        return [language.language_name for language in await db.scalars(select(Language))]
+
+    @app.get("/after/slow")
+    async def after_slow(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": slow_seconds})
+        return "done"
+
+    return app
+
+
+async def client(http, variant, requests, slow_ratio, rng, fast_latencies):
+    for _ in range(requests):
+        slow = rng.random() < slow_ratio
+        started = time.perf_counter()
+        response = await http.get(f"/{variant}/{'slow' if slow else 'fast'}")
+        response.raise_for_status()
+        if not slow:
+            fast_latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run(app, variant, args):
+    fast_latencies = []
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+        # Warm both connection pools before measuring.
+        await asyncio.gather(*[http.get(f"/{variant}/fast") for _ in range(5)])
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            client(http, variant, args.requests, args.slow_ratio, random.Random(rng.random()), fast_latencies)
+            for _ in range(args.clients)
+        ])
+        elapsed = time.perf_counter() - started
+    fast_latencies.sort()
+    print(
+        f"{variant:>6}: {len(fast_latencies)} fast requests in {elapsed:.2f}s "
+        f"p50={statistics.median(fast_latencies):.1f}ms "
+        f"p99={fast_latencies[max(int(len(fast_latencies) * 0.99) - 1, 0)]:.1f}ms "
+        f"max={fast_latencies[-1]:.1f}ms"
+    )
+
+
+async def main_async(args):
+    app = build_app(args.slow_ms / 1000)
+    try:
+        for variant in ("before", "after"):
+            await run(app, variant, args)
+    finally:
+        await async_engine.dispose()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--slow-ratio", type=float, default=0.1)
+    parser.add_argument("--slow-ms", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit("This benchmark needs PostgreSQL.")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
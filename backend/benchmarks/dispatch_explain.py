@@ -0,0 +1,113 @@
+"""
+Plan and latency check for the task dispatch queries.
+
+Runs EXPLAIN on the task and QA review claim queries for a language
+pair, on the any-pair task claim across the pair and its reverse, and on the lease reaper's expiry scans, and fails unless each is served by its partial
+index with no sequential or bitmap scan of ``task``. It then times a
+series of claims inside a transaction that is rolled back, so the
+database is left untouched. Needs PostgreSQL.
+
+    python -m benchmarks.dispatch_explain --source 1 --target 2 --claims 200
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.services.dispatch import any_pair_open_tasks_query, claim_task, open_tasks_query, review_queue_query
+from app.services.lease_reaper import expired_freelancer_leases, expired_qa_leases
+
+EXPECTED_INDEXES = {
+    "open task claim": "ix_task_dispatch_open",
+    "any-pair task claim": "ix_task_dispatch_open",
+    "QA review claim": "ix_task_review_queue",
+    "freelancer lease reaper": "ix_task_lease_expires_at",
+    "QA lease reaper": "ix_task_qa_lease_expires_at",
+}
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db: Session, statement) -> dict:
+    statement = statement.with_for_update(skip_locked=True).limit(1)
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    plan = result.scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+def check_plan(name: str, plan: dict) -> bool:
+    nodes = [node for node in plan_nodes(plan) if node.get("Relation Name") == "task"]
+    scans = [(node["Node Type"], node.get("Index Name")) for node in nodes]
+    ok = bool(scans) and all(
+        node_type in ("Index Scan", "Index Only Scan") and index_name == EXPECTED_INDEXES[name]
+        for node_type, index_name in scans
+    )
+    print(f"{'OK' if ok else 'FAIL'}: {name} uses {', '.join(f'{t} on {i}' if i else t for t, i in scans)}")
+    return ok
+
+
+def dispatch_statements(source: int, target: int) -> dict:
+    """The queries checked, by the names in EXPECTED_INDEXES."""
+    return {
+        "open task claim": open_tasks_query(source, target),
+        "any-pair task claim": any_pair_open_tasks_query({(source, target): True, (target, source): False}),
+        "QA review claim": review_queue_query(source, target),
+        "freelancer lease reaper": expired_freelancer_leases(),
+        "QA lease reaper": expired_qa_leases(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--source", type=int, default=1)
+    parser.add_argument("--target", type=int, default=2)
+    parser.add_argument("--claims", type=int, default=200)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit("This check needs PostgreSQL.")
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection)
+    try:
+        task_count = db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'task'")).scalar()
+        print(f"task table: ~{task_count:,} rows")
+
+        statements = dispatch_statements(args.source, args.target)
+        plans_ok = all([check_plan(name, explain(db, statement)) for name, statement in statements.items()])
+
+        latencies = []
+        for _ in range(args.claims):
+            started = time.perf_counter()
+            task = claim_task(db, freelancer_id=None, source_language_id=args.source, target_language_id=args.target)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if task is None:
+                break
+        if latencies:
+            latencies.sort()
+            print(
+                f"{len(latencies)} claims: p50={statistics.median(latencies):.2f}ms "
+                f"p99={latencies[max(int(len(latencies) * 0.99) - 1, 0)]:.2f}ms max={latencies[-1]:.2f}ms"
+            )
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+    if not plans_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
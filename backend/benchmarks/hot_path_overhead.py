@@ -0,0 +1,133 @@
+"""
+Per-request Python overhead of the claim, submit and QA review handlers, apart from database time.
+
+Calls the handlers of /task/open, /task/submit and /task/submit_qa_review
+directly, without HTTP, ``--iterations`` times in a row: a freelancer
+claims a task of the pair, submits it, and a QA member approves it. The
+QA assignment in between is written directly and not measured. All of it
+runs inside a transaction that is rolled back afterwards.
+
+Time spent between ``before_cursor_execute`` and ``after_cursor_execute``
+counts as database time (driver and round trip included); the rest of
+each call is Python: building statements, looking them up in the compiled
+cache, loading rows into objects and flushing them. Mean and p50 per call
+are reported after ``--warmup`` untimed cycles. Needs PostgreSQL.
+
+    python -m benchmarks.hot_path_overhead --freelancer 2 --qa 5 --source 1 --target 2 --iterations 300
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.routes.task import QaReviewSubmit, get_open_task, submit_qa_review, submit_task
+from app.schemas.task import OpenTaskRequest, SubmitTaskRequest, Task
+
+HANDLERS = ("open", "submit", "qa review")
+
+
+class Timer:
+    """Splits the wall time of a call into database and Python time."""
+
+    def __init__(self, connection):
+        self.db_seconds = 0.0
+        self.statements = 0
+        self._started = None
+        event.listen(connection, "before_cursor_execute", self._before)
+        event.listen(connection, "after_cursor_execute", self._after)
+
+    def _before(self, *args):
+        self._started = time.perf_counter()
+
+    def _after(self, *args):
+        self.db_seconds += time.perf_counter() - self._started
+        self.statements += 1
+
+    def measure(self, call):
+        self.db_seconds, self.statements = 0.0, 0
+        started = time.perf_counter()
+        result = call()
+        wall = time.perf_counter() - started
+        return result, (wall - self.db_seconds, self.db_seconds, self.statements)
+
+
+def cycle(db: Session, timer: Timer, args):
+    task, open_timing = timer.measure(lambda: get_open_task(
+        OpenTaskRequest(
+            freelancer_id=args.freelancer,
+            source_language_id=args.source,
+            target_language_id=args.target,
+            include_tm_match=False,
+        ),
+        db,
+    ))
+    if task is None:
+        sys.exit("The pair ran out of OPEN tasks.")
+    _, submit_timing = timer.measure(lambda: submit_task(
+        SubmitTaskRequest(freelancer_id=args.freelancer, task_id=task.task_id, translated_text="benchmark"),
+        db,
+    ))
+
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(Task)
+        .where(Task.task_id == task.task_id)
+        .values(qa_assigned_id=args.qa, qa_assigned_at=now, qa_lease_expires_at=now + timedelta(minutes=30))
+    )
+    db.commit()
+
+    _, review_timing = timer.measure(lambda: submit_qa_review(
+        QaReviewSubmit(task_id=task.task_id, qa_id=args.qa, decision=True),
+        db,
+    ))
+    return open_timing, submit_timing, review_timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--freelancer", type=int, required=True)
+    parser.add_argument("--qa", type=int, required=True)
+    parser.add_argument("--source", type=int, default=1)
+    parser.add_argument("--target", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit("This benchmark needs PostgreSQL.")
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    timer = Timer(connection)
+
+    timings = {handler: [] for handler in HANDLERS}
+    try:
+        for _ in range(args.warmup):
+            cycle(db, timer, args)
+        for _ in range(args.iterations):
+            for handler, timing in zip(HANDLERS, cycle(db, timer, args)):
+                timings[handler].append(timing)
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+    print(f"{'handler':<10} {'python mean':>12} {'python p50':>11} {'db mean':>9} {'db p50':>8} {'queries':>8}")
+    for handler, samples in timings.items():
+        python, db_time, statements = (list(column) for column in zip(*samples))
+        print(
+            f"{handler:<10} {statistics.mean(python) * 1e6:10.0f}us {statistics.median(python) * 1e6:9.0f}us "
+            f"{statistics.mean(db_time) * 1e6:7.0f}us {statistics.median(db_time) * 1e6:6.0f}us "
+            f"{statistics.mean(statements):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Peak-memory benchmark for the streaming CSV upload parser.
+
+Generates a headerless CSV of the requested size (1 GB by default), then
+feeds it through the same parse-and-batch path used by job creation and
+reports the peak resident set size. Peak memory should stay flat as
+--size-mb grows.
+
+    python -m benchmarks.ingest_memory --size-mb 1024
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from app.services.importers import iter_batches, iter_csv_source_texts
+
+SAMPLE_ROWS = [
+    "မင်္ဂလာပါ၊ ဒီနေ့ ရာသီဥတု ကောင်းပါတယ်။",
+    '"A quoted sentence, with a comma"',
+    '"A sentence that spans\ntwo lines"',
+    "The quick brown fox jumps over the lazy dog.",
+]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_corpus(path: str, size_mb: int) -> int:
+    target = size_mb * 1024 * 1024
+    block = ("\n".join(SAMPLE_ROWS * 2500) + "\n").encode("utf-8")
+    written = 0
+    with open(path, "wb") as f:
+        while written < target:
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.csv")
+        size = write_corpus(path, args.size_mb)
+        baseline = peak_rss_mb()
+
+        started = time.perf_counter()
+        rows = 0
+        with open(path, "rb") as f:
+            for batch in iter_batches(iter_csv_source_texts(f), args.batch_size):
+                rows += len(batch)
+        elapsed = time.perf_counter() - started
+
+    print(f"input size:     {size / 1024 / 1024:.0f} MB")
+    print(f"rows parsed:    {rows}")
+    print(f"elapsed:        {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)")
+    print(f"baseline RSS:   {baseline:.1f} MB")
+    print(f"peak RSS:       {peak_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
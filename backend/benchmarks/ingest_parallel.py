@@ -0,0 +1,55 @@
+"""
+Throughput benchmark for parallel CSV parsing.
+
+Generates a headerless CSV of the requested size and parses and
+normalises it with the single-process reader and with the process-pool
+reader at each requested worker count. The DB writer is not involved, so
+the numbers show parsing throughput only.
+
+    python -m benchmarks.ingest_parallel --size-mb 512 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.services.importers import (
+    iter_csv_source_texts,
+    iter_csv_source_texts_parallel,
+    normalize_source_texts,
+)
+from benchmarks.ingest_memory import write_corpus
+
+
+def run_serial(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in normalize_source_texts(iter_csv_source_texts(f)))
+
+
+def run_parallel(path: str, workers: int, chunk_bytes: int) -> int:
+    return sum(1 for _ in iter_csv_source_texts_parallel(path, workers, chunk_bytes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 4])
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.csv")
+        write_corpus(path, args.size_mb)
+
+        for workers in args.workers:
+            started = time.perf_counter()
+            if workers == 1:
+                rows = run_serial(path)
+            else:
+                rows = run_parallel(path, workers, args.chunk_mb * 1024 * 1024)
+            elapsed = time.perf_counter() - started
+            print(f"workers={workers:<3} rows={rows:<10} {elapsed:6.2f}s {rows / elapsed:>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
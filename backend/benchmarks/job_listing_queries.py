@@ -0,0 +1,124 @@
+"""
+Query-count regression check for the job listing endpoints.
+
+Seeds jobs (with a few tasks each) inside a transaction that is rolled
+back afterwards, calls /job/get_all_jobs and /job/get_all_ass_jobs at
+each requested job count, and counts the SQL statements the request
+executes. The check fails if the count grows with the number of jobs.
+
+The endpoints read through get_async_read_db, so that dependency is
+overridden with an AsyncSession on the seeding connection, statements are
+counted on that connection, and the requests go through httpx in the
+same event loop as the session.
+
+    python -m benchmarks.job_listing_queries --jobs 10 1000 5000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Set
+
+import httpx
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import async_engine, get_async_read_db
+from app.main import app
+from app.schemas.enums import TaskStatus
+from app.schemas.job import Job
+from app.schemas.language import Language
+from app.schemas.task import Task
+
+ENDPOINTS = ("/job/get_all_jobs", "/job/get_all_ass_jobs")
+
+
+def seed(db: Session, count: int, start: int) -> None:
+    languages = [language_id for (language_id,) in db.query(Language.language_id).limit(2)]
+    while len(languages) < 2:
+        language = Language(language_name=f"benchmark-{len(languages)}")
+        db.add(language)
+        db.flush()
+        languages.append(language.language_id)
+
+    for i in range(start, start + count):
+        job = Job(
+            job_title=f"benchmark {i}",
+            source_language_id=languages[0],
+            target_language_id=languages[1],
+            total_tasks=3,
+            is_assessment=bool(i % 2),
+            created_at=datetime.now(),
+            task_price=1.0,
+            instructions="benchmark",
+        )
+        db.add(job)
+        db.flush()
+        db.execute(insert(Task), [
+            {
+                "job_id": job.job_id,
+                "source_language_id": languages[0],
+                "target_language_id": languages[1],
+                "source_text": f"segment {n}",
+                "max_time_per_task": 10,
+                "task_price": 1.0,
+                "task_status": status,
+                "is_assessment": job.is_assessment,
+            }
+            for n, status in enumerate((TaskStatus.OPEN, TaskStatus.UNDER_REVIEW, TaskStatus.COMPLETE))
+        ])
+    db.flush()
+
+
+async def count_queries(job_counts: List[int]) -> Dict[str, Set[int]]:
+    """The statement counts seen per endpoint across ``job_counts``."""
+    counts = {}
+    try:
+        async with async_engine.connect() as connection:
+            transaction = await connection.begin()
+            db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+            app.dependency_overrides[get_async_read_db] = lambda: db
+
+            statements = []
+            event.listen(connection.sync_connection, "before_cursor_execute", lambda *a, **k: statements.append(1))
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                    seeded = 0
+                    for total in sorted(job_counts):
+                        await db.run_sync(seed, total - seeded, seeded)
+                        seeded = total
+                        for endpoint in ENDPOINTS:
+                            statements.clear()
+                            started = time.perf_counter()
+                            response = await client.get(endpoint)
+                            elapsed = time.perf_counter() - started
+                            response.raise_for_status()
+                            counts.setdefault(endpoint, set()).add(len(statements))
+                            print(f"{endpoint:<24} jobs={total:<6} rows={len(response.json()):<6} queries={len(statements):<3} {elapsed * 1000:8.1f}ms")
+            finally:
+                app.dependency_overrides.pop(get_async_read_db, None)
+                await db.close()
+                await transaction.rollback()
+    finally:
+        # Pooled asyncpg connections belong to this event loop.
+        await async_engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 1000])
+    args = parser.parse_args()
+
+    counts = asyncio.run(count_queries(args.jobs))
+    growing = [endpoint for endpoint, seen in counts.items() if len(seen) > 1]
+    if growing:
+        print(f"FAIL: query count depends on the number of jobs for {', '.join(growing)}")
+        sys.exit(1)
+    print("OK: query count is constant")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Concurrency check for QA review claims.
+
+Seeds a scratch language pair and job with ``--submissions`` UNDER_REVIEW
+tasks, then starts ``--reviewers`` threads. Each thread uses its own
+connection and repeatedly claims ``--batch`` reviews with
+services.dispatch.claim_reviews, committing each claim as the endpoint
+does, until the queue is drained. The check fails if any task was handed
+to more than one claim. The scratch pair, job and tasks are deleted
+afterwards. Needs PostgreSQL and at least one QA member.
+
+    python -m benchmarks.qa_claim_concurrency --reviewers 50 --submissions 5000 --batch 5
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.schemas.enums import JobStatus, TaskStatus
+from app.schemas.job import Job
+from app.schemas.language import Language
+from app.schemas.qa_member import QAMember
+from app.schemas.task import Task
+from app.services.dispatch import claim_reviews
+
+
+def seed(engine, submissions: int):
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        source = Language(language_name=f"benchmark source {now.timestamp()}")
+        target = Language(language_name=f"benchmark target {now.timestamp()}")
+        db.add_all([source, target])
+        db.flush()
+        job = Job(
+            job_title="qa claim concurrency benchmark",
+            source_language_id=source.language_id,
+            target_language_id=target.language_id,
+            total_tasks=submissions,
+            job_status=JobStatus.IN_PROGRESS,
+            is_assessment=False,
+            max_time_per_task=10,
+            created_at=now,
+            task_price=0,
+            instructions="benchmark",
+            under_review_tasks=submissions,
+        )
+        db.add(job)
+        db.flush()
+        db.execute(insert(Task), [
+            {
+                "job_id": job.job_id,
+                "job_status": JobStatus.IN_PROGRESS,
+                "source_language_id": source.language_id,
+                "target_language_id": target.language_id,
+                "source_text": f"benchmark submission {i}",
+                "translated_text": f"benchmark translation {i}",
+                "max_time_per_task": 10,
+                "task_status": TaskStatus.UNDER_REVIEW,
+                "task_price": 0,
+                "is_assessment": False,
+                "submitted_at": now,
+            }
+            for i in range(submissions)
+        ])
+        db.commit()
+        # Give the planner statistics for the new pair, as autovacuum would after a real ingest.
+        db.execute(text("ANALYZE job, task"))
+        db.commit()
+        return job.job_id, source.language_id, target.language_id
+
+
+def cleanup(engine, job_id: int, language_ids) -> None:
+    with Session(engine) as db:
+        db.execute(delete(Job).where(Job.job_id == job_id))
+        db.execute(delete(Language).where(Language.language_id.in_(language_ids)))
+        db.commit()
+
+
+def reviewer(engine, qa_id, pair, batch, start, claimed, latencies, errors):
+    db = Session(engine)
+    try:
+        start.wait()
+        while True:
+            started = time.perf_counter()
+            tasks = [task.task_id for task in claim_reviews(db, qa_id, *pair, batch)]
+            db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+            claimed.extend(tasks)
+            if not tasks:
+                break
+    except Exception as e:
+        db.rollback()
+        errors.append(str(e))
+    finally:
+        db.close()
+
+
+def claim_concurrently(engine, qa_ids, reviewers: int, submissions: int, batch: int):
+    """
+    Seed, drain the queue with ``reviewers`` threads and clean up.
+
+    Returns the claimed task ids in claim order (a task claimed twice
+    appears twice), the claim latencies in ms, the errors and the elapsed
+    seconds.
+    """
+    job_id, source, target = seed(engine, submissions)
+    start = threading.Barrier(reviewers + 1)
+    claimed, latencies, errors = [], [], []
+    try:
+        threads = [
+            threading.Thread(
+                target=reviewer,
+                args=(engine, qa_ids[i % len(qa_ids)], (source, target), batch, start, claimed, latencies, errors),
+            )
+            for i in range(reviewers)
+        ]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        cleanup(engine, job_id, (source, target))
+    return claimed, latencies, errors, elapsed
+
+
+def double_assignments(claimed) -> int:
+    return sum(count - 1 for count in Counter(claimed).values() if count > 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reviewers", type=int, default=50)
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(get_settings().DATABASE_URL, pool_size=args.reviewers, max_overflow=0)
+    if engine.dialect.name != "postgresql":
+        sys.exit("This check needs PostgreSQL.")
+
+    with Session(engine) as db:
+        qa_ids = db.scalars(select(QAMember.qa_member_id).order_by(QAMember.qa_member_id)).all()
+    if not qa_ids:
+        sys.exit("Needs at least one QA member.")
+
+    try:
+        claimed, latencies, errors, elapsed = claim_concurrently(
+            engine, qa_ids, args.reviewers, args.submissions, args.batch
+        )
+    finally:
+        engine.dispose()
+
+    doubles = double_assignments(claimed)
+    latencies.sort()
+    print(f"{args.reviewers} reviewers claimed {len(claimed)} reviews in batches of {args.batch} in {elapsed:.2f}s")
+    print(
+        f"{len(latencies)} claims: p50={statistics.median(latencies):.2f}ms "
+        f"p99={latencies[max(int(len(latencies) * 0.99) - 1, 0)]:.2f}ms max={latencies[-1]:.2f}ms"
+    )
+    print(f"{'OK' if not doubles else 'FAIL'}: {doubles} double assignment(s)")
+    for error in errors:
+        print(f"error: {error}")
+    if doubles or errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Check of read-replica routing against a local two-database stand-in.
+
+Creates an empty scratch database next to DATABASE_URL with the app's
+schema and starts the app with it as DATABASE_REPLICA_URL. The job
+listing, a replica-routed read, is then expected to:
+
+- come from the empty stand-in for a client that has not written,
+- come from the primary right after the client's PUT /job/update_schedule
+  (the job's schedule is written back unchanged) while the client echoes
+  the X-Read-Primary-Until header that write returned,
+- go back to the stand-in once ``--staleness`` seconds have passed.
+
+/health/db_pool should list the replica pools as well. The scratch
+database is dropped afterwards. Needs PostgreSQL and at least one job.
+
+    python -m benchmarks.replica_routing_check --staleness 2
+"""
+import argparse
+import os
+import sys
+import time
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import make_url
+
+FRONTEND_ORIGIN = "http://localhost:3000"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--staleness", type=int, default=2)
+    args = parser.parse_args()
+
+    primary_url = make_url(os.environ["DATABASE_URL"])
+    if primary_url.get_backend_name() != "postgresql":
+        sys.exit("This check needs PostgreSQL.")
+    standin_name = f"{primary_url.database}_replica_standin"
+    standin_url = primary_url.set(database=standin_name).render_as_string(hide_password=False)
+
+    admin = create_engine(primary_url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f'DROP DATABASE IF EXISTS "{standin_name}"'))
+        connection.execute(text(f'CREATE DATABASE "{standin_name}"'))
+
+    # Settings are read once on import, so the app is imported after the environment is set.
+    os.environ["DATABASE_REPLICA_URL"] = standin_url
+    os.environ["REPLICA_STALENESS_SECONDS"] = str(args.staleness)
+    from fastapi.testclient import TestClient
+
+    from app.core.database import SessionLocal, replica_engine
+    from app.core.read_routing import READ_HINT_HEADER
+    from app.main import app
+    from app.schemas.base import Base
+    from app.schemas.job import Job
+
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str) -> None:
+        nonlocal failures
+        failures += not ok
+        print(f"{'OK' if ok else 'FAIL'}: {name} ({detail})")
+
+    try:
+        Base.metadata.create_all(replica_engine)
+        with SessionLocal() as db:
+            primary_jobs = db.scalar(select(func.count()).select_from(Job).where(Job.is_assessment.is_(False)))
+            job = db.scalar(select(Job).order_by(Job.job_id).limit(1))
+        if not primary_jobs or job is None:
+            sys.exit("Needs at least one job on the primary.")
+        schedule = {
+            "priority": job.priority,
+            "deadline": job.deadline.isoformat() if job.deadline else None,
+            "max_active_assignments": job.max_active_assignments,
+            "difficulty": job.difficulty,
+        }
+
+        with TestClient(app) as client:
+            jobs = client.get("/job/get_all_jobs").json()
+            check("read before any write goes to the replica", len(jobs) == 0, f"{len(jobs)} jobs")
+
+            response = client.put(
+                f"/job/update_schedule/{job.job_id}", json=schedule, headers={"Origin": FRONTEND_ORIGIN}
+            )
+            hint = response.headers.get(READ_HINT_HEADER)
+            check("write returns the read-after-write hint", hint is not None, str(response.status_code))
+            exposed = response.headers.get("access-control-expose-headers", "")
+            check("the hint is exposed to the frontend", READ_HINT_HEADER.lower() in exposed.lower(), exposed)
+
+            # As the frontend does, echo the hint on the following reads.
+            echoed = {READ_HINT_HEADER: hint or ""}
+            jobs = client.get("/job/get_all_jobs", headers=echoed).json()
+            check("read right after the write goes to the primary", len(jobs) == primary_jobs, f"{len(jobs)} of {primary_jobs} jobs")
+
+            time.sleep(args.staleness + 0.5)
+            jobs = client.get("/job/get_all_jobs", headers=echoed).json()
+            check("read after the staleness window goes to the replica", len(jobs) == 0, f"{len(jobs)} jobs")
+
+            pools = [pool["name"] for pool in client.get("/health/db_pool").json()]
+            check("pool metrics include the replica", "replica" in pools and "async replica" in pools, ", ".join(pools))
+    finally:
+        replica_engine.dispose()
+        with admin.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{standin_name}" WITH (FORCE)'))
+        admin.dispose()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Concurrency check for the counters moved by QA reviews.
+
+Seeds a scratch language pair, freelancer, ``--qa-members`` QA members and
+a job with ``--reviews`` submissions of that freelancer, each assigned to
+one of the QA members. Then it starts one thread per submission, and all
+of them call the /task/submit_qa_review handler at once, each with its
+own session. Every ``--reject-every``-th review is a rejection. The
+threads share ``--connections`` pooled connections. Every review hits the
+same freelancer, pair and QA rows. With ``--double-submit`` every review is
+sent twice at once, as a double click would; exactly one of each pair
+must go through and the other must be refused with 409.
+
+The check fails unless the QA members' review and rejection totals, the
+pair's complete/rejected counts and accuracy, the freelancer's earnings
+and balance, and the job's counters all match the reviews exactly.
+Throughput and review latency are reported. The scratch rows are deleted
+afterwards. Needs PostgreSQL.
+
+    python -m benchmarks.review_counter_concurrency --reviews 100 --qa-members 2 --connections 20 --double-submit
+"""
+import argparse
+import math
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.routes.task import QaReviewSubmit, submit_qa_review
+from app.schemas.enums import AssSubmission, JobStatus, TaskStatus
+from app.schemas.freelancer import Freelancer
+from app.schemas.freelancer_language_pair import FreelancerLanguagePair
+from app.schemas.job import Job
+from app.schemas.language import Language
+from app.schemas.qa_member import QAMember
+from app.schemas.task import Task
+
+TASK_PRICE = 0.5
+
+
+def seed(engine, reviews: int, qa_members: int):
+    now = datetime.now(timezone.utc)
+    tag = now.timestamp()
+    with Session(engine) as db:
+        source = Language(language_name=f"benchmark source {tag}")
+        target = Language(language_name=f"benchmark target {tag}")
+        freelancer = Freelancer(
+            email=f"review-benchmark-{tag}@example.com",
+            full_name="review counter benchmark",
+            password_hash="-",
+            total_earnings=0.0,
+            current_balance=0.0,
+        )
+        members = [
+            QAMember(email=f"review-benchmark-qa{i}-{tag}@example.com", full_name=f"benchmark QA {i}", password_hash="-")
+            for i in range(qa_members)
+        ]
+        db.add_all([source, target, freelancer, *members])
+        db.flush()
+        db.add(FreelancerLanguagePair(
+            freelancer_id=freelancer.freelancer_id,
+            source_language_id=source.language_id,
+            target_language_id=target.language_id,
+            status=AssSubmission.COMPLETE,
+            accuracy_rate=0.0,
+            complete_task=0,
+            rejected_task=0,
+        ))
+        job = Job(
+            job_title="review counter concurrency benchmark",
+            source_language_id=source.language_id,
+            target_language_id=target.language_id,
+            total_tasks=reviews,
+            job_status=JobStatus.IN_PROGRESS,
+            is_assessment=False,
+            max_time_per_task=10,
+            created_at=now,
+            task_price=TASK_PRICE,
+            instructions="benchmark",
+            under_review_tasks=reviews,
+        )
+        db.add(job)
+        db.flush()
+        task_ids = db.scalars(insert(Task).returning(Task.task_id), [
+            {
+                "job_id": job.job_id,
+                "job_status": JobStatus.IN_PROGRESS,
+                "source_language_id": source.language_id,
+                "target_language_id": target.language_id,
+                "source_text": f"benchmark submission {i}",
+                "translated_text": f"benchmark translation {i}",
+                "max_time_per_task": 10,
+                "task_status": TaskStatus.UNDER_REVIEW,
+                "task_price": TASK_PRICE,
+                "is_assessment": False,
+                "submitted_by_id": freelancer.freelancer_id,
+                "submitted_at": now,
+                "qa_assigned_id": members[i % qa_members].qa_member_id,
+                "qa_assigned_at": now,
+                "qa_lease_expires_at": now + timedelta(hours=1),
+            }
+            for i in range(reviews)
+        ]).all()
+        db.commit()
+        return {
+            "job_id": job.job_id,
+            "language_ids": (source.language_id, target.language_id),
+            "freelancer_id": freelancer.freelancer_id,
+            "qa_ids": [member.qa_member_id for member in members],
+            "task_ids": task_ids,
+        }
+
+
+def cleanup(engine, scratch) -> None:
+    with Session(engine) as db:
+        db.execute(delete(Job).where(Job.job_id == scratch["job_id"]))
+        db.execute(delete(FreelancerLanguagePair).where(FreelancerLanguagePair.freelancer_id == scratch["freelancer_id"]))
+        db.execute(delete(Freelancer).where(Freelancer.freelancer_id == scratch["freelancer_id"]))
+        db.execute(delete(QAMember).where(QAMember.qa_member_id.in_(scratch["qa_ids"])))
+        db.execute(delete(Language).where(Language.language_id.in_(scratch["language_ids"])))
+        db.commit()
+
+
+def review(engine, review_data, start, latencies, conflicts, errors):
+    db = Session(engine)
+    try:
+        start.wait()
+        started = time.perf_counter()
+        submit_qa_review(review_data, db)
+        latencies.append((time.perf_counter() - started) * 1000)
+    except HTTPException as e:
+        db.rollback()
+        if e.status_code == 409:
+            conflicts.append(review_data.task_id)
+        else:
+            errors.append(f"task {review_data.task_id}: {e.status_code} {e.detail}")
+    except Exception as e:
+        db.rollback()
+        errors.append(f"task {review_data.task_id}: {e!r}")
+    finally:
+        db.close()
+
+
+def check_counts(engine, scratch, reviews_by_qa, rejected_by_qa) -> bool:
+    reviews = sum(reviews_by_qa.values())
+    rejected = sum(rejected_by_qa.values())
+    approved = reviews - rejected
+    expected_accuracy = (reviews - rejected) / reviews * 100
+    ok = True
+
+    def check(name: str, actual, expected) -> None:
+        nonlocal ok
+        good = math.isclose(actual, expected) if isinstance(expected, float) else actual == expected
+        ok &= good
+        print(f"{'OK' if good else 'FAIL'}: {name} = {actual} (expected {expected})")
+
+    with Session(engine) as db:
+        for qa_id in scratch["qa_ids"]:
+            member = db.get(QAMember, qa_id)
+            check(f"QA {qa_id} reviewed", member.total_tasks_reviewed, reviews_by_qa[qa_id])
+            check(f"QA {qa_id} rejected", member.total_tasks_rejected, rejected_by_qa[qa_id])
+        pair = db.scalars(
+            select(FreelancerLanguagePair).where(FreelancerLanguagePair.freelancer_id == scratch["freelancer_id"])
+        ).one()
+        check("pair complete_task", pair.complete_task, reviews)
+        check("pair rejected_task", pair.rejected_task, rejected)
+        check("pair accuracy_rate", pair.accuracy_rate, expected_accuracy)
+        freelancer = db.get(Freelancer, scratch["freelancer_id"])
+        check("freelancer total_earnings", freelancer.total_earnings, approved * TASK_PRICE)
+        check("freelancer current_balance", freelancer.current_balance, approved * TASK_PRICE)
+        job = db.get(Job, scratch["job_id"])
+        check("job completed_tasks", job.completed_tasks, approved)
+        check("job open_tasks", job.open_tasks, rejected)
+        check("job under_review_tasks", job.under_review_tasks, 0)
+        complete = db.scalar(
+            select(func.count()).where(Task.job_id == scratch["job_id"], Task.task_status == TaskStatus.COMPLETE)
+        )
+        check("tasks COMPLETE", complete, approved)
+    return ok
+
+
+def run_reviews(engine, reviews: int, qa_members: int, reject_every: int, double_submit: bool = False) -> bool:
+    """Seed, review everything at once, check the counters and clean up; True if every check passed."""
+    scratch = seed(engine, reviews, qa_members)
+    decisions = []
+    for i, task_id in enumerate(scratch["task_ids"]):
+        qa_id = scratch["qa_ids"][i % qa_members]
+        decisions.append(QaReviewSubmit(task_id=task_id, qa_id=qa_id, decision=(i + 1) % reject_every != 0))
+    reviews_by_qa = {qa_id: 0 for qa_id in scratch["qa_ids"]}
+    rejected_by_qa = {qa_id: 0 for qa_id in scratch["qa_ids"]}
+    for decision in decisions:
+        reviews_by_qa[decision.qa_id] += 1
+        rejected_by_qa[decision.qa_id] += not decision.decision
+
+    submissions = decisions * 2 if double_submit else decisions
+    start = threading.Barrier(len(submissions) + 1)
+    latencies, conflicts, errors = [], [], []
+    try:
+        threads = [
+            threading.Thread(target=review, args=(engine, decision, start, latencies, conflicts, errors))
+            for decision in submissions
+        ]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        print(f"{len(submissions)} parallel reviews over {engine.pool.size()} connections in {elapsed:.2f}s ({len(submissions) / elapsed:.0f} reviews/s)")
+        if latencies:
+            latencies.sort()
+            print(
+                f"review latency: p50={statistics.median(latencies):.1f}ms "
+                f"p99={latencies[max(int(len(latencies) * 0.99) - 1, 0)]:.1f}ms max={latencies[-1]:.1f}ms"
+            )
+        counts_ok = check_counts(engine, scratch, reviews_by_qa, rejected_by_qa)
+        if double_submit:
+            refused_once = sorted(conflicts) == sorted(scratch["task_ids"])
+            counts_ok &= refused_once
+            print(f"{'OK' if refused_once else 'FAIL'}: {len(conflicts)} duplicate submissions refused with 409 (expected {reviews}, one per task)")
+        elif conflicts:
+            errors.extend(f"task {task_id}: unexpected 409" for task_id in conflicts)
+    finally:
+        cleanup(engine, scratch)
+
+    for error in errors:
+        print(f"error: {error}")
+    return counts_ok and not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reviews", type=int, default=100)
+    parser.add_argument("--qa-members", type=int, default=2)
+    parser.add_argument("--reject-every", type=int, default=3)
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--double-submit", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_engine(get_settings().DATABASE_URL, pool_size=args.connections, max_overflow=0, pool_timeout=120)
+    if engine.dialect.name != "postgresql":
+        sys.exit("This check needs PostgreSQL.")
+
+    try:
+        ok = run_reviews(engine, args.reviews, args.qa_members, args.reject_every, args.double_submit)
+    finally:
+        engine.dispose()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Simulation of the job scheduler under contention.
+
+Seeds a scratch language pair with five jobs:
+- an old job with a large backlog
+- a newer job of the same priority
+- a job with priority 3
+- a small job due within the deadline horizon
+- a priority 5 job capped at 25 active assignments
+
+``--workers`` threads then claim tasks through services.dispatch.claim_task
+and commit, like /task/open, until ``--claims`` tasks have been handed
+out. The per-job share of claims is printed for every window of
+``--window`` claims. The urgent job should be drained first. After that
+the others should split the pair 1:1:3 by priority. No task is ever
+submitted, so the capped job should stop at exactly 25 claims. Claim
+latency is reported as well. The scratch pair and jobs are deleted afterwards. Needs
+PostgreSQL.
+
+    python -m benchmarks.scheduler_simulation --workers 20 --claims 3000
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.schemas.enums import JobStatus, TaskStatus
+from app.schemas.job import Job
+from app.schemas.language import Language
+from app.schemas.task import Task
+from app.services.dispatch import claim_task
+
+# (name, tasks, priority, hours until deadline, max active assignments)
+JOBS = [
+    ("old backlog", 20000, 1, None, None),
+    ("new job", 5000, 1, None, None),
+    ("priority 3", 5000, 3, None, None),
+    ("urgent", 300, 1, 2, None),
+    ("capped", 5000, 5, None, 25),
+]
+
+
+def seed(engine):
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        source = Language(language_name=f"scheduler source {now.timestamp()}")
+        target = Language(language_name=f"scheduler target {now.timestamp()}")
+        db.add_all([source, target])
+        db.flush()
+        names = {}
+        for name, tasks, priority, due_hours, cap in JOBS:
+            job = Job(
+                job_title=f"scheduler simulation: {name}",
+                source_language_id=source.language_id,
+                target_language_id=target.language_id,
+                total_tasks=tasks,
+                job_status=JobStatus.IN_PROGRESS,
+                is_assessment=False,
+                max_time_per_task=10,
+                created_at=now,
+                task_price=0,
+                instructions="benchmark",
+                open_tasks=tasks,
+                priority=priority,
+                deadline=now + timedelta(hours=due_hours) if due_hours else None,
+                max_active_assignments=cap,
+            )
+            db.add(job)
+            db.flush()
+            names[job.job_id] = name
+            db.execute(insert(Task), [
+                {
+                    "job_id": job.job_id,
+                    "job_status": JobStatus.IN_PROGRESS,
+                    "source_language_id": source.language_id,
+                    "target_language_id": target.language_id,
+                    "source_text": f"{name} {i}",
+                    "max_time_per_task": 10,
+                    "task_status": TaskStatus.OPEN,
+                    "task_price": 0,
+                    "is_assessment": False,
+                }
+                for i in range(tasks)
+            ])
+        db.commit()
+        # Give the planner statistics for the new pair, as autovacuum would after a real ingest.
+        db.execute(text("ANALYZE job, task"))
+        db.commit()
+        return names, (source.language_id, target.language_id)
+
+
+def cleanup(engine, job_ids, language_ids) -> None:
+    with Session(engine) as db:
+        db.execute(delete(Job).where(Job.job_id.in_(job_ids)))
+        db.execute(delete(Language).where(Language.language_id.in_(language_ids)))
+        db.commit()
+
+
+def worker(engine, pair, remaining, lock, order, latencies, errors):
+    db = Session(engine)
+    try:
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            task = claim_task(db, None, *pair)
+            job_id = task.job_id if task else None
+            db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+            if job_id is None:
+                return
+            order.append(job_id)
+    except Exception as e:
+        db.rollback()
+        errors.append(str(e))
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--claims", type=int, default=3000)
+    parser.add_argument("--window", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine(get_settings().DATABASE_URL, pool_size=args.workers, max_overflow=0)
+    if engine.dialect.name != "postgresql":
+        sys.exit("This simulation needs PostgreSQL.")
+
+    names, pair = seed(engine)
+    remaining, lock = [args.claims], threading.Lock()
+    order, latencies, errors = [], [], []
+    try:
+        threads = [
+            threading.Thread(target=worker, args=(engine, pair, remaining, lock, order, latencies, errors))
+            for _ in range(args.workers)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        cleanup(engine, list(names), pair)
+        engine.dispose()
+
+    print(f"{len(order)} claims by {args.workers} workers in {elapsed:.2f}s")
+    header = "claims".ljust(12) + "".join(name.rjust(14) for name in names.values())
+    print(header)
+    for start in range(0, len(order), args.window):
+        window = Counter(order[start:start + args.window])
+        total = sum(window.values())
+        row = f"{start}-{start + total}".ljust(12)
+        print(row + "".join(f"{window[job_id] / total:14.1%}" for job_id in names))
+
+    totals = Counter(order)
+    print("total".ljust(12) + "".join(f"{totals[job_id]:14d}" for job_id in names))
+
+    latencies.sort()
+    print(
+        f"claim latency: p50={statistics.median(latencies):.2f}ms "
+        f"p99={latencies[max(int(len(latencies) * 0.99) - 1, 0)]:.2f}ms max={latencies[-1]:.2f}ms"
+    )
+    for error in errors:
+        print(f"error: {error}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
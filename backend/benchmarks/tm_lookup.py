@@ -0,0 +1,72 @@
+"""
+Latency benchmark for translation-memory fuzzy lookups.
+
+Builds an in-memory index from synthetic Myanmar sentences assembled from
+a fixed syllable inventory, then queries it with lightly edited copies of
+indexed sentences and reports build time, lookup percentiles and how
+often the edited sentence's original is the top match. No database is
+involved.
+
+    python -m benchmarks.tm_lookup --size 200000 --queries 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.services.translation_memory import TranslationMemoryIndex
+
+SYLLABLES = [
+    "မြန်", "မာ", "နိုင်", "ငံ", "သည်", "ကျောင်း", "သား", "များ", "စာ", "အုပ်",
+    "ဖတ်", "ရှု", "ကြ", "သော", "နေ့", "တိုင်း", "လူ", "ထု", "အ", "စိုး",
+    "ရ", "ပြည်", "သူ", "ဘာ", "သာ", "ပြန်", "ဆို", "ခြင်း", "လုပ်", "ငန်း",
+    "ရုံး", "ခန်း", "ဈေး", "ကွက်", "မိ", "သား", "စု", "ကျန်း", "မာ", "ရေး",
+]
+
+
+def make_sentence(rng: random.Random) -> str:
+    words = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(rng.randint(4, 10))]
+    return " ".join(words) + "။"
+
+
+def edit(sentence: str, rng: random.Random) -> str:
+    words = sentence.rstrip("။").split()
+    words[rng.randrange(len(words))] = "".join(rng.choices(SYLLABLES, k=2))
+    return " ".join(words) + "။"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sentences = [make_sentence(rng) for _ in range(args.size)]
+
+    index = TranslationMemoryIndex(1, 2)
+    started = time.perf_counter()
+    for task_id, sentence in enumerate(sentences, start=1):
+        index.add(task_id, sentence, f"translation {task_id}")
+    build_seconds = time.perf_counter() - started
+    print(f"indexed {len(index)} segments in {build_seconds:.1f}s ({len(index) / build_seconds:,.0f}/s)")
+
+    latencies = []
+    hits = 0
+    for _ in range(args.queries):
+        task_id = rng.randrange(1, args.size + 1)
+        query = edit(sentences[task_id - 1], rng)
+        started = time.perf_counter()
+        matches = index.query(query, k=5, min_similarity=0.3)
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += bool(matches) and matches[0].task_id == task_id
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"lookup p50={statistics.median(latencies):.2f}ms p99={p99:.2f}ms max={latencies[-1]:.2f}ms")
+    print(f"top-1 recall of the edited sentence's source: {hits / args.queries:.1%}")
+
+
+if __name__ == "__main__":
+    main()
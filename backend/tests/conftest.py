@@ -1,39 +1,24 @@
-# import pytest
-# from fastapi.testclient import TestClient
-# from sqlalchemy import create_engine
-# from sqlalchemy.orm import sessionmaker
-# from sqlalchemy.pool import StaticPool
-# from app.database import Base
-# from app.main import app
-# from app.deps import get_db
+import pytest
+from sqlalchemy.orm import Session
 
-# SQLALCHEMY_DATABASE_URL = "sqlite://"
 
-# @pytest.fixture
-# def test_db():
-#     engine = create_engine(
-#         SQLALCHEMY_DATABASE_URL,
-#         connect_args={"check_same_thread": False},
-#         poolclass=StaticPool,
-#     )
-#     TestingSessionLocal = sessionmaker(
-#         autocommit=False, 
-#         autoflush=False, 
-#         bind=engine
-#     )
-#     Base.metadata.create_all(bind=engine)
+@pytest.fixture
+def db():
+    """
+    Session on the app's engine whose work is rolled back after the test.
 
-#     def override_get_db():
-#         try:
-#             db = TestingSessionLocal()
-#             yield db
-#         finally:
-#             db.close()
+    Commits inside the code under test only release a savepoint, so they
+    stay invisible to other connections. Tests that need several
+    connections seed and clean up their own rows instead.
+    """
+    from app.core.database import engine
 
-#     app.dependency_overrides[get_db] = override_get_db
-#     yield TestingSessionLocal()
-#     Base.metadata.drop_all(bind=engine)
-
-# @pytest.fixture
-# def client(test_db):
-#     return TestClient(app) 
\ No newline at end of file
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
@@ -0,0 +1,43 @@
+"""
+PostgreSQL for the tests that need it.
+
+The dispatch, scheduler and counter paths rely on SKIP LOCKED, partial
+indexes and COPY, so their tests run against the database in the
+DATABASE_URL setting (and the rest of the settings, as for the app) and
+skip themselves when it is not a reachable PostgreSQL. Call
+skip_unless_postgres() at the top of such a test module, before importing
+anything from ``app``.
+"""
+from typing import Optional
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+
+def postgres_url() -> Optional[str]:
+    """DATABASE_URL if the settings load and it points at a reachable PostgreSQL, else None."""
+    try:
+        from app.core.config import get_settings
+
+        url = get_settings().DATABASE_URL
+    except Exception:
+        return None
+    if not url or make_url(url).get_backend_name() != "postgresql":
+        return None
+    engine = create_engine(url)
+    try:
+        with engine.connect():
+            return url
+    except Exception:
+        return None
+    finally:
+        engine.dispose()
+
+
+_URL = postgres_url()
+
+
+def skip_unless_postgres() -> None:
+    if _URL is None:
+        pytest.skip("needs DATABASE_URL to point at a reachable PostgreSQL", allow_module_level=True)
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app.services.dispatch import claim_task, claim_tasks  # noqa: E402
+from app.services.ingestion import create_job_with_tasks  # noqa: E402
+from app.schemas.language import Language  # noqa: E402
+from tests.test_scheduler import make_job  # noqa: E402
+
+
+def test_claims_write_leases_with_the_database_clock(db):
+    source = Language(language_name="lease test source")
+    target = Language(language_name="lease test target")
+    db.add_all([source, target])
+    db.flush()
+    job = make_job(source, target, "leases")
+    create_job_with_tasks(db, job, [f"lease test segment {i}" for i in range(3)])
+    # now() is the transaction's start time, which every claim below shares.
+    db_now, db_local_now = db.execute(select(func.now(), func.localtimestamp())).one()
+    lease = timedelta(minutes=job.max_time_per_task)
+
+    task = claim_task(db, None, source.language_id, target.language_id)
+    # assigned_at has no time zone, so it holds the session's local time.
+    assert (task.assigned_at, task.lease_expires_at) == (db_local_now, db_now + lease)
+
+    rows = claim_tasks(db, None, source.language_id, target.language_id, limit=2)
+    assert [row.lease_expires_at for row in rows] == [db_now + lease] * 2
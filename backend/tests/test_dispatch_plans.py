@@ -0,0 +1,20 @@
+import pytest
+from sqlalchemy import text
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from benchmarks.dispatch_explain import check_plan, dispatch_statements, explain  # noqa: E402
+
+STATEMENTS = dispatch_statements(1, 2)
+
+
+@pytest.mark.parametrize("name", list(STATEMENTS))
+def test_dispatch_query_uses_its_partial_index(db, name):
+    # On a small test database a sequential scan is cheaper; what matters is
+    # that the partial index predicate matches, so the index can be used at all.
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    db.execute(text("SET LOCAL enable_bitmapscan = off"))
+
+    assert check_plan(name, explain(db, STATEMENTS[name]))
@@ -0,0 +1,13 @@
+import asyncio
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from benchmarks.job_listing_queries import ENDPOINTS, count_queries  # noqa: E402
+
+
+def test_job_listings_run_one_query_regardless_of_job_count():
+    counts = asyncio.run(count_queries([5, 50]))
+
+    assert counts == {endpoint: {1} for endpoint in ENDPOINTS}
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+import pytest  # noqa: E402
+from sqlalchemy import delete, select, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.schemas.enums import JobStatus  # noqa: E402
+from app.schemas.job import Job  # noqa: E402
+from app.schemas.language import Language  # noqa: E402
+from app.services.dispatch import _room  # noqa: E402
+
+
+@pytest.fixture
+def jobs():
+    """An uncapped and a capped job, committed so a second connection can lock them."""
+    tag = uuid.uuid4().hex
+    with Session(engine) as db:
+        source = Language(language_name=f"lock test source {tag}")
+        target = Language(language_name=f"lock test target {tag}")
+        db.add_all([source, target])
+        db.flush()
+        created = [
+            Job(
+                job_title=f"lock test {cap}",
+                source_language_id=source.language_id,
+                target_language_id=target.language_id,
+                total_tasks=0,
+                job_status=JobStatus.IN_PROGRESS,
+                is_assessment=False,
+                max_time_per_task=10,
+                created_at=datetime.now(),
+                task_price=0,
+                instructions="test",
+                max_active_assignments=cap,
+            )
+            for cap in (None, 3)
+        ]
+        db.add_all(created)
+        db.commit()
+        job_ids = [job.job_id for job in created]
+        language_ids = [source.language_id, target.language_id]
+    yield job_ids
+    with Session(engine) as db:
+        db.execute(delete(Job).where(Job.job_id.in_(job_ids)))
+        db.execute(delete(Language).where(Language.language_id.in_(language_ids)))
+        db.commit()
+
+
+def test_only_capped_jobs_are_locked_for_room(jobs):
+    uncapped, capped = jobs
+    with Session(engine) as holder, Session(engine) as claimant:
+        # Another claim holding both job rows, as its counter move does until it commits.
+        holder.execute(select(Job.job_id).where(Job.job_id.in_(jobs)).with_for_update()).all()
+        claimant.execute(text("SET LOCAL lock_timeout = '200ms'"))
+
+        assert _room(claimant, uncapped, 5) == 5
+        with pytest.raises(OperationalError):
+            _room(claimant, capped, 5)
+        holder.rollback()
+        claimant.rollback()
+
+        assert _room(claimant, capped, 5) == 3
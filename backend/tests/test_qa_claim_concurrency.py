@@ -0,0 +1,39 @@
+import uuid
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.schemas.qa_member import QAMember  # noqa: E402
+from benchmarks.qa_claim_concurrency import claim_concurrently, double_assignments  # noqa: E402
+
+REVIEWERS = 10
+SUBMISSIONS = 300
+
+
+def test_concurrent_review_claims_never_share_a_task():
+    engine = create_engine(get_settings().DATABASE_URL, pool_size=REVIEWERS, max_overflow=0)
+    tag = uuid.uuid4().hex
+    with Session(engine) as db:
+        members = [
+            QAMember(email=f"qa-claim-test-{i}-{tag}@example.com", full_name=f"QA claim test {i}", password_hash="-")
+            for i in range(2)
+        ]
+        db.add_all(members)
+        db.commit()
+        qa_ids = [member.qa_member_id for member in members]
+    try:
+        claimed, _, errors, _ = claim_concurrently(engine, qa_ids, REVIEWERS, SUBMISSIONS, batch=5)
+    finally:
+        with Session(engine) as db:
+            db.execute(delete(QAMember).where(QAMember.qa_member_id.in_(qa_ids)))
+            db.commit()
+        engine.dispose()
+
+    assert errors == []
+    assert double_assignments(claimed) == 0
+    assert len(claimed) == SUBMISSIONS
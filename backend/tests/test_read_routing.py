@@ -0,0 +1,46 @@
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.read_routing import READ_HINT_HEADER, ReadAfterWriteMiddleware, reads_from_primary, settings
+
+app = FastAPI()
+app.add_middleware(ReadAfterWriteMiddleware)
+
+
+@app.get("/read")
+def read(request: Request):
+    return {"primary": reads_from_primary(request)}
+
+
+@app.post("/write")
+def write():
+    return {}
+
+
+@app.post("/failed_write", status_code=422)
+def failed_write():
+    return {}
+
+
+client = TestClient(app)
+
+
+def test_successful_writes_return_a_hint_instead_of_a_cookie():
+    response = client.post("/write")
+
+    assert "set-cookie" not in response.headers
+    until = float(response.headers[READ_HINT_HEADER])
+    assert time.time() < until <= time.time() + settings.REPLICA_STALENESS_SECONDS
+    assert READ_HINT_HEADER not in client.post("/failed_write").headers
+    assert READ_HINT_HEADER not in client.get("/read").headers
+
+
+def test_reads_follow_the_echoed_hint():
+    hint = client.post("/write").headers[READ_HINT_HEADER]
+
+    assert client.get("/read", headers={READ_HINT_HEADER: hint}).json() == {"primary": True}
+    assert client.get("/read").json() == {"primary": False}
+    for stale in [f"{time.time() - 1:.3f}", f"{time.time() + 10 * settings.REPLICA_STALENESS_SECONDS + 60:.3f}", "soon"]:
+        assert client.get("/read", headers={READ_HINT_HEADER: stale}).json() == {"primary": False}
@@ -0,0 +1,25 @@
+import pytest
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from benchmarks.review_counter_concurrency import run_reviews  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(get_settings().DATABASE_URL, pool_size=10, max_overflow=0, pool_timeout=120)
+    yield engine
+    engine.dispose()
+
+
+def test_concurrent_reviews_move_every_counter_exactly(engine):
+    assert run_reviews(engine, reviews=40, qa_members=2, reject_every=3)
+
+
+def test_a_review_submitted_twice_at_once_counts_once(engine):
+    assert run_reviews(engine, reviews=20, qa_members=2, reject_every=3, double_submit=True)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from app.schemas.enums import JobStatus  # noqa: E402
+from app.schemas.job import IngestionOptions, Job  # noqa: E402
+from app.schemas.language import Language  # noqa: E402
+from app.services.dispatch import claim_task  # noqa: E402
+from app.services.ingestion import create_job_with_tasks  # noqa: E402
+from app.services.scheduler import pick_jobs, start_virtual_time  # noqa: E402
+
+TEXTS = [f"scheduler test segment {i}" for i in range(10)]
+
+
+def make_job(source, target, title):
+    return Job(
+        job_title=title,
+        source_language_id=source.language_id,
+        target_language_id=target.language_id,
+        total_tasks=0,
+        job_status=JobStatus.IN_PROGRESS,
+        is_assessment=False,
+        max_time_per_task=10,
+        created_at=datetime.now(),
+        task_price=0,
+        instructions="test",
+        notes="",
+    )
+
+
+def test_jobs_with_only_linked_duplicates_are_not_backlogged(db):
+    source = Language(language_name="scheduler test source")
+    target = Language(language_name="scheduler test target")
+    db.add_all([source, target])
+    db.flush()
+
+    original = make_job(source, target, "original")
+    create_job_with_tasks(db, original, TEXTS)
+    repeat = make_job(source, target, "repeat")
+    create_job_with_tasks(db, repeat, TEXTS, IngestionOptions(dedupe_across_jobs=True))
+    db.refresh(original)
+    db.refresh(repeat)
+
+    assert (original.open_tasks, original.duplicate_tasks) == (len(TEXTS), 0)
+    assert (repeat.open_tasks, repeat.duplicate_tasks) == (0, len(TEXTS))
+    assert pick_jobs(db, source.language_id, target.language_id) == [original.job_id]
+
+    # A new job starts at the lowest virtual time among jobs that can hand out work.
+    original.virtual_time = 10.0
+    repeat.virtual_time = 0.0
+    db.flush()
+    newcomer = make_job(source, target, "newcomer")
+    assert start_virtual_time(db, newcomer) == 10.0
+
+    task = claim_task(db, None, source.language_id, target.language_id)
+    assert task.job_id == original.job_id
@@ -0,0 +1,122 @@
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import create_engine, delete, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.routes.task import submit_task  # noqa: E402
+from app.schemas.enums import JobStatus, TaskStatus  # noqa: E402
+from app.schemas.freelancer import Freelancer  # noqa: E402
+from app.schemas.job import Job  # noqa: E402
+from app.schemas.language import Language  # noqa: E402
+from app.schemas.task import SubmitTaskRequest, Task  # noqa: E402
+from app.services.job_progress import reconcile  # noqa: E402
+
+TASKS = 20
+
+
+def seed(engine):
+    tag = uuid.uuid4().hex
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        source = Language(language_name=f"submit test source {tag}")
+        target = Language(language_name=f"submit test target {tag}")
+        freelancer = Freelancer(
+            email=f"submit-test-{tag}@example.com",
+            full_name="submit test",
+            password_hash="-",
+            total_earnings=0.0,
+            current_balance=0.0,
+        )
+        db.add_all([source, target, freelancer])
+        db.flush()
+        job = Job(
+            job_title="submit concurrency test",
+            source_language_id=source.language_id,
+            target_language_id=target.language_id,
+            total_tasks=TASKS,
+            job_status=JobStatus.IN_PROGRESS,
+            is_assessment=False,
+            max_time_per_task=10,
+            created_at=now,
+            task_price=0.5,
+            instructions="test",
+            assigned_tasks=TASKS,
+        )
+        db.add(job)
+        db.flush()
+        task_ids = db.scalars(insert(Task).returning(Task.task_id), [
+            {
+                "job_id": job.job_id,
+                "job_status": JobStatus.IN_PROGRESS,
+                "source_language_id": source.language_id,
+                "target_language_id": target.language_id,
+                "source_text": f"submit test segment {i}",
+                "max_time_per_task": 10,
+                "task_status": TaskStatus.ASSIGNED_TO_FL,
+                "task_price": 0.5,
+                "is_assessment": False,
+                "assigned_freelancer_id": freelancer.freelancer_id,
+                "assigned_at": now,
+                "lease_expires_at": now + timedelta(hours=1),
+            }
+            for i in range(TASKS)
+        ]).all()
+        db.commit()
+        return job.job_id, freelancer.freelancer_id, [source.language_id, target.language_id], task_ids
+
+
+def submit(engine, submission, start, refused, errors):
+    db = Session(engine)
+    try:
+        start.wait()
+        submit_task(submission, db)
+    except HTTPException as e:
+        db.rollback()
+        (refused if e.status_code == 404 else errors).append(submission.task_id)
+    except Exception as e:
+        db.rollback()
+        errors.append(repr(e))
+    finally:
+        db.close()
+
+
+def test_double_submits_move_the_counters_once():
+    engine = create_engine(get_settings().DATABASE_URL, pool_size=2 * TASKS, max_overflow=0)
+    job_id, freelancer_id, language_ids, task_ids = seed(engine)
+    submissions = [
+        SubmitTaskRequest(freelancer_id=freelancer_id, task_id=task_id, translated_text="done")
+        for task_id in task_ids
+    ] * 2
+    start = threading.Barrier(len(submissions))
+    refused, errors = [], []
+    try:
+        threads = [threading.Thread(target=submit, args=(engine, s, start, refused, errors)) for s in submissions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with Session(engine) as db:
+            drifted = [row for row in reconcile(db) if row["job_id"] == job_id]
+            job = db.get(Job, job_id)
+            counters = (job.assigned_tasks, job.under_review_tasks)
+    finally:
+        with Session(engine) as db:
+            db.execute(delete(Job).where(Job.job_id == job_id))
+            db.execute(delete(Freelancer).where(Freelancer.freelancer_id == freelancer_id))
+            db.execute(delete(Language).where(Language.language_id.in_(language_ids)))
+            db.commit()
+        engine.dispose()
+
+    assert errors == []
+    assert sorted(refused) == sorted(task_ids)
+    assert drifted == []
+    assert counters == (0, TASKS)
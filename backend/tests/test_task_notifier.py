@@ -0,0 +1,52 @@
+import asyncio
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import engine  # noqa: E402
+from app.services import task_notifier  # noqa: E402
+
+OTHER_PID = 1
+
+
+def notify(pair):
+    with engine.begin() as connection:
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": get_settings().TASK_NOTIFY_CHANNEL, "payload": f"{pair[0]}:{pair[1]}:{OTHER_PID}"},
+        )
+
+
+def terminate_listener(backend_pid):
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": backend_pid})
+
+
+def test_listener_reconnects_and_wakes_waiters(monkeypatch):
+    monkeypatch.setattr(task_notifier, "RECONNECT_INITIAL_SECONDS", 0.1)
+
+    async def run():
+        task_notifier.start(engine)
+        try:
+            pair = (-1, -2)
+            seen = task_notifier.version(pair)
+            notify(pair)
+            assert await task_notifier.wait(pair, seen, 5)
+
+            # A waiter parked while the listener is down is woken once it is back.
+            parked = (-3, -4)
+            waiter = asyncio.ensure_future(task_notifier.wait(parked, task_notifier.version(parked), 10))
+            terminate_listener(task_notifier._listen_connection.get_backend_pid())
+            assert await waiter
+
+            seen = task_notifier.version(pair)
+            notify(pair)
+            assert await task_notifier.wait(pair, seen, 5)
+        finally:
+            task_notifier.stop()
+
+    asyncio.run(run())
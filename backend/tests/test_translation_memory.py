@@ -0,0 +1,64 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from tests.postgres import skip_unless_postgres
+
+skip_unless_postgres()
+
+from sqlalchemy import select  # noqa: E402
+
+from app.schemas.enums import TaskStatus  # noqa: E402
+from app.schemas.language import Language  # noqa: E402
+from app.schemas.task import Task  # noqa: E402
+from app.services.ingestion import create_job_with_tasks  # noqa: E402
+from app.services import translation_memory  # noqa: E402
+from app.services.translation_memory import TranslationMemoryIndex, get_index  # noqa: E402
+from tests.test_scheduler import make_job  # noqa: E402
+
+
+def test_catch_up_indexes_approvals_committed_behind_the_watermark(db):
+    source = Language(language_name="memory test source")
+    target = Language(language_name="memory test target")
+    db.add_all([source, target])
+    db.flush()
+    job = make_job(source, target, "memory")
+    create_job_with_tasks(db, job, [f"the quick brown fox number {i} jumps" for i in range(3)])
+    first, second, third = db.scalars(select(Task).where(Task.job_id == job.job_id).order_by(Task.task_id)).all()
+
+    def approve(task, reviewed_at):
+        task.task_status = TaskStatus.COMPLETE
+        task.translated_text = f"translation {task.task_id}"
+        task.qa_reviewed_at = reviewed_at
+        db.flush()
+
+    reviewed_at = datetime.now()
+    approve(first, reviewed_at)
+    index = TranslationMemoryIndex(source.language_id, target.language_id)
+    assert index.catch_up(db) == 1
+    assert index.watermark == reviewed_at
+
+    # Stamped before the indexed approval but committed after it, as with a slower concurrent reviewer.
+    approve(second, reviewed_at - timedelta(seconds=5))
+    approve(third, reviewed_at + timedelta(seconds=1))
+    assert index.catch_up(db) == 2
+    assert set(index.entries) == {first.task_id, second.task_id, third.task_id}
+    assert index.catch_up(db) == 0
+
+
+def test_lookups_that_must_not_wait_leave_the_top_up_to_a_background_thread(db, monkeypatch):
+    index = TranslationMemoryIndex(-1, -2)
+    index.refreshed_at = time.monotonic() - translation_memory.settings.TM_REFRESH_SECONDS - 1
+    monkeypatch.setitem(translation_memory._indexes, (-1, -2), index)
+    refreshed = threading.Event()
+    refreshed_on = []
+
+    def refresh(refresh_db, refreshed_index):
+        refreshed_on.append(threading.current_thread())
+        refreshed.set()
+
+    monkeypatch.setattr(translation_memory, "_refresh", refresh)
+
+    assert get_index(db, -1, -2, wait=False) is index
+    assert refreshed.wait(5)
+    assert refreshed_on != [threading.current_thread()]
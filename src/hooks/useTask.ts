@@ -4,6 +4,7 @@ import { LanguagePair } from "@/types/language";
 import { OpenTask } from "@/types/task";
 
 const API_URL = import.meta.env.VITE_API_URL;
+const OPEN_TASK_WAIT_SECONDS = 25;
 
 export const useTask = () => {
   const getAllLanguagePairs = useQuery<LanguagePair[], Error>({
@@ -23,8 +24,9 @@ export const useTask = () => {
     return useQuery<OpenTask, Error, OpenTask, [string, number, number, number]>({
       queryKey: ["openTask", freelancerId, sourceLanguageId, targetLanguageId],
       queryFn: async (): Promise<OpenTask> => {
+        // Long-poll: the server holds the request until a task opens up or the wait times out.
         const response = await axios.get<OpenTask>(
-          `${API_URL}/task/open?freelancer_id=${freelancerId}&source_language_id=${sourceLanguageId}&target_language_id=${targetLanguageId}`
+          `${API_URL}/task/open_wait?freelancer_id=${freelancerId}&source_language_id=${sourceLanguageId}&target_language_id=${targetLanguageId}&timeout=${OPEN_TASK_WAIT_SECONDS}`
         );
         return response.data;
       },
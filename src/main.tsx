@@ -5,6 +5,9 @@ import { ThemeProvider } from '@mui/material/styles';
 import CssBaseline from '@mui/material/CssBaseline';
 import App from './App';
 import theme from './theme';
+import { installReadAfterWrite } from './utils/readAfterWrite';
+
+installReadAfterWrite();
 
 const queryClient = new QueryClient();
 
@@ -0,0 +1,28 @@
+import axios from "axios";
+
+// Must match READ_HINT_HEADER in backend/app/core/read_routing.py.
+const READ_HINT_HEADER = "X-Read-Primary-Until";
+const STORAGE_KEY = "readPrimaryUntil";
+
+// After a save the API returns the time until which this tab's reads should
+// come from the primary database. Echo it back on every request until then,
+// so a page reloaded right after a save does not show stale replica data.
+export const installReadAfterWrite = () => {
+  axios.interceptors.response.use((response) => {
+    const until = response.headers[READ_HINT_HEADER.toLowerCase()];
+    if (until) {
+      sessionStorage.setItem(STORAGE_KEY, until);
+    }
+    return response;
+  });
+
+  axios.interceptors.request.use((config) => {
+    const until = sessionStorage.getItem(STORAGE_KEY);
+    if (until && Number(until) > Date.now() / 1000) {
+      config.headers.set(READ_HINT_HEADER, until);
+    } else if (until) {
+      sessionStorage.removeItem(STORAGE_KEY);
+    }
+    return config;
+  });
+};